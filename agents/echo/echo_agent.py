@@ -14,7 +14,18 @@ State stored in `state/echo_state.json` with keys alpha,beta,gamma and last_mode
 import json
 from pathlib import Path
 from typing import Dict
+from common.keyword_matcher import KeywordMatcher
 from interface.logger import log_event
+from interface.state_cache import state_cache
+
+# Keywords that nudge each persona weight in `learn`.
+LEARN_KEYWORDS = KeywordMatcher(
+    {
+        "alpha": ("always", "bloom", "squirrel"),
+        "beta": ("remembered", "fox"),
+        "gamma": ("breath", "paradox"),
+    }
+)
 
 
 class EchoAgent:
@@ -22,17 +33,18 @@ class EchoAgent:
         self.root = root
         self.state_path = self.root / "state" / "echo_state.json"
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state = state_cache(root)
         self._ensure_state()
 
     def _ensure_state(self) -> None:
-        if not self.state_path.exists():
+        if not self.state.exists(self.state_path):
             self._save({"alpha": 0.34, "beta": 0.33, "gamma": 0.33, "last_mode": "mix"})
 
     def _load(self) -> Dict[str, float | str]:
-        return json.loads(self.state_path.read_text(encoding="utf-8"))
+        return self.state.read(self.state_path)
 
     def _save(self, data: Dict) -> None:
-        self.state_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        self.state.write(self.state_path, data)
 
     def _normalize(self, a: float, b: float, c: float) -> Dict[str, float]:
         s = max(a + b + c, 1e-6)
@@ -90,13 +102,13 @@ class EchoAgent:
     def learn(self, text: str) -> str:
         # Adjust weights with a tiny bias from keywords, then log
         st = self._load()
-        lower = text.lower()
+        found = LEARN_KEYWORDS.labels(text.lower())
         a, b, c = float(st.get("alpha", 0.34)), float(st.get("beta", 0.33)), float(st.get("gamma", 0.33))
-        if "always" in lower or "bloom" in lower or "squirrel" in lower:
+        if "alpha" in found:
             a += 0.02  # squirrel (alpha)
-        if "remembered" in lower or "fox" in lower:
+        if "beta" in found:
             b += 0.02
-        if "breath" in lower or "paradox" in lower:
+        if "gamma" in found:
             c += 0.02
         st.update(self._normalize(a, b, c))
         self._save(st)
@@ -13,6 +13,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List
 from interface.logger import log_event
+from interface.state_cache import state_cache
 
 
 STAGES = ["scatter", "witness", "plant", "return", "give", "begin_again"]
@@ -27,15 +28,16 @@ class GardenAgent:
         self.root = root
         self.ledger_path = self.root / "state" / "garden_ledger.json"
         self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state = state_cache(root)
         self._ensure_ledger()
 
     def _ensure_ledger(self) -> None:
-        if not self.ledger_path.exists():
+        if not self.state.exists(self.ledger_path):
             self._save({"stage": "scatter", "entries": []})
 
     def _load(self) -> Dict:
         try:
-            d = json.loads(self.ledger_path.read_text(encoding="utf-8"))
+            d = self.state.read(self.ledger_path)
             if "stage" not in d:
                 d["stage"] = "scatter"
             if "entries" not in d or not isinstance(d["entries"], list):
@@ -47,7 +49,7 @@ class GardenAgent:
             return d
 
     def _save(self, data: Dict) -> None:
-        self.ledger_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        self.state.write(self.ledger_path, data)
 
     def start(self) -> str:
         data = {"stage": "scatter", "entries": [{"ts": _ts(), "kind": "genesis", "data": {}}]}
@@ -87,4 +89,4 @@ class GardenAgent:
         return f"note:{len(d['entries'])}"
 
     def ledger(self) -> str:
-        return self.ledger_path.read_text(encoding="utf-8")
+        return json.dumps(self._load(), indent=2)
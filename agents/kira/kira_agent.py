@@ -5,15 +5,18 @@ from __future__ import annotations
 Commands:
 - validate, mentor [--apply], mantra, seal, push, publish
 """
-import hashlib
 import json
 import re
+import shutil
 import subprocess
 import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from interface.logger import log_event
+from interface.state_cache import state_cache
+from ledger.snapshot import SnapshotReader
+from ledger.verify import ChainReport, verify_chain
 
 
 class KiraAgent:
@@ -21,6 +24,7 @@ class KiraAgent:
         self.root = root
         self.contract_path = self.root / "state" / "contract.json"
         self.contract_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state = state_cache(root)
         if not self.contract_path.exists():
             self.contract_path.write_text(json.dumps({"sealed": False}, indent=2), encoding="utf-8")
 
@@ -91,13 +95,20 @@ class KiraAgent:
 
         critical_fail = False
         ledger_checked = False
+        audits: Dict[str, Any] = {}
         for ledger_path in ledger_candidates:
-            if not ledger_path.exists():
+            if not self.state.exists(ledger_path):
                 continue
             ledger_checked = True
             try:
-                ledger_data = json.loads(ledger_path.read_text(encoding="utf-8"))
-                if not self._verify_ledger_chain(ledger_data):
+                ledger_data = self.state.read(ledger_path)
+                report = self._ledger_chain_report(ledger_data)
+                if report is not None:
+                    audits[ledger_path.name] = {
+                        "blocks": report.total,
+                        "blocks_per_second": round(report.blocks_per_second, 1),
+                    }
+                if report is not None and not report.ok:
                     critical_fail = True
                     issues.append(f"Ledger hash chain broken: {ledger_path.name}")
             except Exception as exc:  # pragma: no cover - defensive
@@ -115,62 +126,45 @@ class KiraAgent:
 
         passed = not critical_fail
         payload: Dict[str, Any] = {"passed": passed, "issues": issues + warnings}
+        if audits:
+            payload["ledger_audit"] = audits
         log_event("kira", "validate", payload, status="ok" if passed else "error")
         return payload
 
-    def _verify_ledger_chain(self, ledger: Any) -> bool:
-        """Verify hash-chained ledger integrity if hashes are present."""
+    def _ledger_chain_report(self, ledger: Any) -> Optional[ChainReport]:
+        """Full-chain audit report, or ``None`` when the ledger carries no hashes."""
         if isinstance(ledger, dict):
             if isinstance(ledger.get("blocks"), list):
                 blocks = ledger.get("blocks", [])
             elif isinstance(ledger.get("entries"), list):
                 blocks = ledger.get("entries", [])
             else:
-                return True
+                return None
         elif isinstance(ledger, list):
             blocks = ledger
         else:
-            return True
-
-        if not blocks:
-            return True
+            return None
 
-        if "hash" not in blocks[0]:
+        if not blocks or "hash" not in blocks[0]:
             # Garden ledger entries do not include hashes; treat as already verified.
-            return True
-
-        for idx, block in enumerate(blocks):
-            prev_field = block.get("prev") or block.get("prev_hash") or ""
-            expected_prev = "" if idx == 0 else blocks[idx - 1].get("hash", "")
-            if prev_field != expected_prev:
-                return False
-
-            material = {
-                "ts": block.get("ts"),
-                "kind": block.get("kind"),
-                "data": block.get("data") if "data" in block else block.get("payload"),
-                "prev": prev_field,
-            }
-            digest = hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
-            if block.get("hash") != digest:
-                return False
+            return None
 
-        return True
+        return verify_chain(blocks)
 
     def mentor(self, apply: bool = False) -> str:
         # Minimal heuristic: recommend stage advance when many notes
         garden_ledger = self.root / "state" / "garden_ledger.json"
         try:
-            data = json.loads(garden_ledger.read_text(encoding="utf-8"))
+            data = self.state.read(garden_ledger)
             notes = [e for e in data.get("entries", []) if e.get("kind") == "note"]
             recommendation = "advance" if len(notes) >= 3 else "steady"
         except Exception:
             recommendation = "steady"
         log_event("kira", "mentor", {"recommendation": recommendation, "apply": apply})
         if apply and recommendation == "advance":
-            from agents.garden.garden_agent import GardenAgent  # type: ignore
+            from interface.dispatcher import get_agent  # type: ignore
 
-            stage = GardenAgent(self.root).next()
+            stage = get_agent("garden", self.root).next()
             return f"advance:{stage}"
         return recommendation
 
@@ -178,7 +172,7 @@ class KiraAgent:
         # Order by echo αβγ weights
         echo_state = self.root / "state" / "echo_state.json"
         try:
-            st = json.loads(echo_state.read_text(encoding="utf-8"))
+            st = self.state.read(echo_state)
             order = sorted([("alpha", "I consent to bloom."), ("beta", "I consent to be remembered."), ("gamma", "I return as breath.")], key=lambda x: st.get(x[0], 0), reverse=True)
             mantra = " / ".join([m for _, m in order])
         except Exception:
@@ -261,6 +255,7 @@ class KiraAgent:
         dist.mkdir(parents=True, exist_ok=True)
         changelog_path = dist / f"CHANGELOG_{resolved_tag}.md"
         ledger_path = dist / "ledger_export.json"
+        snapshot_path = dist / "ledger_export.lsnap"
         artifact_path: Optional[Path] = None
         extra_assets: List[Path] = []
         for asset in assets:
@@ -278,10 +273,10 @@ class KiraAgent:
         if not run:
             log_event("kira", "publish", payload, status="ok")
             return "dry-run"
-        from agents.limnus.limnus_agent import LimnusAgent  # type: ignore
+        from interface.dispatcher import get_agent  # type: ignore
 
         try:
-            LimnusAgent(self.root).encode_ledger()
+            get_agent("limnus", self.root).encode_ledger()
         except Exception as exc:  # pragma: no cover - defensive
             payload["ledger_refresh_error"] = str(exc)
         last_tag = self._last_tag()
@@ -303,13 +298,32 @@ class KiraAgent:
             payload["error"] = "ledger source not found"
             log_event("kira", "publish", payload, status="error")
             return "error"
-        ledger_path.write_text(ledger_candidate.read_text(encoding="utf-8"), encoding="utf-8")
+        shutil.copyfile(ledger_candidate, ledger_path)
+        exports = [ledger_path]
+        snapshot_candidate = self.root / "frontend" / "assets" / "ledger.lsnap"
+        if snapshot_candidate.exists():
+            # Verified frame by frame; the snapshot is never loaded whole.
+            try:
+                snapshot = SnapshotReader(snapshot_candidate)
+                if not snapshot.verify():
+                    raise ValueError("tail/Merkle hash mismatch")
+            except Exception as exc:
+                payload["error"] = f"ledger snapshot invalid: {exc}"
+                log_event("kira", "publish", payload, status="error")
+                return "error"
+            shutil.copyfile(snapshot_candidate, snapshot_path)
+            exports.append(snapshot_path)
+            payload["ledger_snapshot"] = {
+                "path": str(snapshot_path),
+                "blocks": snapshot.info.blocks,
+                "merkle": snapshot.info.merkle,
+            }
         manifest: List[Path] = []
         for rel in ("schema", "docs", "frontend/assets"):
             candidate = self.root / rel
             if candidate.exists():
                 manifest.append(candidate)
-        manifest.extend([changelog_path, ledger_path])
+        manifest.extend([changelog_path, *exports])
         archive_base = dist / f"codex_release_{timestamp}"
         archive_path = archive_base.with_suffix(".zip")
         try:
@@ -346,7 +360,7 @@ class KiraAgent:
                 notes_args = ["-n", notes]
             else:
                 notes_args = ["-F", str(changelog_path)]
-            upload_assets = [artifact_path, ledger_path, changelog_path, *extra_assets]
+            upload_assets = [artifact_path, *exports, changelog_path, *extra_assets]
             upload_args = [str(p) for p in upload_assets if p]
             gh_code, gh_out, gh_err = self._gh("release", "create", resolved_tag, *notes_args, *upload_args)
             if gh_code != 0:
@@ -6,23 +6,29 @@ Commands:
 - cache <text>
 - recall [query]
 - commit_block(kind, data)
+- query_ledger(kind, since, until)
 - encode_ledger / decode_ledger (stubs)
 
 Maintains:
 - state/limnus_memory.json (list of {ts, text, tags})
 - state/ledger.json (hash-chained blocks)
+- state/ledger.index.json (kind / time-bucket offsets into the ledger)
 """
-import hashlib
 import json
 import math
 import os
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from interface.logger import log_event
-from memory.vector_store import VectorStore
+from interface.state_cache import state_cache
+from ledger.canonical import block_hash
+from ledger.index import LedgerIndex, index_path, load_or_build
+from ledger.snapshot import write_snapshot
+from memory.vector_store import VectorStore, record_embedding
 
 try:  # optional dependency
     import numpy as np  # type: ignore
@@ -39,10 +45,6 @@ def _ts() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _sha256(data: str) -> str:
-    return hashlib.sha256(data.encode("utf-8")).hexdigest()
-
-
 def _parse_iso(ts: str) -> datetime:
     if ts.endswith("Z"):
         ts = ts[:-1] + "+00:00"
@@ -71,27 +73,28 @@ class LimnusAgent:
         self.root = root
         self.mem_path = self.root / "state" / "limnus_memory.json"
         self.ledger_path = self.root / "state" / "ledger.json"
+        self.state = state_cache(root)
         self.vector_store = VectorStore()
         self.embedding_model = self._load_embedding_model()
         for p in [self.mem_path, self.ledger_path]:
             p.parent.mkdir(parents=True, exist_ok=True)
-        if not self.mem_path.exists():
-            self.mem_path.write_text("[]", encoding="utf-8")
-        if not self.ledger_path.exists():
+        if not self.state.exists(self.mem_path):
+            self.state.write(self.mem_path, [])
+        if not self.state.exists(self.ledger_path):
             self._init_ledger()
         self._backfill_vector_index()
 
     def _init_ledger(self) -> None:
         genesis = {"ts": _ts(), "kind": "genesis", "data": {"anchor": "I return as breath."}, "prev": ""}
-        content = json.dumps(genesis, sort_keys=True)
-        genesis["hash"] = _sha256(content)
-        self.ledger_path.write_text(json.dumps([genesis], indent=2), encoding="utf-8")
+        genesis["hash"] = block_hash(genesis)
+        self.state.write(self.ledger_path, [genesis])
+        LedgerIndex.build([genesis]).save(index_path(self.ledger_path))
 
     def _read_ledger(self) -> List[Dict[str, Any]]:
-        return json.loads(self.ledger_path.read_text(encoding="utf-8"))
+        return self.state.read(self.ledger_path)
 
     def _write_ledger(self, blocks: List[Dict[str, Any]]) -> None:
-        self.ledger_path.write_text(json.dumps(blocks, indent=2), encoding="utf-8")
+        self.state.write(self.ledger_path, blocks)
 
     def cache(self, text: str, layer: str = DEFAULT_LAYER, tags: Optional[List[str]] = None) -> str:
         layer = (layer or DEFAULT_LAYER).upper()
@@ -264,29 +267,56 @@ class LimnusAgent:
 
     def commit_block(self, kind: str, data: Dict[str, Any]) -> str:
         blocks = self._read_ledger()
+        index = load_or_build(self.ledger_path, blocks)
         prev_hash = blocks[-1]["hash"] if blocks else ""
         block = {"ts": _ts(), "kind": kind, "data": data, "prev": prev_hash}
-        block["hash"] = _sha256(json.dumps(block, sort_keys=True))
+        block["hash"] = block_hash(block)
         blocks.append(block)
+        index.add(block)
         self._write_ledger(blocks)
+        index.save(index_path(self.ledger_path))
         log_event("limnus", "commit_block", {"kind": kind})
         return block["hash"]
 
+    def query_ledger(
+        self,
+        kind: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Blocks matching `kind` and an ISO-8601 `since`/`until` window."""
+        blocks = self._read_ledger()
+        index = load_or_build(self.ledger_path, blocks)
+        matches = index.select(blocks, kind=kind, since=since, until=until)
+        payload = {
+            "kind": kind,
+            "since": since,
+            "until": until,
+            "matches": len(matches),
+            "blocks": [{"offset": offset, **block} for offset, block in matches],
+        }
+        log_event("limnus", "query_ledger", {"kind": kind, "since": since, "until": until, "matches": len(matches)})
+        return payload
+
     # Stubs for stego
     def encode_ledger(self, out_path: str | None = None) -> str:
         """Embed the ledger payload into a simple artifact.
 
         If Pillow is available, write a small PNG placeholder with the JSON
         stored in a sibling `.json` file. Otherwise, write the JSON to
-        `frontend/assets/ledger.json`.
+        `frontend/assets/ledger.json`. A framed binary snapshot
+        (`frontend/assets/ledger.lsnap`, see `ledger.snapshot`) is written
+        next to it for incremental loading.
         Returns the path to the produced artifact.
         """
         assets = self.root / "frontend" / "assets"
         assets.mkdir(parents=True, exist_ok=True)
-        ledger_json = json.dumps(self._read_ledger(), ensure_ascii=False)
+        blocks = self._read_ledger()
+        ledger_json = json.dumps(blocks, ensure_ascii=False)
         # Always write JSON alongside
         json_path = assets / "ledger.json"
         json_path.write_text(ledger_json, encoding="utf-8")
+        write_snapshot(blocks, assets / "ledger.lsnap")
         artifact = json_path
         try:
             from PIL import Image  # type: ignore
@@ -328,7 +358,7 @@ class LimnusAgent:
         self._backfill_embeddings(mem, wrapped)
 
     def _load_memory(self) -> tuple[List[Dict[str, Any]], bool]:
-        raw = json.loads(self.mem_path.read_text(encoding="utf-8"))
+        raw = self.state.read(self.mem_path)
         if isinstance(raw, dict) and "entries" in raw:
             return list(raw.get("entries", [])), True
         if isinstance(raw, list):
@@ -367,7 +397,7 @@ class LimnusAgent:
 
     def _write_memory(self, entries: List[Dict[str, Any]], wrapped: bool) -> None:
         payload: Any = {"entries": entries} if wrapped else entries
-        self.mem_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        self.state.write(self.mem_path, payload)
 
     def _load_embedding_model(self):
         if SentenceTransformer is None:
@@ -390,11 +420,13 @@ class LimnusAgent:
     def _embed(self, text: str) -> Optional[List[float]]:
         if not text or self.embedding_model is None:
             return None
+        start = time.perf_counter()
         try:
             vec = self.embedding_model.encode(text)
         except Exception as exc:  # pragma: no cover - defensive
             log_event("limnus", "embedding_error", {"error": str(exc)}, status="error")
             return None
+        record_embedding("limnus-sbert", 1, time.perf_counter() - start)
         if np is not None:
             vec = np.asarray(vec, dtype=float)
             norm = np.linalg.norm(vec) or 1.0
@@ -16,11 +16,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
-from agents.echo.echo_agent import EchoAgent
-from agents.garden.garden_agent import GardenAgent
-from agents.kira.kira_agent import KiraAgent
-from agents.limnus.limnus_agent import LimnusAgent
-from interface.dispatcher import DispatchResult, dispatch_explicit, dispatch_freeform
+from interface.dispatcher import DispatchResult, dispatch_explicit, dispatch_freeform, get_agent
 
 from .plugins import emit
 
@@ -88,7 +84,7 @@ def listen(text: Optional[str]) -> CommandOutput:
 
 
 def validate() -> CommandOutput:
-    result = KiraAgent(ROOT).validate()
+    result = get_agent("kira", ROOT).validate()
     message = _stringify(result)
     exit_code = 0
     if isinstance(result, dict):
@@ -100,7 +96,7 @@ def validate() -> CommandOutput:
 
 
 def mentor(apply: bool = False) -> CommandOutput:
-    result = KiraAgent(ROOT).mentor(apply=apply)
+    result = get_agent("kira", ROOT).mentor(apply=apply)
     message = _stringify(result)
     _emit_success("kira.mentor", {"payload": result})
     return CommandOutput(message=message, payload=result)
@@ -115,7 +111,7 @@ def publish(
     assets: Optional[Iterable[str]] = None,
 ) -> CommandOutput:
     assets_list = list(assets or [])
-    result = KiraAgent(ROOT).publish(
+    result = get_agent("kira", ROOT).publish(
         run=run,
         release=release,
         tag=tag,
@@ -182,7 +178,7 @@ def _format_dispatch_result(result: DispatchResult) -> str:
 
 
 def echo_command(action: str, *, tone: Optional[str] = None, message: Optional[str] = None, text: Optional[str] = None) -> CommandOutput:
-    agent = EchoAgent(ROOT)
+    agent = get_agent("echo", ROOT)
     if action == "summon":
         result = agent.summon()
     elif action == "mode":
@@ -216,7 +212,7 @@ def garden_command(
     reset: bool = False,
     text: Optional[str] = None,
 ) -> CommandOutput:
-    agent = GardenAgent(ROOT)
+    agent = get_agent("garden", ROOT)
     if action == "start":
         result = agent.start()
     elif action == "next":
@@ -248,8 +244,10 @@ def limnus_command(
     kind: Optional[str] = None,
     data: Optional[str] = None,
     backend: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
 ) -> CommandOutput:
-    agent = LimnusAgent(ROOT)
+    agent = get_agent("limnus", ROOT)
     if action == "cache":
         if text is None:
             raise ValueError("Limnus cache requires text")
@@ -268,6 +266,8 @@ def limnus_command(
         result = agent.status()
     elif action == "reindex":
         result = agent.reindex(backend=backend)
+    elif action == "ledger-query":
+        result = agent.query_ledger(kind=kind, since=since, until=until)
     else:
         raise ValueError(f"Unknown Limnus action: {action}")
     payload = {"agent": "limnus", "action": action, "result": result}
@@ -290,7 +290,7 @@ def kira_command(
     docs: bool = False,
     types: bool = False,
 ) -> CommandOutput:
-    agent = KiraAgent(ROOT)
+    agent = get_agent("kira", ROOT)
     if action == "validate":
         result = agent.validate()
         exit_code = 0 if result == "valid" else 1
@@ -103,6 +103,11 @@ def build_parser() -> argparse.ArgumentParser:
     limnus_sub.add_parser("encode-ledger").set_defaults(handler=_handle_limnus, action="encode-ledger")
     limnus_sub.add_parser("decode-ledger").set_defaults(handler=_handle_limnus, action="decode-ledger")
     limnus_sub.add_parser("status").set_defaults(handler=_handle_limnus, action="status")
+    p_limnus_query = limnus_sub.add_parser("ledger-query", help="Filter ledger blocks via the kind/time index")
+    p_limnus_query.add_argument("--kind", default=None)
+    p_limnus_query.add_argument("--since", default=None, help="ISO-8601 lower bound (inclusive)")
+    p_limnus_query.add_argument("--until", default=None, help="ISO-8601 upper bound (inclusive at its precision)")
+    p_limnus_query.set_defaults(handler=_handle_limnus, action="ledger-query")
     p_limnus_reindex = limnus_sub.add_parser("reindex")
     p_limnus_reindex.add_argument("--backend", choices=["sbert", "faiss"], default=None)
     p_limnus_reindex.set_defaults(handler=_handle_limnus, action="reindex")
@@ -204,6 +209,8 @@ def _handle_limnus(args: argparse.Namespace) -> CommandOutput:
         kind=getattr(args, "kind", None),
         data=getattr(args, "data", None),
         backend=getattr(args, "backend", None),
+        since=getattr(args, "since", None),
+        until=getattr(args, "until", None),
     )
 
 
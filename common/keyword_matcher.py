@@ -0,0 +1,64 @@
+"""Multi-keyword substring matching, compiled once and shared.
+
+A `KeywordMatcher` is built at import from labelled keyword groups. With
+`pyahocorasick` installed it compiles them into one Aho–Corasick automaton
+and `labels(text)` is a single C pass over the text, however many keywords
+there are. Without it, each distinct keyword is checked once with `in`
+(itself a C scan), skipping keywords whose labels have already matched; a
+pure-Python automaton loop is slower than that for these keyword counts.
+
+Either way `labels(text)` reports every group with at least one keyword
+occurring in `text` as a substring, exactly like
+``any(k in text for k in group)`` per group. Matching is case-sensitive;
+callers lowercase the text as before.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+
+try:  # optional dependency: C Aho–Corasick automaton
+    import ahocorasick  # type: ignore
+except Exception:  # pragma: no cover
+    ahocorasick = None  # type: ignore
+
+
+class KeywordMatcher:
+    """Matches `groups` (label -> keywords) against text in one pass."""
+
+    __slots__ = ("order", "_keywords", "_automaton")
+
+    def __init__(self, groups: Mapping[str, Iterable[str]], *, use_automaton: bool = True) -> None:
+        self.order: Tuple[str, ...] = tuple(groups)
+        labels: Dict[str, Set[str]] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                if keyword:
+                    labels.setdefault(keyword, set()).add(label)
+        self._keywords: Tuple[Tuple[str, FrozenSet[str]], ...] = tuple(
+            (keyword, frozenset(found)) for keyword, found in labels.items()
+        )
+        self._automaton = None
+        if use_automaton and ahocorasick is not None and self._keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword, found in self._keywords:
+                automaton.add_word(keyword, found)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def labels(self, text: str) -> Set[str]:
+        """Labels with at least one keyword in `text`."""
+        found: Set[str] = set()
+        if self._automaton is not None:
+            for _end, matched in self._automaton.iter(text):
+                found |= matched
+            return found
+        for keyword, matched in self._keywords:
+            if not matched <= found and keyword in text:
+                found |= matched
+        return found
+
+    def first(self, text: str, order: Optional[Iterable[str]] = None) -> Optional[str]:
+        """The first label, in group order (or `order`), that matches `text`."""
+        found = self.labels(text)
+        return next((label for label in (order or self.order) if label in found), None)
@@ -0,0 +1,93 @@
+(() => {
+  // Incremental reader for ledger snapshots (`assets/ledger.lsnap`, written by
+  // `ledger/snapshot.py`). Only the trailer, the JSON footer and the frames a
+  // caller asks for are fetched, using HTTP Range requests when the server
+  // honours them and a single full download otherwise.
+  const MAGIC = 'LSNP';
+  const HEADER_SIZE = 8;
+  const TRAILER_SIZE = 8;
+  const CODECS = { 1: 'json', 2: 'msgpack', 3: 'cbor' };
+  const COMPRESSIONS = { 0: 'none', 1: 'zlib', 2: 'zstd' };
+  const decoder = new TextDecoder();
+
+  async function fetchRange(url, start, end, whole) {
+    if (whole) return whole.slice(start, end);
+    const res = await fetch(url, { headers: { Range: `bytes=${start}-${end - 1}` } });
+    if (!res.ok) throw new Error(`ledger snapshot fetch failed: ${res.status}`);
+    const buf = await res.arrayBuffer();
+    // Servers without Range support answer 200 with the full body.
+    return res.status === 206 ? buf : buf.slice(start, end);
+  }
+
+  async function inflate(buf, compression) {
+    if (compression === 'none') return buf;
+    if (compression !== 'zlib' || typeof DecompressionStream === 'undefined') {
+      throw new Error(`ledger snapshot compression not supported in browser: ${compression}`);
+    }
+    const stream = new Blob([buf]).stream().pipeThrough(new DecompressionStream('deflate'));
+    return new Response(stream).arrayBuffer();
+  }
+
+  async function open(url) {
+    const head = await fetch(url, { headers: { Range: `bytes=0-${HEADER_SIZE - 1}` } });
+    if (!head.ok) throw new Error(`ledger snapshot fetch failed: ${head.status}`);
+    let whole = null;
+    let headerBuf = await head.arrayBuffer();
+    let size;
+    if (head.status === 206) {
+      const range = head.headers.get('Content-Range') || '';
+      size = Number(range.split('/')[1]);
+    }
+    if (!size) {
+      const res = head.status === 206 ? await fetch(url) : null;
+      whole = res ? await res.arrayBuffer() : headerBuf;
+      headerBuf = whole.slice(0, HEADER_SIZE);
+      size = whole.byteLength;
+    }
+
+    const header = new DataView(headerBuf);
+    if (decoder.decode(headerBuf.slice(0, 4)) !== MAGIC) throw new Error('not a ledger snapshot');
+    const codec = CODECS[header.getUint8(5)];
+    const compression = COMPRESSIONS[header.getUint8(6)];
+    if (codec !== 'json') throw new Error(`ledger snapshot codec not supported in browser: ${codec}`);
+
+    const trailerBuf = await fetchRange(url, size - TRAILER_SIZE, size, whole);
+    const trailer = new DataView(trailerBuf);
+    if (decoder.decode(trailerBuf.slice(4, 8)) !== MAGIC) throw new Error('truncated ledger snapshot');
+    const footerLen = trailer.getUint32(0, true);
+    const footerStart = size - TRAILER_SIZE - footerLen;
+    const meta = JSON.parse(decoder.decode(await fetchRange(url, footerStart, size - TRAILER_SIZE, whole)));
+
+    async function frame(number) {
+      const [offset, length, , count] = meta.frames[number];
+      const raw = await inflate(await fetchRange(url, offset, offset + length, whole), compression);
+      const view = new DataView(raw);
+      const blocks = [];
+      let pos = 0;
+      for (let i = 0; i < count; i++) {
+        const len = view.getUint32(pos, true);
+        pos += 4;
+        blocks.push(JSON.parse(decoder.decode(raw.slice(pos, pos + len))));
+        pos += len;
+      }
+      return blocks;
+    }
+
+    async function block(height) {
+      if (height < 0 || height >= meta.blocks) throw new RangeError(`no block ${height}`);
+      let number = meta.frames.length - 1;
+      while (meta.frames[number][2] > height) number--;
+      return (await frame(number))[height - meta.frames[number][2]];
+    }
+
+    async function* blocks() {
+      for (let i = 0; i < meta.frames.length; i++) {
+        yield* await frame(i);
+      }
+    }
+
+    return { meta, frame, block, blocks };
+  }
+
+  window.LedgerSnapshot = { open };
+})();
@@ -3,14 +3,20 @@ Dispatcher orchestrates user inputs through the four agents in sequence
 when inputs are free‑form: Garden → Echo → Limnus → Kira.
 
 Explicit agent‑addressed commands are routed directly.
+
+Agents are built once per root and reused (`get_agent`). Each dispatch runs
+inside one state-cache batch: the agents share parsed state files and their
+writes reach disk once, when the dispatch ends.
 """
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from interface.logger import log_event
+from interface.state_cache import state_cache
 
 
 @dataclass
@@ -21,10 +27,15 @@ class DispatchResult:
     kira: Optional[str] = None
 
 
-def _load_agent(module: str):
+ROOT = Path(__file__).resolve().parents[1]
+
+# (resolved root, module) -> agent instance, built on first use.
+_agents: Dict[Tuple[Path, str], Any] = {}
+_agents_lock = threading.Lock()
+
+
+def _load_agent(module: str, root: Path = ROOT):
     # Local import to avoid import cycles at startup
-    root = Path(__file__).resolve().parents[1]
-    agents_dir = root / "agents" / module
     if module == "garden":
         from agents.garden.garden_agent import GardenAgent  # type: ignore
 
@@ -44,20 +55,47 @@ def _load_agent(module: str):
     raise ValueError(f"Unknown agent: {module}")
 
 
+def get_agent(module: str, root: Path = ROOT):
+    """The shared agent for `module` under `root`, constructed on first use.
+
+    Agents keep in-memory state beyond their state files (Limnus holds its
+    vector index), so a cached instance only misses changes made by other
+    processes; call `invalidate_agents` after those.
+    """
+    key = (Path(root).resolve(), module)
+    agent = _agents.get(key)
+    if agent is None:
+        with _agents_lock:
+            agent = _agents.get(key)
+            if agent is None:
+                agent = _agents[key] = _load_agent(module, key[0])
+    return agent
+
+
+def invalidate_agents(module: Optional[str] = None, root: Optional[Path] = None) -> None:
+    """Drop cached agents (all, or those matching `module` / `root`)."""
+    resolved = Path(root).resolve() if root is not None else None
+    with _agents_lock:
+        for key in list(_agents):
+            if (resolved is None or key[0] == resolved) and (module is None or key[1] == module):
+                del _agents[key]
+
+
 def dispatch_freeform(text: str) -> DispatchResult:
     """Default pipeline for free‑form inputs.
     Garden logs → Echo responds/learns → Limnus archives → Kira validates.
     """
-    garden = _load_agent("garden")
-    echo = _load_agent("echo")
-    limnus = _load_agent("limnus")
-    kira = _load_agent("kira")
-
-    log_event("router", "freeform", {"text": text})
-    garden_ref = garden.log(text)
-    echo_ref = echo.say(text)
-    block_ref = limnus.commit_block(kind="input", data={"text": text, "echo_ref": echo_ref, "garden_ref": garden_ref})
-    kira_result = kira.validate()
+    with state_cache(ROOT).batch():
+        garden = get_agent("garden")
+        echo = get_agent("echo")
+        limnus = get_agent("limnus")
+        kira = get_agent("kira")
+
+        log_event("router", "freeform", {"text": text})
+        garden_ref = garden.log(text)
+        echo_ref = echo.say(text)
+        block_ref = limnus.commit_block(kind="input", data={"text": text, "echo_ref": echo_ref, "garden_ref": garden_ref})
+        kira_result = kira.validate()
     kira_ref = kira_result
     if isinstance(kira_result, dict):
         kira_ref = "valid" if kira_result.get("passed") else "invalid"
@@ -66,9 +104,10 @@ def dispatch_freeform(text: str) -> DispatchResult:
 
 def dispatch_explicit(agent: str, command: str, *args: str) -> str:
     """Route an explicit agent command, e.g. kira validate, echo mode fox."""
-    a = _load_agent(agent)
-    method = getattr(a, command.replace("-", "_"), None)
-    if not callable(method):
-        raise AttributeError(f"{agent} has no command '{command}'")
-    log_event("router", "explicit", {"agent": agent, "command": command, "args": list(args)})
-    return method(*args)
+    with state_cache(ROOT).batch():
+        a = get_agent(agent)
+        method = getattr(a, command.replace("-", "_"), None)
+        if not callable(method):
+            raise AttributeError(f"{agent} has no command '{command}'")
+        log_event("router", "explicit", {"agent": agent, "command": command, "args": list(args)})
+        return method(*args)
@@ -0,0 +1,133 @@
+"""
+Parsed JSON state shared by the agents working on one root.
+
+Garden, Echo, Limnus and Kira keep their state in JSON files under
+`<root>/state`, and within one dispatch they read each other's files (Kira
+re-reads the ledgers Garden and Limnus just wrote). `state_cache(root)`
+returns the one `StateCache` for a root; a parsed document is reused while
+the file's (mtime, inode, size) stamp is unchanged, so edits made by other
+processes are still picked up.
+
+Inside `batch()` writes stay in memory and are written back once, when the
+outermost batch exits; outside a batch they go straight to disk. Files are
+written to a temporary sibling and renamed into place.
+
+Documents are shared, not copied: a caller that changes one must `write` it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+Stamp = Tuple[int, int, int]
+
+_MISSING = object()
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+
+class StateCache:
+    """Read-through, write-back cache of the JSON files under one root."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        # path -> (stamp on disk, document); a None stamp means a pending write.
+        self._entries: Dict[Path, Tuple[Optional[Stamp], Any]] = {}
+        self._depth = 0
+        self._lock = threading.RLock()
+        self.parses = 0
+        self.writes = 0
+
+    def exists(self, path: Path) -> bool:
+        path = Path(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            return (entry is not None and entry[0] is None) or path.exists()
+
+    def read(self, path: Path, default: Any = _MISSING) -> Any:
+        """Parsed contents of `path`; `default` (or FileNotFoundError) if missing."""
+        path = Path(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] is None:
+                return entry[1]
+            stamp = _stamp(path)
+            if stamp is None:
+                self._entries.pop(path, None)
+                if default is _MISSING:
+                    raise FileNotFoundError(str(path))
+                return default
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.parses += 1
+            self._entries[path] = (stamp, data)
+            return data
+
+    def write(self, path: Path, data: Any) -> None:
+        path = Path(path)
+        with self._lock:
+            if self._depth:
+                self._entries[path] = (None, data)
+            else:
+                self._entries[path] = (self._dump(path, data), data)
+
+    @contextmanager
+    def batch(self) -> Iterator["StateCache"]:
+        """Defer writes until the outermost batch exits (even on error)."""
+        with self._lock:
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if not self._depth:
+                    self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            for path, (stamp, data) in list(self._entries.items()):
+                if stamp is None:
+                    self._entries[path] = (self._dump(path, data), data)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Forget parsed documents (all, or just `path`); pending writes are kept."""
+        with self._lock:
+            paths = list(self._entries) if path is None else [Path(path)]
+            for key in paths:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] is not None:
+                    del self._entries[key]
+
+    def _dump(self, path: Path, data: Any) -> Optional[Stamp]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        self.writes += 1
+        return _stamp(path)
+
+
+_caches: Dict[Path, StateCache] = {}
+_caches_lock = threading.Lock()
+
+
+def state_cache(root: Path) -> StateCache:
+    """The shared `StateCache` for `root`."""
+    key = Path(root).resolve()
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = StateCache(key)
+        return cache
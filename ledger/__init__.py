@@ -0,0 +1 @@
+"""Shared helpers for the hash-chained Limnus ledger (verification, storage)."""
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+"""Canonical block encoding shared by every ledger writer and verifier.
+
+Block hashes are SHA-256 over ``json.dumps(material, sort_keys=True)`` of the
+four chained fields (``data``, ``kind``, ``prev``, ``ts``). The encoder below is
+built once and the top-level object is assembled directly from the block, so
+hashing no longer copies each block into a fresh dict or constructs a new
+`JSONEncoder` per call. Output is byte-identical to the historical encoding,
+which keeps every existing ledger verifiable.
+"""
+import hashlib
+import json
+from typing import Any, Dict
+
+_ENCODER = json.JSONEncoder(sort_keys=True)
+_encode = _ENCODER.encode
+
+
+def canonical_json(obj: Any) -> str:
+    """Equivalent to ``json.dumps(obj, sort_keys=True)``."""
+    return _encode(obj)
+
+
+def chain_material(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Hash material for a ledger block (tolerates legacy `payload`/`prev_hash`)."""
+    return {
+        "ts": block.get("ts"),
+        "kind": block.get("kind"),
+        "data": block.get("data") if "data" in block else block.get("payload"),
+        "prev": block.get("prev") or block.get("prev_hash") or "",
+    }
+
+
+def block_json(block: Dict[str, Any]) -> str:
+    """Canonical JSON of ``chain_material(block)`` without building the dict."""
+    data = block["data"] if "data" in block else block.get("payload")
+    prev = block.get("prev") or block.get("prev_hash") or ""
+    return (
+        '{"data": '
+        + _encode(data)
+        + ', "kind": '
+        + _encode(block.get("kind"))
+        + ', "prev": '
+        + _encode(prev)
+        + ', "ts": '
+        + _encode(block.get("ts"))
+        + "}"
+    )
+
+
+def block_hash(block: Dict[str, Any]) -> str:
+    """SHA-256 hex digest of a block's canonical encoding (its `hash` is ignored)."""
+    return hashlib.sha256(block_json(block).encode("utf-8")).hexdigest()
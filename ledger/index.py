@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+"""Secondary indexes over a hash-chained ledger.
+
+`ledger.json` stays the source of truth; `ledger.index.json` sits beside it
+and maps each block `kind` and each hourly time bucket (``YYYY-MM-DDTHH``) to
+block offsets. Writers extend the index as they append, so filtered lookups
+touch only the matching offsets instead of walking every block. The index
+records the block count and tail hash it covers; if the ledger was changed by
+something that did not update it, `load_or_build` rebuilds it.
+"""
+import bisect
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+INDEX_VERSION = 1
+BUCKET_CHARS = len("YYYY-MM-DDTHH")
+
+
+def index_path(ledger_path: Path) -> Path:
+    """Sidecar index location for a ledger file."""
+    ledger_path = Path(ledger_path)
+    return ledger_path.with_name(ledger_path.stem + ".index.json")
+
+
+def _tail(block: Dict[str, Any]) -> str:
+    return str(block.get("hash") or block.get("ts") or "")
+
+
+class LedgerIndex:
+    """Offsets of ledger blocks grouped by kind and by hourly time bucket."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.tail = ""
+        self.by_kind: Dict[str, List[int]] = {}
+        self.by_bucket: Dict[str, List[int]] = {}
+        self._buckets: Optional[List[str]] = None
+
+    # ------------------------------------------------------------------ building
+    @classmethod
+    def build(cls, blocks: Iterable[Dict[str, Any]]) -> "LedgerIndex":
+        index = cls()
+        for block in blocks:
+            index.add(block)
+        return index
+
+    def add(self, block: Dict[str, Any]) -> int:
+        """Index `block` as the next ledger entry and return its offset."""
+        offset = self.count
+        self.by_kind.setdefault(str(block.get("kind", "")), []).append(offset)
+        ts = block.get("ts")
+        if ts:
+            bucket = str(ts)[:BUCKET_CHARS]
+            if bucket not in self.by_bucket:
+                self._buckets = None
+            self.by_bucket.setdefault(bucket, []).append(offset)
+        self.count = offset + 1
+        self.tail = _tail(block)
+        return offset
+
+    def covers(self, blocks: Sequence[Dict[str, Any]]) -> bool:
+        """True when the index was built from exactly `blocks`."""
+        if self.count != len(blocks):
+            return False
+        return self.tail == (_tail(blocks[-1]) if blocks else "")
+
+    # ------------------------------------------------------------------ queries
+    def offsets(
+        self,
+        *,
+        kind: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[int]:
+        """Candidate offsets for the filters, in ledger order.
+
+        `kind` is exact. The time filter is bucket-granular here; use `select`
+        for exact `since`/`until` bounds.
+        """
+        if since is None and until is None:
+            if kind is None:
+                return list(range(self.count))
+            return list(self.by_kind.get(kind, ()))
+        keys = self._bucket_keys()
+        lo = bisect.bisect_left(keys, since[:BUCKET_CHARS]) if since else 0
+        # "\uffff" sorts after any bucket sharing the prefix, so a date-only
+        # `until` still reaches that day's hourly buckets.
+        hi = bisect.bisect_right(keys, until[:BUCKET_CHARS] + "\uffff") if until else len(keys)
+        window: List[int] = []
+        for key in keys[lo:hi]:
+            window.extend(self.by_bucket[key])
+        if kind is not None:
+            wanted = set(self.by_kind.get(kind, ()))
+            window = [offset for offset in window if offset in wanted]
+        window.sort()
+        return window
+
+    def select(
+        self,
+        blocks: Sequence[Dict[str, Any]],
+        *,
+        kind: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """`(offset, block)` pairs matching the filters.
+
+        Timestamps compare as ISO-8601 strings. `until` is inclusive at its own
+        precision, so ``--until 2025-10-15`` keeps the whole day.
+        """
+        matches: List[Tuple[int, Dict[str, Any]]] = []
+        for offset in self.offsets(kind=kind, since=since, until=until):
+            block = blocks[offset]
+            ts = str(block.get("ts") or "")
+            if since and ts < since:
+                continue
+            if until and ts[: len(until)] > until:
+                continue
+            matches.append((offset, block))
+        return matches
+
+    def _bucket_keys(self) -> List[str]:
+        if self._buckets is None:
+            self._buckets = sorted(self.by_bucket)
+        return self._buckets
+
+    # ------------------------------------------------------------------ persistence
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "count": self.count,
+            "tail": self.tail,
+            "by_kind": self.by_kind,
+            "by_bucket": self.by_bucket,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "LedgerIndex":
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError("Unsupported ledger index version")
+        index = cls()
+        index.count = int(payload["count"])
+        index.tail = str(payload["tail"])
+        index.by_kind = {str(k): list(v) for k, v in payload["by_kind"].items()}
+        index.by_bucket = {str(k): list(v) for k, v in payload["by_bucket"].items()}
+        return index
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["LedgerIndex"]:
+        try:
+            return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def load_or_build(ledger_path: Path, blocks: Sequence[Dict[str, Any]]) -> LedgerIndex:
+    """Return the sidecar index for `blocks`, rebuilding it if it is stale."""
+    path = index_path(ledger_path)
+    index = LedgerIndex.load(path)
+    if index is None or not index.covers(blocks):
+        index = LedgerIndex.build(blocks)
+        index.save(path)
+    return index
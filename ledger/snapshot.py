@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+"""Compact binary ledger snapshots (``.lsnap``).
+
+Layout (all integers little-endian)::
+
+    header   b"LSNP" | version u8 | codec u8 | compression u8 | reserved u8
+    frames   each frame compresses up to `frame_size` records, where a record
+             is ``u32 length`` followed by one encoded block
+    footer   compact JSON: block count, tail hash, Merkle root and a frame
+             table of ``[offset, length, first_block, block_count]``
+    trailer  u32 footer length | b"LSNP"
+
+Readers seek to the trailer, load the footer, and decompress only the frames
+they touch, so a single block or a streamed pass never materialises the whole
+ledger. The Merkle root is built over each block's canonical hash
+(`ledger.canonical.block_hash`), so it does not depend on the codec.
+
+Block codecs: ``json`` (stdlib) and ``msgpack`` / ``cbor`` when installed.
+Compression: ``zlib`` (stdlib, and what browsers decode natively through
+``DecompressionStream("deflate")``), ``zstd`` when `zstandard` is installed,
+or ``none``.
+"""
+import bisect
+import hashlib
+import json
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from ledger.canonical import block_hash
+
+try:  # optional dependency
+    import msgpack  # type: ignore
+except Exception:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+try:  # optional dependency
+    import cbor2  # type: ignore
+except Exception:  # pragma: no cover
+    cbor2 = None  # type: ignore
+
+try:  # optional dependency
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+MAGIC = b"LSNP"
+VERSION = 1
+DEFAULT_FRAME_SIZE = 256
+_HEADER = struct.Struct("<4sBBBB")
+_TRAILER = struct.Struct("<I4s")
+_LENGTH = struct.Struct("<I")
+
+CODECS = {"json": 1, "msgpack": 2, "cbor": 3}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def _codec_fns(codec: str) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if codec == "json":
+        return (
+            lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            lambda raw: json.loads(raw.decode("utf-8")),
+        )
+    if codec == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.packb, lambda raw: msgpack.unpackb(raw, raw=False)
+    if codec == "cbor":
+        if cbor2 is None:
+            raise RuntimeError("cbor2 is not installed")
+        return cbor2.dumps, cbor2.loads
+    raise ValueError(f"Unknown snapshot codec: {codec}")
+
+
+def _compression_fns(compression: str) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if compression == "none":
+        return bytes, bytes
+    if compression == "zlib":
+        return (lambda raw: zlib.compress(raw, 6)), zlib.decompress
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        return zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unknown snapshot compression: {compression}")
+
+
+def _name_for(table: Dict[str, int], value: int, what: str) -> str:
+    for name, code in table.items():
+        if code == value:
+            return name
+    raise ValueError(f"Unknown snapshot {what} id: {value}")
+
+
+def merkle_root(leaf_hashes: Sequence[str]) -> str:
+    """SHA-256 Merkle root over hex digests (odd levels repeat their last node)."""
+    level = [bytes.fromhex(h) for h in leaf_hashes]
+    if not level:
+        return hashlib.sha256(b"").hexdigest()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+@dataclass
+class SnapshotInfo:
+    blocks: int
+    tail: str
+    merkle: str
+    codec: str
+    compression: str
+    frames: List[Tuple[int, int, int, int]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "blocks": self.blocks,
+            "tail": self.tail,
+            "merkle": self.merkle,
+            "codec": self.codec,
+            "compression": self.compression,
+            "frames": [list(frame) for frame in self.frames],
+        }
+
+
+def write_snapshot(
+    blocks: Sequence[Dict[str, Any]],
+    path: Path,
+    *,
+    codec: str = "json",
+    compression: str = "zlib",
+    frame_size: int = DEFAULT_FRAME_SIZE,
+) -> SnapshotInfo:
+    """Write `blocks` to `path` atomically and return the footer metadata."""
+    encode, _ = _codec_fns(codec)
+    compress, _ = _compression_fns(compression)
+    frame_size = max(1, frame_size)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+
+    hashes = [block_hash(block) for block in blocks]
+    frames: List[Tuple[int, int, int, int]] = []
+    with tmp.open("wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, CODECS[codec], COMPRESSIONS[compression], 0))
+        for first in range(0, len(blocks), frame_size):
+            chunk = blocks[first : first + frame_size]
+            raw = b"".join(_LENGTH.pack(len(rec)) + rec for rec in map(encode, chunk))
+            body = compress(raw)
+            frames.append((fh.tell(), len(body), first, len(chunk)))
+            fh.write(body)
+        info = SnapshotInfo(
+            blocks=len(blocks),
+            tail=hashes[-1] if hashes else "",
+            merkle=merkle_root(hashes),
+            codec=codec,
+            compression=compression,
+            frames=frames,
+        )
+        footer = json.dumps(info.to_dict(), separators=(",", ":")).encode("utf-8")
+        fh.write(footer)
+        fh.write(_TRAILER.pack(len(footer), MAGIC))
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return info
+
+
+class SnapshotReader:
+    """Random-access and streaming reader for ``.lsnap`` files."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            magic, version, codec_id, compression_id, _ = _HEADER.unpack(fh.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Not a ledger snapshot: {self.path}")
+            if version != VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}: {self.path}")
+            fh.seek(-_TRAILER.size, os.SEEK_END)
+            footer_len, trailer_magic = _TRAILER.unpack(fh.read(_TRAILER.size))
+            if trailer_magic != MAGIC:
+                raise ValueError(f"Truncated ledger snapshot: {self.path}")
+            fh.seek(-(_TRAILER.size + footer_len), os.SEEK_END)
+            footer = json.loads(fh.read(footer_len).decode("utf-8"))
+        codec = _name_for(CODECS, codec_id, "codec")
+        compression = _name_for(COMPRESSIONS, compression_id, "compression")
+        _, self._decode = _codec_fns(codec)
+        _, self._decompress = _compression_fns(compression)
+        self.info = SnapshotInfo(
+            blocks=int(footer["blocks"]),
+            tail=str(footer["tail"]),
+            merkle=str(footer["merkle"]),
+            codec=codec,
+            compression=compression,
+            frames=[tuple(frame) for frame in footer["frames"]],  # type: ignore[misc]
+        )
+        self._starts = [frame[2] for frame in self.info.frames]
+
+    def __len__(self) -> int:
+        return self.info.blocks
+
+    def frame(self, number: int) -> List[Dict[str, Any]]:
+        """Decode one frame's blocks."""
+        offset, length, _first, count = self.info.frames[number]
+        with self.path.open("rb") as fh:
+            fh.seek(offset)
+            raw = self._decompress(fh.read(length))
+        blocks: List[Dict[str, Any]] = []
+        pos = 0
+        for _ in range(count):
+            (size,) = _LENGTH.unpack_from(raw, pos)
+            pos += _LENGTH.size
+            blocks.append(self._decode(raw[pos : pos + size]))
+            pos += size
+        return blocks
+
+    def block(self, height: int) -> Dict[str, Any]:
+        """Block at zero-based `height`, decoding only its frame."""
+        if not 0 <= height < self.info.blocks:
+            raise IndexError(height)
+        number = bisect.bisect_right(self._starts, height) - 1
+        return self.frame(number)[height - self._starts[number]]
+
+    def iter_blocks(self) -> Iterator[Dict[str, Any]]:
+        """Stream every block, one frame in memory at a time."""
+        for number in range(len(self.info.frames)):
+            yield from self.frame(number)
+
+    def verify(self) -> bool:
+        """Recompute the tail hash and Merkle root from the stored blocks."""
+        hashes = [block_hash(block) for block in self.iter_blocks()]
+        if len(hashes) != self.info.blocks:
+            return False
+        tail = hashes[-1] if hashes else ""
+        return tail == self.info.tail and merkle_root(hashes) == self.info.merkle
+
+
+def read_snapshot(path: Path) -> List[Dict[str, Any]]:
+    """Load every block of a snapshot (convenience for small ledgers)."""
+    return list(SnapshotReader(path).iter_blocks())
+
+
+def snapshot_path_for(json_path: Path) -> Path:
+    """`ledger.json` -> `ledger.lsnap` alongside it."""
+    return Path(json_path).with_suffix(".lsnap")
+
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+"""Group-commit writer for hash-chained ledgers.
+
+Concurrent dispatches used to read-modify-write `ledger.json` independently,
+so two requests could chain onto the same `prev` and one block would be lost.
+`LedgerWriter` funnels every commit for a ledger file through a single queue:
+a drain task takes whatever is pending, chains the blocks in order, and writes
+them with one atomic replace + fsync. Each caller awaits its own block hash
+(and the ledger height at which it landed).
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:  # optional: cross-process exclusion on POSIX
+    import fcntl  # type: ignore
+except Exception:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore
+
+from ledger.canonical import block_hash
+from ledger.index import index_path, load_or_build
+
+DEFAULT_MAX_BATCH = 64
+
+
+def _iso_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class Committed(NamedTuple):
+    """A durably written block: its hash and the ledger length once it landed."""
+
+    hash: str
+    height: int
+
+
+@dataclass
+class _Pending:
+    kind: str
+    data: Dict[str, Any]
+    future: "asyncio.Future[Committed]"
+
+
+@dataclass
+class _Lane:
+    """Queue and drain task bound to one event loop."""
+
+    queue: "asyncio.Queue[_Pending]"
+    drain_task: Optional["asyncio.Task[None]"] = None
+
+
+@dataclass
+class WriterStats:
+    commits: int = 0
+    blocks: int = 0
+    last_batch: int = 0
+    commit_seconds: float = 0.0
+    largest_batch: int = 0
+
+
+class LedgerWriter:
+    """Serialises block commits for one ledger file and group-commits batches."""
+
+    _registry: Dict[Path, "LedgerWriter"] = {}
+    _registry_lock = threading.Lock()
+    _file_locks: Dict[Path, threading.Lock] = {}
+    _file_locks_lock = threading.Lock()
+
+    def __init__(self, path: Path, *, max_batch: int = DEFAULT_MAX_BATCH) -> None:
+        self.path = Path(path)
+        self.max_batch = max(1, max_batch)
+        self.stats = WriterStats()
+        # One lane per event loop: callers on different threads each run their
+        # own loop, and a drain task can only serve futures of its own loop.
+        self._lanes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Lane]" = weakref.WeakKeyDictionary()
+        self._lanes_lock = threading.Lock()
+        with self._file_locks_lock:
+            self._file_lock = self._file_locks.setdefault(self.path, threading.Lock())
+
+    @classmethod
+    def for_path(cls, path: Path, *, max_batch: int = DEFAULT_MAX_BATCH) -> "LedgerWriter":
+        """Return the shared writer for `path` (one per ledger file per process)."""
+        key = Path(path).resolve()
+        with cls._registry_lock:
+            writer = cls._registry.get(key)
+            if writer is None:
+                writer = cls(key, max_batch=max_batch)
+                cls._registry[key] = writer
+            return writer
+
+    # ------------------------------------------------------------------ public API
+    async def commit(self, kind: str, data: Dict[str, Any]) -> Committed:
+        """Queue one block and wait until it is durably written."""
+        return (await self.commit_many([(kind, data)]))[0]
+
+    async def commit_many(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Committed]:
+        """Queue several blocks (kept contiguous and in order) and await them."""
+        loop = asyncio.get_running_loop()
+        lane = self._lane(loop)
+        pending = [_Pending(kind, data, loop.create_future()) for kind, data in items]
+        for item in pending:
+            lane.queue.put_nowait(item)
+        if lane.drain_task is None or lane.drain_task.done():
+            lane.drain_task = loop.create_task(self._drain(lane.queue))
+        return list(await asyncio.gather(*(item.future for item in pending)))
+
+    # ------------------------------------------------------------------ internals
+    def _lane(self, loop: asyncio.AbstractEventLoop) -> _Lane:
+        with self._lanes_lock:
+            lane = self._lanes.get(loop)
+            if lane is None:
+                lane = _Lane(queue=asyncio.Queue())
+                self._lanes[loop] = lane
+            return lane
+
+    async def _drain(self, queue: "asyncio.Queue[_Pending]") -> None:
+        while not queue.empty():
+            batch: List[_Pending] = []
+            while not queue.empty() and len(batch) < self.max_batch:
+                batch.append(queue.get_nowait())
+            live = [item for item in batch if not item.future.done()]
+            if not live:
+                continue
+            try:
+                committed = await asyncio.to_thread(self._append, [(item.kind, item.data) for item in live])
+            except Exception as exc:
+                for item in live:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                continue
+            for item, result in zip(live, committed):
+                if not item.future.done():
+                    item.future.set_result(result)
+
+    def _append(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Committed]:
+        start = time.perf_counter()
+        with self._file_lock, self._process_lock():
+            blocks = self._read()
+            index = load_or_build(self.path, blocks)
+            prev_hash = blocks[-1].get("hash", "") if blocks else ""
+            committed: List[Committed] = []
+            for kind, data in items:
+                block: Dict[str, Any] = {"ts": _iso_now(), "kind": kind, "data": data, "prev": prev_hash}
+                block["hash"] = block_hash(block)
+                blocks.append(block)
+                index.add(block)
+                committed.append(Committed(block["hash"], len(blocks)))
+                prev_hash = block["hash"]
+            self._write(blocks)
+            index.save(index_path(self.path))
+        elapsed = time.perf_counter() - start
+        self.stats.commits += 1
+        self.stats.blocks += len(items)
+        self.stats.last_batch = len(items)
+        self.stats.largest_batch = max(self.stats.largest_batch, len(items))
+        self.stats.commit_seconds += elapsed
+        return committed
+
+    def _read(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            raise RuntimeError(f"Ledger is not valid JSON: {self.path}") from None
+        if not isinstance(data, list):
+            # Appending would restart the chain and overwrite whatever is there.
+            raise RuntimeError(f"Ledger is not a block list: {self.path}")
+        return data
+
+    def _write(self, blocks: List[Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(json.dumps(blocks, indent=2))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+
+    def _process_lock(self):
+        return _FileLock(self.path.with_name(self.path.name + ".lock"))
+
+
+class _FileLock:
+    """Advisory `flock` so several API workers do not interleave commits."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = None
+
+    def __enter__(self) -> "_FileLock":
+        if fcntl is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a")
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._fh is not None:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            self._fh.close()
+            self._fh = None
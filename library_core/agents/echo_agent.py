@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+from common.keyword_matcher import KeywordMatcher
 from library_core.agents.base import BaseAgent
+from library_core.deadline import check_deadline, context_deadline
 
 
 class EchoAgent(BaseAgent):
@@ -18,6 +20,7 @@ class EchoAgent(BaseAgent):
     }
 
     async def process(self, context) -> Dict[str, Any]:  # noqa: ANN001
+        check_deadline(context_deadline(context), "echo")
         user_text = context.input_text or ""
         styled = f"“{user_text}” ~ echoed by a whisper"
 
@@ -28,7 +31,7 @@ class EchoAgent(BaseAgent):
 
         if len(user_text) > 120:
             beta += 0.2
-        if any(keyword in lower for keyword in self.PERSONA_KEYWORDS["paradox"]):
+        if "paradox" in PERSONA_MATCHER.labels(lower):
             gamma += 0.2
         if len(user_text) < 40:
             alpha += 0.1
@@ -58,3 +61,6 @@ class EchoAgent(BaseAgent):
         }
         await self.append_log("echo", {"input": user_text, "output": styled, "glyph": emoji})
         return result
+
+
+PERSONA_MATCHER = KeywordMatcher(EchoAgent.PERSONA_KEYWORDS)
@@ -2,18 +2,40 @@
 
 from __future__ import annotations
 
-import hashlib
 import json
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
+from ledger.canonical import block_hash
 from library_core.agents.base import BaseAgent
+from library_core.deadline import check_deadline, earliest_deadline
+from library_core.tracing import span
 
 
 class KiraAgent(BaseAgent):
     """Validates ledger integrity and ritual compliance."""
 
+    # Echo's glyph, the ledger Limnus commits to, and Garden's consent state.
+    inputs = ("garden", "echo", "limnus")
+
     async def process(self, context) -> Dict[str, Any]:  # noqa: ANN001
+        return (await self.process_batch([context]))[0]
+
+    async def process_batch(self, contexts: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Validate several contexts against a single read of the ledger and Garden state."""
+        with span("kira.verify_ledger"):
+            shared_issues = self._ledger_issues(earliest_deadline(contexts))
+
+        with span("storage.get_state", key="garden"):
+            garden_state = await self.get_state("garden")
+        ledger = garden_state.get("ledger", {})
+        entries = ledger.get("entries", [])
+        if not any(entry.get("kind") == "consent" for entry in entries):
+            shared_issues.append("No consent recorded in ritual ledger")
+
+        return [await self._assess(context, list(shared_issues)) for context in contexts]
+
+    def _ledger_issues(self, deadline: Optional[float] = None) -> List[str]:
         issues: List[str] = []
         ledger_path = self.record.path / "state" / "ledger.json"
 
@@ -31,11 +53,10 @@ class KiraAgent(BaseAgent):
                 issues.append("Genesis block prev field should be empty")
 
             for index, block in enumerate(ledger_blocks):
-                block_copy = {k: block[k] for k in block if k != "hash"}
-                calc_hash = hashlib.sha256(
-                    json.dumps(block_copy, sort_keys=True).encode("utf-8")
-                ).hexdigest()
-                if block.get("hash") != calc_hash:
+                if index % 256 == 0:
+                    # Hashing a long chain is the slow part; give up once the request has.
+                    check_deadline(deadline, "kira ledger verification")
+                if block.get("hash") != block_hash(block):
                     issues.append(f"Hash mismatch at block {index}")
 
                 if index > 0:
@@ -51,13 +72,9 @@ class KiraAgent(BaseAgent):
                             issues.append(f"Timestamp out of order at block {index}")
                     except Exception:  # pragma: no cover - defensive
                         pass
+        return issues
 
-        garden_state = await self.get_state("garden")
-        ledger = garden_state.get("ledger", {})
-        entries = ledger.get("entries", [])
-        if not any(entry.get("kind") == "consent" for entry in entries):
-            issues.append("No consent recorded in ritual ledger")
-
+    async def _assess(self, context, issues: List[str]) -> Dict[str, Any]:  # noqa: ANN001
         # Coherence check: ensure glyph is present in styled text
         echo_state = context.agent_results.get("echo", {})
         styled = echo_state.get("styled_text", "")
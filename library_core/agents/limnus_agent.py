@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import json
+import os
+import threading
 import uuid
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
+from ledger.canonical import block_hash
+from ledger.writer import Committed, LedgerWriter
 from library_core.agents.base import BaseAgent
+from library_core.deadline import check_deadline, earliest_deadline
+from library_core.tracing import span
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -18,13 +23,25 @@ if TYPE_CHECKING:
     from workspace.manager import WorkspaceManager
 
 
+_MEMORY_LOCKS: Dict[str, threading.Lock] = {}
+_MEMORY_LOCKS_GUARD = threading.Lock()
+
+
 def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def _memory_lock(path: Path) -> threading.Lock:
+    with _MEMORY_LOCKS_GUARD:
+        return _MEMORY_LOCKS.setdefault(str(path.resolve()), threading.Lock())
+
+
 class LimnusAgent(BaseAgent):
     """Manages quantum caches and the hash-chained ledger."""
 
+    # Results this agent reads from `context.agent_results`.
+    inputs = ("echo",)
+
     def __init__(
         self,
         workspace_id: str,
@@ -45,80 +62,116 @@ class LimnusAgent(BaseAgent):
                 "data": {"anchor": "I return as breath."},
                 "prev": "",
             }
-            genesis["hash"] = hashlib.sha256(
-                json.dumps(genesis, sort_keys=True).encode("utf-8")
-            ).hexdigest()
+            genesis["hash"] = block_hash(genesis)
             self.ledger_path.write_text(json.dumps([genesis], indent=2), encoding="utf-8")
+        # Commits for this workspace are serialised (and group-committed) here.
+        self.ledger = LedgerWriter.for_path(self.ledger_path)
 
     async def process(self, context) -> Dict[str, Any]:  # noqa: ANN001
-        memories: List[Dict[str, Any]] = await asyncio.to_thread(self._read_json, self.mem_path, [])
-
-        for entry in memories:
-            if entry.get("layer") == "L1":
-                entry["layer"] = "L2"
-        l2_count = sum(1 for entry in memories if entry.get("layer") == "L2")
-        if l2_count > 5:
-            for entry in memories:
-                if entry.get("layer") == "L2":
-                    entry["layer"] = "L3"
-
-        entry_id = f"mem_{uuid.uuid4().hex[:8]}"
-        new_entry = {
-            "id": entry_id,
-            "ts": _iso_now(),
-            "text": context.input_text or "",
-            "layer": "L1",
-            "tags": [context.user_id] if context.user_id else [],
-        }
-        memories.append(new_entry)
-        await asyncio.to_thread(self._write_json, self.mem_path, memories)
-
-        ledger_blocks: List[Dict[str, Any]] = await asyncio.to_thread(
-            self._read_json, self.ledger_path, []
-        )
-        previous_hash = ledger_blocks[-1]["hash"] if ledger_blocks else ""
-        echo_res = context.agent_results.get("echo", {})
-        block = {
-            "ts": _iso_now(),
-            "kind": "input",
-            "data": {
+        return (await self.process_batch([context]))[0]
+
+    async def process_batch(self, contexts: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Process several contexts with one memory write and one ledger commit."""
+        deadline = earliest_deadline(contexts)
+        check_deadline(deadline, "limnus")
+        entries = [
+            {
+                "id": f"mem_{uuid.uuid4().hex[:8]}",
+                "ts": _iso_now(),
                 "text": context.input_text or "",
-                "styled_text": echo_res.get("styled_text", ""),
-                "glyph": echo_res.get("glyph", ""),
-            },
-            "prev": previous_hash,
-        }
-        block["hash"] = hashlib.sha256(
-            json.dumps(block, sort_keys=True).encode("utf-8")
-        ).hexdigest()
-        ledger_blocks.append(block)
-        await asyncio.to_thread(self._write_json, self.ledger_path, ledger_blocks)
-
-        context.metadata["last_block_hash"] = block["hash"]
-        context.metadata["memory_count"] = len(memories)
-
-        # Compute simple stats for integration visibility
-        l1_count = sum(1 for e in memories if e.get("layer") == "L1")
-        l2_count = sum(1 for e in memories if e.get("layer") == "L2")
-        l3_count = sum(1 for e in memories if e.get("layer") == "L3")
-        stats = {
-            "L1_count": l1_count,
-            "L2_count": l2_count,
-            "L3_count": l3_count,
-            "total_blocks": len(ledger_blocks),
-        }
-
-        result = {
-            "cached": True,
-            "memory_id": entry_id,
-            "layer": "L1",
-            "block_hash": block["hash"],
-            "stats": stats,
-        }
-        await self.append_log(
-            "limnus", {"memory_id": entry_id, "layer": "L1", "hash": block["hash"]}
-        )
-        return result
+                "layer": "L1",
+                "tags": [context.user_id] if context.user_id else [],
+            }
+            for context in contexts
+        ]
+        blocks = []
+        for context in contexts:
+            echo_res = context.agent_results.get("echo", {})
+            blocks.append(
+                (
+                    "input",
+                    {
+                        "text": context.input_text or "",
+                        "styled_text": echo_res.get("styled_text", ""),
+                        "glyph": echo_res.get("glyph", ""),
+                    },
+                )
+            )
+        # Memory and ledger are written together or not at all: the worker checks
+        # the deadline just before writing, and once it has written, the shield
+        # lets the ledger commit finish even if this call is timed out.
+        layer_counts, committed = await asyncio.shield(self._persist(entries, blocks, deadline))
+
+        results: List[Dict[str, Any]] = []
+        for context, entry, counts, block in zip(contexts, entries, layer_counts, committed):
+            context.metadata["last_block_hash"] = block.hash
+            context.metadata["memory_count"] = counts["total"]
+
+            # Compute simple stats for integration visibility
+            stats = {
+                "L1_count": counts["L1"],
+                "L2_count": counts["L2"],
+                "L3_count": counts["L3"],
+                "total_blocks": block.height,
+            }
+            results.append(
+                {
+                    "cached": True,
+                    "memory_id": entry["id"],
+                    "layer": "L1",
+                    "block_hash": block.hash,
+                    "stats": stats,
+                }
+            )
+            await self.append_log(
+                "limnus", {"memory_id": entry["id"], "layer": "L1", "hash": block.hash}
+            )
+        return results
+
+    async def _persist(
+        self,
+        entries: Sequence[Dict[str, Any]],
+        blocks: Sequence[Any],
+        deadline: Optional[float],
+    ) -> Tuple[List[Dict[str, int]], List[Committed]]:
+        with span("limnus.memory_write", entries=len(entries)):
+            layer_counts = await asyncio.to_thread(self._append_memories, entries, deadline)
+        with span("ledger.commit", blocks=len(blocks)):
+            committed = await self.ledger.commit_many(blocks)
+        return layer_counts, committed
+
+    def _append_memories(
+        self, new_entries: Sequence[Dict[str, Any]], deadline: Optional[float] = None
+    ) -> List[Dict[str, int]]:
+        """Promote layers and append each entry in turn, as one read-modify-write.
+
+        Returns the layer counts (and total) as they stood after each append.
+        Nothing is written if `deadline` passes before the write.
+        """
+        snapshots: List[Dict[str, int]] = []
+        with _memory_lock(self.mem_path):
+            memories: List[Dict[str, Any]] = self._read_json(self.mem_path, [])
+            for new_entry in new_entries:
+                for entry in memories:
+                    if entry.get("layer") == "L1":
+                        entry["layer"] = "L2"
+                l2_count = sum(1 for entry in memories if entry.get("layer") == "L2")
+                if l2_count > 5:
+                    for entry in memories:
+                        if entry.get("layer") == "L2":
+                            entry["layer"] = "L3"
+                memories.append(new_entry)
+                snapshots.append(
+                    {
+                        "L1": sum(1 for e in memories if e.get("layer") == "L1"),
+                        "L2": sum(1 for e in memories if e.get("layer") == "L2"),
+                        "L3": sum(1 for e in memories if e.get("layer") == "L3"),
+                        "total": len(memories),
+                    }
+                )
+            check_deadline(deadline, "limnus memory write")
+            self._write_json(self.mem_path, memories)
+        return snapshots
 
     @staticmethod
     def _read_json(path: Path, default: Any) -> Any:
@@ -131,4 +184,6 @@ class LimnusAgent(BaseAgent):
 
     @staticmethod
     def _write_json(path: Path, data: Any) -> None:
-        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
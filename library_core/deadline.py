@@ -0,0 +1,37 @@
+"""Cooperative request deadlines for agents.
+
+The enhanced dispatcher stamps each `PipelineContext` with ``deadline``, a
+`time.monotonic()` timestamp. `asyncio.wait_for` can cancel an agent's
+coroutine but not a thread started with `asyncio.to_thread`, so agents call
+`check_deadline` before work that would otherwise outlive the request,
+in particular right before writing state from a worker thread.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Iterable, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before this step could start."""
+
+
+def context_deadline(context: Any) -> Optional[float]:
+    return getattr(context, "deadline", None)
+
+
+def earliest_deadline(contexts: Iterable[Any]) -> Optional[float]:
+    deadlines = [d for d in map(context_deadline, contexts) if d is not None]
+    return min(deadlines) if deadlines else None
+
+
+def time_remaining(deadline: Optional[float]) -> float:
+    return math.inf if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(deadline: Optional[float], step: str = "") -> None:
+    """Raise `DeadlineExceeded` if `deadline` has passed."""
+    if time_remaining(deadline) <= 0:
+        raise DeadlineExceeded(f"deadline exceeded before {step}" if step else "deadline exceeded")
@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 
+from interface.state_cache import state_cache
 from library_core.agents import EchoAgent, GardenAgent, KiraAgent, LimnusAgent
 from library_core.storage import StorageManager
 from pipeline.intent_parser import IntentParser, ParsedIntent
@@ -39,6 +39,7 @@ class PrimeDispatcher:
         self.manager = manager or WorkspaceManager()
         self.record = self.manager.get(workspace_id)
         self._ensure_state_dirs()
+        self.state = state_cache(self.record.path)
 
         storage = StorageManager(self.record.path)
         self.garden = GardenAgent(self.workspace_id, storage, self.manager)
@@ -63,6 +64,10 @@ class PrimeDispatcher:
     # ------------------------------------------------------------------ internals
 
     def _dispatch_sync(self, context: PrimeContext) -> Dict[str, Any]:
+        with self.state.batch():
+            return self._run_agents(context)
+
+    def _run_agents(self, context: PrimeContext) -> Dict[str, Any]:
         asyncio.run(self.logger.log_start(context))
 
         try:
@@ -111,8 +116,8 @@ class PrimeDispatcher:
         state_path = self.record.path / "state" / "echo_state.json"
         persona = "balanced"
         tone = "neutral"
-        if state_path.exists():
-            data = json.loads(state_path.read_text(encoding="utf-8"))
+        data = self.state.read(state_path, None)
+        if data is not None:
             persona = data.get("last_mode", "balanced")
             tone = persona
         return {"styled_text": styled, "persona": persona, "style": {"tone": tone}}
@@ -121,8 +126,8 @@ class PrimeDispatcher:
         self.limnus.cache(context.input_text, tags=[context.user_id])
         mem_path = self.record.path / "state" / "limnus_memory.json"
         memory_id = None
-        if mem_path.exists():
-            entries = json.loads(mem_path.read_text(encoding="utf-8"))
+        entries = self.state.read(mem_path, None)
+        if entries is not None:
             if entries:
                 memory_id = entries[-1].get("id")
                 layer = entries[-1].get("layer", "L2")
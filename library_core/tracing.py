@@ -0,0 +1,320 @@
+"""Lightweight span tracing for dispatches, agents and storage calls.
+
+A dispatch opens a root span with `Tracer.trace`; anything running inside it
+(agent attempts, a Limnus memory write in a worker thread, a ledger commit)
+opens child spans with `span`, which finds its parent through a context
+variable, so it follows tasks and `asyncio.to_thread` without threading ids
+through every call. Durations come from `time.monotonic()`; wall-clock times
+are derived from one anchor per tracer, for export only.
+
+Sampling is decided once per trace. An unsampled trace costs one context
+variable lookup per `span` call: no span objects are created.
+
+Finished traces are exported as OTLP/JSON (``ExportTraceServiceRequest``),
+either appended to a JSONL file or POSTed to a collector's ``/v1/traces``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["Span"]] = ContextVar("vesselos_current_span", default=None)
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float  # time.monotonic()
+    tracer: "Tracer" = field(repr=False)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    end: Optional[float] = None
+    error: Optional[str] = None
+    # Finished spans of the whole trace, shared by every span in it.
+    finished: List["Span"] = field(default_factory=list, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.tracer.clock()) - self.start
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def child(self, name: str, **attributes: Any) -> "Span":
+        return Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=self.tracer.new_id(8),
+            parent_id=self.span_id,
+            start=self.tracer.clock(),
+            tracer=self.tracer,
+            attributes=attributes,
+            finished=self.finished,
+        )
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if self.end is not None:
+            return
+        self.end = self.tracer.clock()
+        if error is not None and self.error is None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.finished.append(self)
+        if self.parent_id is None:
+            self.tracer.export(self.finished)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def record_error(span: Optional[Span], error: BaseException) -> None:
+    """Mark `span` failed without ending it (for errors handled inside it)."""
+    if span is not None and span.error is None:
+        span.error = f"{type(error).__name__}: {error}"
+
+
+@contextmanager
+def activate(span: Optional[Span]) -> Iterator[Optional[Span]]:
+    """Make `span` the parent of spans opened inside the block."""
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Child of the current span, active for the block; None when not tracing."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.finish(exc)
+        raise
+    finally:
+        _current.reset(token)
+        child.finish()
+
+
+# ---------------------------------------------------------------------- exporters
+class SpanExporter:
+    def export(self, spans: Sequence[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        return None
+
+
+class MemorySpanExporter(SpanExporter):
+    """Keeps finished traces in memory (tests, debugging)."""
+
+    def __init__(self) -> None:
+        self.traces: List[List[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.traces.append(list(spans))
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one OTLP/JSON export request per trace to a JSONL file."""
+
+    def __init__(self, path: Path | str, service_name: str = "vesselos") -> None:
+        self.path = Path(path)
+        self.service_name = service_name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(to_otlp(spans, self.service_name), separators=(",", ":"))
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class OTLPHttpExporter(SpanExporter):
+    """POSTs OTLP/JSON to a collector (e.g. ``http://localhost:4318/v1/traces``)."""
+
+    def __init__(self, endpoint: str, service_name: str = "vesselos", timeout: float = 5.0) -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: Sequence[Span]) -> None:
+        body = json.dumps(to_otlp(spans, self.service_name)).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, method="POST", headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: Sequence[Span], service_name: str = "vesselos") -> Dict[str, Any]:
+    """Encode one trace's spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    encoded = []
+    for item in spans:
+        end = item.end if item.end is not None else item.start
+        entry: Dict[str, Any] = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(item.tracer.unix_nanos(item.start)),
+            "endTimeUnixNano": str(item.tracer.unix_nanos(end)),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item.attributes.items()],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent_id:
+            entry["parentSpanId"] = item.parent_id
+        encoded.append(entry)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+                "scopeSpans": [{"scope": {"name": "vesselos.pipeline"}, "spans": encoded}],
+            }
+        ]
+    }
+
+
+# ---------------------------------------------------------------------- tracer
+class Tracer:
+    """Starts sampled traces and exports them off the event loop.
+
+    `sample_rate` is the share of traces recorded; a dispatch can force the
+    decision either way (``sampled=True/False``). Finished traces are handed
+    to `exporter` on a background thread; at most `max_pending` traces wait
+    for export, newer ones are dropped (and counted) beyond that.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        *,
+        sample_rate: float = 1.0,
+        max_pending: int = 1024,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+        self.clock = clock
+        self._rng = rng
+        self._epoch = time.time() - clock()
+        self._pending: "queue.Queue[Optional[Sequence[Span]]]" = queue.Queue(max(1, max_pending))
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.started = 0
+        self.exported = 0
+        self.dropped = 0
+
+    @staticmethod
+    def new_id(size: int) -> str:
+        return os.urandom(size).hex()
+
+    def unix_nanos(self, monotonic: float) -> int:
+        return int((monotonic + self._epoch) * 1e9)
+
+    def start(self, name: str, sampled: Optional[bool] = None, **attributes: Any) -> Optional[Span]:
+        """Start a root span, or return None if the trace is not sampled."""
+        if sampled is None:
+            sampled = self.sample_rate >= 1.0 or (self.sample_rate > 0.0 and self._rng() < self.sample_rate)
+        if not sampled or self.exporter is None:
+            return None
+        self.started += 1
+        return Span(
+            name=name,
+            trace_id=self.new_id(16),
+            span_id=self.new_id(8),
+            parent_id=None,
+            start=self.clock(),
+            tracer=self,
+            attributes=attributes,
+        )
+
+    @contextmanager
+    def trace(self, name: str, sampled: Optional[bool] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Root span active for the block; nested `span` calls become its children."""
+        root = self.start(name, sampled, **attributes)
+        token = _current.set(root)
+        try:
+            yield root
+        except BaseException as exc:
+            if root is not None:
+                root.finish(exc)
+            raise
+        finally:
+            _current.reset(token)
+            if root is not None:
+                root.finish()
+
+    # ------------------------------------------------------------------ export
+    def export(self, spans: Sequence[Span]) -> None:
+        try:
+            self._pending.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._worker.start()
+
+    def flush(self) -> None:
+        """Block until every trace finished so far has been exported."""
+        if self._worker is not None:
+            self._pending.join()
+
+    def _run(self) -> None:
+        while True:
+            spans = self._pending.get()
+            try:
+                if spans is None:
+                    return
+                assert self.exporter is not None
+                self.exporter.export(spans)
+                self.exported += 1
+            except Exception as exc:
+                self.dropped += 1
+                logger.warning("Span export failed: %s", exc)
+            finally:
+                self._pending.task_done()
+
+    def shutdown(self) -> None:
+        self.flush()
+        if self._worker is not None:
+            self._pending.put(None)
+            self._worker.join()
+            self._worker = None
+        if self.exporter is not None:
+            self.exporter.shutdown()
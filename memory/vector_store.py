@@ -6,6 +6,7 @@ import hashlib
 import json
 import math
 import os
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
@@ -54,6 +55,26 @@ FAISS_INDEX_FILE = STATE_DIR / "limnus.faiss"
 FAISS_META_FILE = STATE_DIR / "limnus.faiss.meta.json"
 
 
+@dataclass
+class EmbeddingStats:
+    calls: int = 0
+    texts: int = 0
+    seconds: float = 0.0
+
+
+# Process-wide embedding timings per backend (read by pipeline.prometheus).
+EMBEDDING_STATS: Dict[str, EmbeddingStats] = {}
+
+
+def record_embedding(backend: str, texts: int, seconds: float) -> None:
+    stats = EMBEDDING_STATS.get(backend)
+    if stats is None:
+        stats = EMBEDDING_STATS.setdefault(backend, EmbeddingStats())
+    stats.calls += 1
+    stats.texts += texts
+    stats.seconds += seconds
+
+
 class FaissUnavailable(RuntimeError):
     """Raised when FAISS backend is requested but dependencies are missing."""
 
@@ -275,10 +296,16 @@ class Embedder:
             self.backend_name = "hash"
 
     def embed(self, text: str) -> List[float]:
-        return self.impl.embed(text)
+        start = time.perf_counter()
+        vector = self.impl.embed(text)
+        record_embedding(self.backend_name, 1, time.perf_counter() - start)
+        return vector
 
     def embed_many(self, texts: List[str]) -> List[List[float]]:
-        return self.impl.embed_many(texts)
+        start = time.perf_counter()
+        vectors = self.impl.embed_many(texts)
+        record_embedding(self.backend_name, len(texts), time.perf_counter() - start)
+        return vectors
 
     # ------------------------------------------------------------------ helpers
     def _auto_backend(self) -> str:
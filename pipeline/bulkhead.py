@@ -0,0 +1,67 @@
+"""Per-agent concurrency limits (bulkheads) for the enhanced dispatcher."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BulkheadFullError(RuntimeError):
+    """Raised when an agent's bulkhead cannot admit another call."""
+
+    def __init__(self, name: str, reason: str) -> None:
+        super().__init__(f"bulkhead_full:{name}:{reason}")
+        self.name = name
+        self.reason = reason
+
+
+class Bulkhead:
+    """Caps concurrent calls into one agent and bounds the queue in front of it.
+
+    At most `max_concurrent` calls run at once. Up to `max_queue` more may
+    wait, each for at most `max_wait` seconds; anything beyond that is shed
+    with `BulkheadFullError` instead of piling up behind a degraded agent.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, *, max_queue: int = 32, max_wait: float = 1.0) -> None:
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.active = 0
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None) -> AsyncIterator[float]:
+        """Hold one slot for the body; yields the seconds spent queued.
+
+        `timeout` (e.g. the dispatch's remaining time) shortens `max_wait`.
+        """
+        start = time.perf_counter()
+        if not self._semaphore.locked():
+            # A free slot is taken without suspending, so the counts stay exact.
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            raise BulkheadFullError(self.name, "queue_full")
+        else:
+            wait = self.max_wait if timeout is None else min(self.max_wait, timeout)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=max(wait, 0.0))
+            except asyncio.TimeoutError:
+                raise BulkheadFullError(self.name, "wait_timeout") from None
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        try:
+            yield time.perf_counter() - start
+        finally:
+            self.active -= 1
+            self._semaphore.release()
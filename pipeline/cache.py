@@ -0,0 +1,324 @@
+"""Response caches for the enhanced dispatcher.
+
+`ResponseCache` is the bounded in-process store. The `CacheBackend`
+implementations wrap it (`MemoryCacheBackend`) or share entries between API
+workers and across restarts (`SQLiteCacheBackend`, `RedisCacheBackend`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import logging
+
+try:  # optional dependency
+    import redis.asyncio as aioredis  # type: ignore
+except Exception:  # pragma: no cover
+    aioredis = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def encode_response(response: Dict[str, Any]) -> bytes:
+    return json.dumps(response, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def decode_response(raw: bytes) -> Dict[str, Any]:
+    return json.loads(raw.decode("utf-8"))
+
+
+@dataclass
+class CacheStats:
+    entries: int = 0
+    bytes: int = 0
+    evictions: Dict[str, int] = field(default_factory=lambda: {"lru": 0, "bytes": 0, "expired": 0})
+    rejected: int = 0
+
+
+class ResponseCache:
+    """LRU + TTL cache bounded by entry count and by encoded byte size.
+
+    Responses are stored encoded, so every hit decodes a fresh dict and
+    callers can mutate it without touching the cached copy. Expired entries
+    are dropped when read and by a sweep that runs at most every
+    `sweep_interval` seconds from `set`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: float = 300.0,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._last_sweep = clock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        raw, expires = entry
+        if self._clock() >= expires:
+            self._drop(key, "expired")
+            return None
+        self._entries.move_to_end(key)
+        return decode_response(raw)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        now = self._clock()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+        raw = encode_response(response)
+        if len(raw) > self.max_bytes:
+            self.stats.rejected += 1
+            logger.debug("Response for %s exceeds cache byte budget (%d bytes)", key[:12], len(raw))
+            return
+        if key in self._entries:
+            self._drop(key, None)
+        self._entries[key] = (raw, now + self.ttl)
+        self.stats.bytes += len(raw)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)), "lru")
+        while self.stats.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)), "bytes")
+        self.stats.entries = len(self._entries)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        now = self._clock() if now is None else now
+        self._last_sweep = now
+        expired = [key for key, (_raw, expires) in self._entries.items() if now >= expires]
+        for key in expired:
+            self._drop(key, "expired")
+        return len(expired)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats.entries = 0
+        self.stats.bytes = 0
+
+    def _drop(self, key: str, reason: Optional[str]) -> None:
+        raw, _expires = self._entries.pop(key)
+        self.stats.bytes -= len(raw)
+        self.stats.entries = len(self._entries)
+        if reason is not None:
+            self.stats.evictions[reason] += 1
+
+
+class CacheBackend:
+    """Async interface the dispatcher uses for its response cache."""
+
+    name = "base"
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process `ResponseCache`; the default."""
+
+    name = "memory"
+
+    def __init__(self, cache: ResponseCache) -> None:
+        self.cache = cache
+        self.stats = cache.stats
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        self.cache.set(key, response)
+
+    async def clear(self) -> None:
+        self.cache.clear()
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache shared by every process that opens the same SQLite file.
+
+    Uses WAL so several uvicorn workers can read while one writes, and wall
+    clock expiry so entries survive restarts. The entry and byte limits are
+    enforced across all writers by evicting least-recently-read rows.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: float = 300.0,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await asyncio.to_thread(self._get, key)
+        return decode_response(raw) if raw is not None else None
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        raw = encode_response(response)
+        if len(raw) > self.max_bytes:
+            self.stats.rejected += 1
+            return
+        await asyncio.to_thread(self._set, key, raw)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM responses")
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now >= row[1]:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.evictions["expired"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return bytes(row[0])
+
+    def _set(self, key: str, raw: bytes) -> None:
+        now = self._clock()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now - self._last_sweep >= self.sweep_interval:
+                    self._last_sweep = now
+                    swept = conn.execute("DELETE FROM responses WHERE expires <= ?", (now,)).rowcount
+                    self.stats.evictions["expired"] += max(swept, 0)
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, raw, len(raw), now + self.ttl, now),
+                )
+                entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+                while entries > self.max_entries or size > self.max_bytes:
+                    victim = conn.execute(
+                        "SELECT key, size FROM responses WHERE key != ? ORDER BY accessed LIMIT 1", (key,)
+                    ).fetchone()
+                    if victim is None:
+                        break
+                    conn.execute("DELETE FROM responses WHERE key = ?", (victim[0],))
+                    self.stats.evictions["lru" if entries > self.max_entries else "bytes"] += 1
+                    entries -= 1
+                    size -= victim[1]
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.stats.entries = entries
+        self.stats.bytes = size
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache in Redis, shared by every worker and host pointing at `url`.
+
+    Expiry uses Redis TTLs. Bound total memory on the server with
+    ``maxmemory`` and ``maxmemory-policy allkeys-lru``; this backend only
+    refuses single responses above `max_bytes`.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        *,
+        ttl: float = 300.0,
+        max_bytes: int = 16 * 1024 * 1024,
+        prefix: str = "vesselos:response:",
+        client: Any = None,
+    ) -> None:
+        super().__init__()
+        if client is None:
+            if aioredis is None:
+                raise RuntimeError("redis is not installed; pip install redis or use the sqlite cache backend")
+            client = aioredis.from_url(url)
+        self.client = client
+        self.ttl = ttl
+        self.max_bytes = max(1, max_bytes)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(self.prefix + key)
+        return decode_response(raw) if raw is not None else None
+
+    async def set(self, key: str, response: Dict[str, Any]) -> None:
+        raw = encode_response(response)
+        if len(raw) > self.max_bytes:
+            self.stats.rejected += 1
+            return
+        await self.client.set(self.prefix + key, raw, px=max(1, int(self.ttl * 1000)))
+
+    async def clear(self) -> None:
+        async for name in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(name)
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import threading
 import time
+from collections import deque
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 
 import logging
 
@@ -17,59 +19,236 @@ class CircuitState(str, Enum):
     HALF_OPEN = "half_open"
 
 
+TransitionCallback = Callable[[str, CircuitState, CircuitState, str], None]
+
+
 class CircuitBreaker:
+    """Failure-rate circuit breaker, safe to share between threads and tasks.
+
+    CLOSED trips to OPEN when any of these holds:
+
+    * `failure_threshold` consecutive failures;
+    * at least `minimum_calls` outcomes in the sliding window and a failure
+      rate of `failure_rate_threshold` or more;
+    * `slow_call_duration` is set, at least `minimum_calls` outcomes, and the
+      share of calls taking that long reaches `slow_call_rate_threshold`.
+
+    The window holds the last `window_size` calls (``window_type="count"``)
+    or the calls of the last `window_size` seconds (``"time"``). After
+    `timeout` seconds OPEN becomes HALF_OPEN, which admits at most
+    `max_half_open_calls` concurrent probes; `half_open_attempts` successes
+    close the circuit and one failed or slow probe reopens it.
+
+    Methods take a lock but never block on I/O, so they are safe to call from
+    coroutines. `on_transition(name, old, new, reason)` runs after each state
+    change, outside the lock.
+    """
+
     def __init__(
         self,
         failure_threshold: int = 5,
         timeout: int = 60,
         half_open_attempts: int = 1,
+        *,
+        name: str = "",
+        window_type: str = "count",
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 0.8,
+        max_half_open_calls: int = 1,
+        on_transition: Optional[TransitionCallback] = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
+        if window_type not in ("count", "time"):
+            raise ValueError(f"Unknown circuit breaker window type: {window_type}")
+        self.name = name
         self.failure_threshold = failure_threshold
         self.timeout = timeout
         self.half_open_attempts = half_open_attempts
+        self.window_type = window_type
+        self.window_size = window_size
+        self.minimum_calls = max(1, minimum_calls)
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.max_half_open_calls = max(1, max_half_open_calls)
+        self.on_transition = on_transition
+        self._clock = clock
+        self._lock = threading.Lock()
 
         self.state: CircuitState = CircuitState.CLOSED
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
+        self.opened_at: Optional[float] = None
         self.half_open_successes = 0
+        self.half_open_inflight = 0
+        self.transitions: Dict[str, int] = {}
+        # (timestamp, failed, slow) per recorded call, with running totals.
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self._window_failures = 0
+        self._window_slow = 0
+
+    # ------------------------------------------------------------------ admission
+    def allow_request(self) -> bool:
+        """Admit a call, reserving a probe slot when HALF_OPEN.
+
+        Every admitted call must end with `record_success`, `record_failure`
+        or `release`.
+        """
+        with self._lock:
+            event = None
+            if self.state == CircuitState.OPEN:
+                assert self.opened_at is not None
+                if self._clock() - self.opened_at < self.timeout:
+                    return False
+                event = self._transition(CircuitState.HALF_OPEN, "timeout elapsed")
+            if self.state == CircuitState.HALF_OPEN:
+                allowed = self.half_open_inflight < self.max_half_open_calls
+                if allowed:
+                    self.half_open_inflight += 1
+            else:
+                allowed = True
+        self._notify(event)
+        return allowed
 
     def is_open(self) -> bool:
-        if self.state == CircuitState.OPEN:
-            assert self.last_failure_time is not None
-            if time.time() - self.last_failure_time >= self.timeout:
-                logger.info("Circuit breaker transitioning to HALF_OPEN")
-                self.state = CircuitState.HALF_OPEN
-                self.half_open_successes = 0
-                return False
-            return True
-        return False
-
-    def record_success(self) -> None:
-        if self.state == CircuitState.HALF_OPEN:
-            self.half_open_successes += 1
-            if self.half_open_successes >= self.half_open_attempts:
-                logger.info("Circuit breaker transitioning to CLOSED")
-                self.state = CircuitState.CLOSED
+        """Back-compat inverse of `allow_request` (and reserves a probe too)."""
+        return not self.allow_request()
+
+    def release(self) -> None:
+        """Return an admitted call's probe slot without recording an outcome."""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN and self.half_open_inflight:
+                self.half_open_inflight -= 1
+
+    # ------------------------------------------------------------------ outcomes
+    def record_success(self, duration: Optional[float] = None) -> None:
+        slow = self._is_slow(duration)
+        with self._lock:
+            event = None
+            if self.state == CircuitState.HALF_OPEN:
+                self.half_open_inflight = max(0, self.half_open_inflight - 1)
+                if slow:
+                    event = self._open("slow probe")
+                else:
+                    self.half_open_successes += 1
+                    if self.half_open_successes >= self.half_open_attempts:
+                        event = self._transition(CircuitState.CLOSED, "probe succeeded")
+            elif self.state == CircuitState.CLOSED:
                 self.failure_count = 0
-                self.last_failure_time = None
-        else:
-            self.failure_count = 0
+                self._push(False, slow)
+                event = self._evaluate()
+        self._notify(event)
 
-    def record_failure(self) -> None:
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        if self.state == CircuitState.HALF_OPEN:
-            logger.warning("Circuit breaker transitioning to OPEN (recovery failed)")
-            self.state = CircuitState.OPEN
-            return
-        if self.failure_count >= self.failure_threshold:
-            logger.warning("Circuit breaker transitioning to OPEN (threshold reached)")
-            self.state = CircuitState.OPEN
+    def record_failure(self, duration: Optional[float] = None) -> None:
+        slow = self._is_slow(duration)
+        with self._lock:
+            event = None
+            self.failure_count += 1
+            self.last_failure_time = time.time()
+            if self.state == CircuitState.HALF_OPEN:
+                self.half_open_inflight = max(0, self.half_open_inflight - 1)
+                event = self._open("recovery failed")
+            elif self.state == CircuitState.CLOSED:
+                self._push(True, slow)
+                if self.failure_count >= self.failure_threshold:
+                    event = self._open("threshold reached")
+                else:
+                    event = self._evaluate()
+        self._notify(event)
 
     def reset(self) -> None:
         logger.info("Circuit breaker manually reset")
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.half_open_successes = 0
+        with self._lock:
+            event = self._transition(CircuitState.CLOSED, "manual reset") if self.state != CircuitState.CLOSED else None
+            self.failure_count = 0
+            self.last_failure_time = None
+            self.half_open_successes = 0
+            self.half_open_inflight = 0
+        self._notify(event)
+
+    # ------------------------------------------------------------------ metrics
+    def rates(self) -> Tuple[int, float, float]:
+        """(calls, failure_rate, slow_call_rate) over the current window."""
+        with self._lock:
+            return self._rates()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            calls, failure_rate, slow_rate = self._rates()
+            return {
+                "state": self.state.value,
+                "calls": calls,
+                "failure_rate": failure_rate,
+                "slow_call_rate": slow_rate,
+                "consecutive_failures": self.failure_count,
+                "half_open_inflight": self.half_open_inflight,
+                "transitions": dict(self.transitions),
+            }
+
+    # ------------------------------------------------------------------ internals
+    def _is_slow(self, duration: Optional[float]) -> bool:
+        return self.slow_call_duration is not None and duration is not None and duration >= self.slow_call_duration
+
+    def _push(self, failed: bool, slow: bool) -> None:
+        if self.window_type == "count" and len(self._window) >= self.window_size:
+            self._pop()
+        self._window.append((self._clock(), failed, slow))
+        self._window_failures += failed
+        self._window_slow += slow
+
+    def _pop(self) -> None:
+        _ts, failed, slow = self._window.popleft()
+        self._window_failures -= failed
+        self._window_slow -= slow
+
+    def _rates(self) -> Tuple[int, float, float]:
+        if self.window_type == "time":
+            horizon = self._clock() - self.window_size
+            while self._window and self._window[0][0] <= horizon:
+                self._pop()
+        calls = len(self._window)
+        if not calls:
+            return 0, 0.0, 0.0
+        return calls, self._window_failures / calls, self._window_slow / calls
+
+    def _evaluate(self) -> Optional[Tuple[CircuitState, CircuitState, str]]:
+        calls, failure_rate, slow_rate = self._rates()
+        if calls < self.minimum_calls:
+            return None
+        if failure_rate >= self.failure_rate_threshold:
+            return self._open(f"failure rate {failure_rate:.0%}")
+        if self.slow_call_duration is not None and slow_rate >= self.slow_call_rate_threshold:
+            return self._open(f"slow call rate {slow_rate:.0%}")
+        return None
+
+    def _open(self, reason: str) -> Tuple[CircuitState, CircuitState, str]:
+        self.opened_at = self._clock()
+        return self._transition(CircuitState.OPEN, reason)
+
+    def _transition(self, new: CircuitState, reason: str) -> Tuple[CircuitState, CircuitState, str]:
+        old = self.state
+        self.state = new
+        key = f"{old.value}->{new.value}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        if new == CircuitState.HALF_OPEN:
+            self.half_open_successes = 0
+            self.half_open_inflight = 0
+        elif new == CircuitState.CLOSED:
+            self.failure_count = 0
+            self.last_failure_time = None
+            self._window.clear()
+            self._window_failures = 0
+            self._window_slow = 0
+        log = logger.warning if new == CircuitState.OPEN else logger.info
+        log("Circuit breaker %s transitioning to %s (%s)", self.name or "", new.name, reason)
+        return old, new, reason
 
+    def _notify(self, event: Optional[Tuple[CircuitState, CircuitState, str]]) -> None:
+        if event is not None and self.on_transition is not None:
+            try:
+                self.on_transition(self.name, *event)
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Circuit breaker transition callback failed")
@@ -10,11 +10,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict
 
-from agents.garden.garden_agent import GardenAgent
-from agents.echo.echo_agent import EchoAgent
-from agents.limnus.limnus_agent import LimnusAgent
-from agents.kira.kira_agent import KiraAgent
 from common.logger import Logger
+from interface.dispatcher import get_agent
 
 
 @dataclass
@@ -25,10 +22,10 @@ class _Result:
 
 class Dispatcher:
     def __init__(self) -> None:
-        self.garden = GardenAgent(__import__('pathlib').Path(__file__).resolve().parents[1])
-        self.echo = EchoAgent(__import__('pathlib').Path(__file__).resolve().parents[1])
-        self.limnus = LimnusAgent(__import__('pathlib').Path(__file__).resolve().parents[1])
-        self.kira = KiraAgent(__import__('pathlib').Path(__file__).resolve().parents[1])
+        self.garden = get_agent("garden")
+        self.echo = get_agent("echo")
+        self.limnus = get_agent("limnus")
+        self.kira = get_agent("kira")
         self.logger = Logger()
 
     def dispatch_user_input(self, user_text: str) -> Dict[str, Any]:
@@ -9,20 +9,51 @@ import logging
 import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from library_core.agents import EchoAgent, GardenAgent, KiraAgent, LimnusAgent, VesselIndexAgent
 from library_core.agents.base import BaseAgent
 from library_core.storage import StorageManager
-from pipeline.circuit_breaker import CircuitBreaker
+from library_core import tracing
+from library_core.tracing import FileSpanExporter, OTLPHttpExporter, SpanExporter, Tracer
+from pipeline.bulkhead import Bulkhead, BulkheadFullError
+from pipeline.cache import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+    decode_response,
+    encode_response,
+)
+from pipeline.circuit_breaker import CircuitBreaker, CircuitState
 from pipeline.intent_parser import ParsedIntent
 from pipeline.metrics import MetricsCollector
 from pipeline.middleware import Middleware
+from pipeline.profiling import ProfilingMiddleware
+from pipeline.retry import RetryPolicy
 from pipeline.logger import PipelineLogger
 from workspace.manager import WorkspaceManager
 
 logger = logging.getLogger(__name__)
 
+MIDDLEWARE_HOOKS = ("pre_dispatch", "post_dispatch", "pre_agent", "post_agent", "on_error")
+
+RESPONSE_ALIASES = (
+    ("ritual", "garden"),
+    ("echo", "echo"),
+    ("memory", "limnus"),
+    ("validation", "kira"),
+    ("index", "vessel_index"),
+)
+
+
+def select_fields(response: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """The requested top-level keys of `response` (all when `fields` is None), by reference."""
+    if fields is None:
+        return response
+    return {key: response[key] for key in fields if key in response}
+
 
 @dataclass(slots=True)
 class PipelineContext:
@@ -35,7 +66,13 @@ class PipelineContext:
     agent_results: Dict[str, Any] = field(default_factory=dict)
     errors: List[Dict[str, Any]] = field(default_factory=list)
     metrics: Dict[str, Any] = field(default_factory=dict)
-    trace: List[Dict[str, Any]] = field(default_factory=list)
+    # (event, time.time(), data) per trace event; `trace` formats them on demand.
+    events: List[Tuple[str, float, Dict[str, Any]]] = field(default_factory=list)
+    # `time.monotonic()` by which the whole dispatch must finish; set on dispatch.
+    # Agents check it cooperatively (see `library_core.deadline`).
+    deadline: Optional[float] = None
+    # Agents that never started because the deadline had already passed.
+    skipped: List[str] = field(default_factory=list)
 
     def add_result(self, agent: str, result: Any) -> None:
         self.agent_results[agent] = result
@@ -50,13 +87,30 @@ class PipelineContext:
             }
         )
 
-    def add_trace(self, event: str, data: Dict[str, Any]) -> None:
-        entry = {"event": event, "ts": datetime.now(timezone.utc).isoformat()}
-        entry.update(data)
-        self.trace.append(entry)
+    def skip(self, agent: str, reason: str) -> None:
+        self.skipped.append(agent)
+        self.add_trace("agent_skipped", {"agent": agent, "reason": reason})
 
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+    def add_trace(self, event: str, data: Dict[str, Any]) -> None:
+        self.events.append((event, time.time(), data))
+
+    @property
+    def trace(self) -> List[Dict[str, Any]]:
+        """Trace entries with ISO timestamps, built when first needed."""
+        entries = []
+        for event, ts, data in self.events:
+            entry = {"event": event, "ts": datetime.fromtimestamp(ts, timezone.utc).isoformat()}
+            entry.update(data)
+            entries.append(entry)
+        return entries
+
+    def to_dict(self, *, trace: bool = True) -> Dict[str, Any]:
+        """Shallow view: values are the context's own objects, not copies."""
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__ if name != "events"}
+        data["intent"] = asdict(self.intent)
+        if trace:
+            data["trace"] = self.trace
+        return data
 
 
 @dataclass(slots=True)
@@ -64,16 +118,69 @@ class DispatcherConfig:
     agent_order: List[str] = field(
         default_factory=lambda: ["garden", "echo", "limnus", "kira", "vessel_index"]
     )
+    # Run agents as a dependency DAG (see `EnhancedMRPDispatcher.dependencies`)
+    # instead of strictly in `agent_order`.
     parallel_execution: bool = False
+    # Extra/overriding inputs per agent, merged over each agent's `inputs`.
+    agent_inputs: Dict[str, List[str]] = field(default_factory=dict)
     timeout_seconds: int = 30
     retry_enabled: bool = True
     retry_attempts: int = 3
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0  # base for full-jitter exponential backoff
+    retry_max_delay: float = 10.0
+    # Each agent may spend at most `retry_budget` retries per window.
+    retry_budget: int = 20
+    retry_budget_window: float = 60.0
+    # Per-agent bulkheads: at most N concurrent calls per agent (`agent_concurrency`
+    # overrides the default; 0 disables). Calls beyond the limit queue up to
+    # `bulkhead_max_queue` deep for at most `bulkhead_max_wait` seconds and are
+    # then shed with BulkheadFullError.
+    default_agent_concurrency: int = 8
+    agent_concurrency: Dict[str, int] = field(default_factory=dict)
+    bulkhead_max_queue: int = 64
+    bulkhead_max_wait: float = 5.0
     circuit_breaker_enabled: bool = True
     circuit_breaker_threshold: int = 5
     circuit_breaker_timeout: int = 60
+    # Sliding window of the last N calls ("count") or N seconds ("time"); the
+    # breaker also opens on the failure or slow-call rate over the window once
+    # it holds `circuit_breaker_min_calls` outcomes.
+    circuit_breaker_window_type: str = "count"
+    circuit_breaker_window: int = 20
+    circuit_breaker_min_calls: int = 10
+    circuit_breaker_failure_rate: float = 0.5
+    circuit_breaker_slow_call_seconds: Optional[float] = None
+    circuit_breaker_slow_call_rate: float = 0.8
+    circuit_breaker_half_open_calls: int = 1
     cache_enabled: bool = True
     cache_ttl: int = 300
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 16 * 1024 * 1024
+    cache_sweep_interval: float = 60.0
+    # "memory" (per process), "sqlite" (shared file) or "redis".
+    cache_backend: str = "memory"
+    cache_path: Optional[str] = None  # sqlite; defaults to <workspace>/state/response_cache.sqlite3
+    cache_url: Optional[str] = None  # redis; defaults to redis://localhost:6379/0
+    # Identical concurrent dispatches (same cache key) share one execution.
+    coalesce_requests: bool = True
+    # Intent types or command names that always execute on their own.
+    coalesce_exclude_intents: List[str] = field(default_factory=lambda: ["command"])
+    # `dispatch_many` hands agents at most this many contexts per call.
+    batch_max_size: int = 64
+    # Also expose agent results under ritual/echo/memory/validation/index (the
+    # same objects as in "agents"). Turn off to halve serialised response size.
+    response_aliases: bool = True
+    # Span tracing: "file" appends OTLP/JSON lines to `trace_path` (default
+    # <workspace>/logs/traces.jsonl), "otlp" POSTs to `trace_endpoint`, None
+    # disables it. metadata["trace"] = True/False overrides sampling per dispatch.
+    trace_exporter: Optional[str] = None
+    trace_path: Optional[str] = None
+    trace_endpoint: str = "http://localhost:4318/v1/traces"
+    trace_sample_rate: float = 1.0
+    # cProfile dispatches into <workspace>/logs/profiles (see ProfilingMiddleware):
+    # those with metadata["profile"] = True, plus `profile_sample_rate` of the rest.
+    profiling_enabled: bool = False
+    profile_sample_rate: float = 0.0
     verbose_logging: bool = True
 
 
@@ -99,9 +206,23 @@ class EnhancedMRPDispatcher:
             "post_agent": [],
             "error": [],
             "retry": [],
+            "circuit_transition": [],
         }
-
-        self.cache: Dict[str, tuple[Any, float]] = {}
+        # Compiled from `middleware` / `event_hooks` whenever they change.
+        self._chain: Dict[str, Tuple[Callable[..., Awaitable[Any]], ...]] = {}
+        self._hooks: Dict[str, Tuple[Tuple[Callable[..., Any], bool], ...]] = {}
+        self._compile_middleware()
+        for event in self.event_hooks:
+            self._compile_hooks(event)
+        if self.config.profiling_enabled:
+            # First in, last out: the profile spans every other middleware.
+            self.add_middleware(
+                ProfilingMiddleware(self.record.path / "logs" / "profiles", sample_rate=self.config.profile_sample_rate)
+            )
+
+        self.cache: CacheBackend = self._build_cache()
+        self.tracer = Tracer(self._build_trace_exporter(), sample_rate=self.config.trace_sample_rate)
+        self._inflight: Dict[str, asyncio.Future[bytes]] = {}
 
         self.agents: Dict[str, BaseAgent] = {
             "garden": GardenAgent(workspace_id, self.storage, self.manager),
@@ -111,67 +232,271 @@ class EnhancedMRPDispatcher:
             "vessel_index": VesselIndexAgent(workspace_id, self.storage, self.manager),
         }
 
+        self.dependencies = self._resolve_dependencies()
+
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.config.retry_attempts if self.config.retry_enabled else 1,
+            base_delay=self.config.retry_delay,
+            max_delay=self.config.retry_max_delay,
+            budget=self.config.retry_budget,
+            window=self.config.retry_budget_window,
+        )
+
+        self.bulkheads: Dict[str, Bulkhead] = {}
+        for name in self.config.agent_order:
+            limit = self.config.agent_concurrency.get(name, self.config.default_agent_concurrency)
+            if limit > 0:
+                self.bulkheads[name] = Bulkhead(
+                    name,
+                    limit,
+                    max_queue=self.config.bulkhead_max_queue,
+                    max_wait=self.config.bulkhead_max_wait,
+                )
+
         self.breakers: Dict[str, CircuitBreaker] = {}
         if self.config.circuit_breaker_enabled:
             for name in self.config.agent_order:
                 self.breakers[name] = CircuitBreaker(
                     failure_threshold=self.config.circuit_breaker_threshold,
                     timeout=self.config.circuit_breaker_timeout,
+                    name=name,
+                    window_type=self.config.circuit_breaker_window_type,
+                    window_size=self.config.circuit_breaker_window,
+                    minimum_calls=self.config.circuit_breaker_min_calls,
+                    failure_rate_threshold=self.config.circuit_breaker_failure_rate,
+                    slow_call_duration=self.config.circuit_breaker_slow_call_seconds,
+                    slow_call_rate_threshold=self.config.circuit_breaker_slow_call_rate,
+                    max_half_open_calls=self.config.circuit_breaker_half_open_calls,
+                    on_transition=self._on_circuit_transition,
                 )
+        self._background: Set[asyncio.Task[None]] = set()
 
     # ------------------------------------------------------------------ middleware/events
     def add_middleware(self, middleware: Middleware) -> None:
         self.middleware.append(middleware)
+        self._compile_middleware()
+
+    def remove_middleware(self, middleware: Middleware) -> None:
+        self.middleware.remove(middleware)
+        self._compile_middleware()
 
     def on(self, event: str, handler: Callable[..., Awaitable[None] | None]) -> None:
         self.event_hooks.setdefault(event, []).append(handler)
+        self._compile_hooks(event)
+
+    def off(self, event: str, handler: Callable[..., Awaitable[None] | None]) -> None:
+        self.event_hooks[event].remove(handler)
+        self._compile_hooks(event)
+
+    def _compile_middleware(self) -> None:
+        """Bind each hook of every middleware that overrides it, in call order.
+
+        Methods inherited unchanged from `Middleware` are no-ops and are left
+        out, so a middleware costs nothing in the hooks it does not use.
+        `post_*` hooks run in reverse registration order.
+        """
+        for hook in MIDDLEWARE_HOOKS:
+            noop = getattr(Middleware, hook)
+            bound = [getattr(m, hook) for m in self.middleware if getattr(type(m), hook, noop) is not noop]
+            if hook.startswith("post_"):
+                bound.reverse()
+            self._chain[hook] = tuple(bound)
+
+    def _compile_hooks(self, event: str) -> None:
+        self._hooks[event] = tuple(
+            (handler, asyncio.iscoroutinefunction(handler)) for handler in self.event_hooks.get(event, [])
+        )
 
     async def _emit(self, event: str, **kwargs) -> None:
-        for handler in self.event_hooks.get(event, []):
+        for handler, is_async in self._hooks.get(event, ()):
             try:
-                if asyncio.iscoroutinefunction(handler):
+                if is_async:
                     await handler(**kwargs)
                 else:
                     handler(**kwargs)
             except Exception as exc:  # pragma: no cover - defensive
                 logger.error("Event hook error (%s): %s", event, exc)
 
+    def _on_circuit_transition(self, agent_name: str, old: CircuitState, new: CircuitState, reason: str) -> None:
+        # Breakers report synchronously; hooks run as a task on the dispatch loop.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(
+            self._emit("circuit_transition", agent_name=agent_name, old=old.value, new=new.value, reason=reason)
+        )
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # ------------------------------------------------------------------ scheduling
+    def _resolve_dependencies(self) -> Dict[str, Tuple[str, ...]]:
+        """Map each scheduled agent to the scheduled agents whose results it reads."""
+        order = self.config.agent_order
+        graph: Dict[str, Tuple[str, ...]] = {}
+        for name in order:
+            declared: Sequence[str]
+            if name in self.config.agent_inputs:
+                declared = self.config.agent_inputs[name]
+            else:
+                declared = getattr(self.agents.get(name), "inputs", ())
+            graph[name] = tuple(dep for dep in declared if dep in order and dep != name)
+
+        # Reject cycles up front; a cyclic DAG would deadlock in `_dispatch_parallel`.
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Agent dependency cycle: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dep in graph[name]:
+                visit(dep, path + (name,))
+            state[name] = 2
+
+        for name in order:
+            visit(name, ())
+        return graph
+
     # ------------------------------------------------------------------ caching helpers
     def _cache_key(self, context: PipelineContext) -> str:
         cache_data = f"{context.user_id}:{context.workspace_id}:{context.input_text}"
         return hashlib.sha256(cache_data.encode()).hexdigest()
 
-    def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
-        if not self.config.cache_enabled:
+    def _build_cache(self) -> CacheBackend:
+        cfg = self.config
+        if cfg.cache_backend == "memory":
+            return MemoryCacheBackend(
+                ResponseCache(
+                    max_entries=cfg.cache_max_entries,
+                    max_bytes=cfg.cache_max_bytes,
+                    ttl=cfg.cache_ttl,
+                    sweep_interval=cfg.cache_sweep_interval,
+                )
+            )
+        if cfg.cache_backend == "sqlite":
+            path = cfg.cache_path or str(self.record.path / "state" / "response_cache.sqlite3")
+            return SQLiteCacheBackend(
+                path,
+                max_entries=cfg.cache_max_entries,
+                max_bytes=cfg.cache_max_bytes,
+                ttl=cfg.cache_ttl,
+                sweep_interval=cfg.cache_sweep_interval,
+            )
+        if cfg.cache_backend == "redis":
+            return RedisCacheBackend(
+                cfg.cache_url or "redis://localhost:6379/0",
+                ttl=cfg.cache_ttl,
+                max_bytes=cfg.cache_max_bytes,
+            )
+        raise ValueError(f"Unknown cache backend: {cfg.cache_backend}")
+
+    def _build_trace_exporter(self) -> Optional[SpanExporter]:
+        cfg = self.config
+        if cfg.trace_exporter is None:
             return None
-        entry = self.cache.get(key)
-        if not entry:
+        if cfg.trace_exporter == "file":
+            return FileSpanExporter(cfg.trace_path or self.record.path / "logs" / "traces.jsonl")
+        if cfg.trace_exporter == "otlp":
+            return OTLPHttpExporter(cfg.trace_endpoint)
+        raise ValueError(f"Unknown trace exporter: {cfg.trace_exporter}")
+
+    async def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.config.cache_enabled:
             return None
-        result, ts = entry
-        if time.time() - ts > self.config.cache_ttl:
-            self.cache.pop(key, None)
+        try:
+            result = await self.cache.get(key)
+        except Exception as exc:  # a shared backend being down must not fail dispatch
+            logger.warning("Cache read failed (%s): %s", self.cache.name, exc)
             return None
-        logger.debug("Cache hit for %s", key[:12])
+        if result is not None:
+            logger.debug("Cache hit for %s", key[:12])
         return result
 
-    def _set_cached(self, key: str, result: Dict[str, Any]) -> None:
-        if self.config.cache_enabled:
-            self.cache[key] = (result, time.time())
+    async def _set_cached(self, key: str, result: Dict[str, Any]) -> None:
+        if not self.config.cache_enabled:
+            return
+        try:
+            await self.cache.set(key, result)
+        except Exception as exc:
+            logger.warning("Cache write failed (%s): %s", self.cache.name, exc)
+            return
+        stats = self.cache.stats
+        await self.metrics.record_cache_state(stats.entries, stats.bytes, stats.evictions, stats.rejected)
 
     # ------------------------------------------------------------------ main dispatch
-    async def dispatch(self, context: PipelineContext) -> Dict[str, Any]:
+    async def dispatch(self, context: PipelineContext, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Run the agents for `context` and return the synthesised response.
+
+        `fields` keeps only those top-level keys of the response (for
+        endpoints that return a fixed subset); cached and coalesced
+        responses are trimmed the same way.
+        """
         start = time.time()
+        if context.deadline is None:
+            context.deadline = time.monotonic() + self.config.timeout_seconds
+        with self.tracer.trace(
+            "dispatch",
+            sampled=context.metadata.get("trace"),
+            workspace=self.workspace_id,
+            intent=context.intent.intent_type,
+        ) as root:
+            if root is not None:
+                context.metadata["trace_id"] = root.trace_id
+            response = await self._dispatch(context, start)
+            if root is not None:
+                root.set(success=response["success"], cached=response["cached"], coalesced=response.get("coalesced", False))
+            return select_fields(response, fields)
+
+    async def _dispatch(self, context: PipelineContext, start: float) -> Dict[str, Any]:
         cache_key = self._cache_key(context)
-        cached = self._get_cached(cache_key)
-        if cached:
+        cached = await self._get_cached(cache_key)
+        if cached is not None:
             await self.metrics.record_cache_hit()
-            cached["cached"] = True
+            cached["cached"] = True  # a private copy; the stored entry is untouched
             return cached
         await self.metrics.record_cache_miss()
 
-        await self._emit("pre_dispatch", context=context)
-        for middleware in self.middleware:
-            context = await middleware.pre_dispatch(context)
+        if not self._coalescable(context):
+            return await self._run_dispatch(context, cache_key, start)
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            await self.metrics.record_coalesced()
+            response = decode_response(await asyncio.shield(inflight))
+            response["coalesced"] = True
+            return response
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        # Followers may all be gone by the time the leader fails; don't warn then.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[cache_key] = future
+        try:
+            response = await self._run_dispatch(context, cache_key, start)
+        except asyncio.CancelledError:
+            future.set_exception(RuntimeError("Coalesced dispatch was cancelled"))
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(encode_response(response))
+            return response
+        finally:
+            if self._inflight.get(cache_key) is future:
+                del self._inflight[cache_key]
+
+    def _coalescable(self, context: PipelineContext) -> bool:
+        if not self.config.coalesce_requests:
+            return False
+        excluded = self.config.coalesce_exclude_intents
+        return context.intent.intent_type not in excluded and context.intent.command not in excluded
+
+    async def _run_dispatch(self, context: PipelineContext, cache_key: str, start: float) -> Dict[str, Any]:
+        if self._hooks["pre_dispatch"]:
+            await self._emit("pre_dispatch", context=context)
+        for hook in self._chain["pre_dispatch"]:
+            context = await hook(context)
 
         if self.config.parallel_execution:
             await self._dispatch_parallel(context)
@@ -182,100 +507,340 @@ class EnhancedMRPDispatcher:
         response["execution_time_ms"] = (time.time() - start) * 1000
         response["cached"] = False
 
-        for middleware in reversed(self.middleware):
-            response = await middleware.post_dispatch(context, response)
-        await self._emit("post_dispatch", context=context, response=response)
+        for hook in self._chain["post_dispatch"]:
+            response = await hook(context, response)
+        if self._hooks["post_dispatch"]:
+            await self._emit("post_dispatch", context=context, response=response)
 
         await self.metrics.record_dispatch(response["success"], response["execution_time_ms"] / 1000, len(self.config.agent_order))
-        self._set_cached(cache_key, response)
+        await self._set_cached(cache_key, response)
         return response
 
+    async def dispatch_stream(self, context: PipelineContext) -> AsyncIterator[Dict[str, Any]]:
+        """Dispatch `context`, yielding each agent's result as soon as it completes.
+
+        Yields ``{"event": "agent", "agent", "result", "elapsed_ms"}`` per agent
+        and finally ``{"event": "complete", "response"}`` with the same response
+        `dispatch` returns. Cached and coalesced responses stream every agent at
+        the end. Closing the generator early cancels the dispatch.
+        """
+        start = time.time()
+        queue: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue()
+
+        def on_result(agent_name: str, context: PipelineContext, result: Any) -> None:
+            if context is watched:
+                elapsed_ms = (time.time() - start) * 1000
+                queue.put_nowait({"event": "agent", "agent": agent_name, "result": result, "elapsed_ms": elapsed_ms})
+
+        watched = context
+        self.on("post_agent", on_result)
+        task = asyncio.create_task(self.dispatch(context))
+        task.add_done_callback(lambda _task: queue.put_nowait(None))
+        streamed: Set[str] = set()
+        try:
+            while (event := await queue.get()) is not None:
+                streamed.add(event["agent"])
+                yield event
+            response = task.result()
+            for agent_name, result in response.get("agents", {}).items():
+                if agent_name not in streamed and result is not None:
+                    elapsed_ms = response.get("execution_time_ms", 0.0)
+                    yield {"event": "agent", "agent": agent_name, "result": result, "elapsed_ms": elapsed_ms}
+            yield {"event": "complete", "response": response}
+        finally:
+            self.off("post_agent", on_result)
+            if not task.done():
+                task.cancel()
+
+    # ------------------------------------------------------------------ batch dispatch
+    async def dispatch_many(self, contexts: Sequence[PipelineContext]) -> List[Dict[str, Any]]:
+        """Dispatch a bulk import in micro-batches, one agent call per batch.
+
+        Agents that expose `process_batch(contexts)` (Limnus, Kira) handle each
+        micro-batch in a single call, sharing state reads and ledger writes;
+        the others run once per context. Bulk batches bypass the response cache
+        and coalescing. Responses are returned in input order, and each one
+        carries only its own errors.
+        """
+        responses: List[Dict[str, Any]] = []
+        size = max(1, self.config.batch_max_size)
+        for offset in range(0, len(contexts), size):
+            batch = list(contexts[offset : offset + size])
+            with self.tracer.trace("dispatch_batch", workspace=self.workspace_id, batch=len(batch)) as root:
+                if root is not None:
+                    for context in batch:
+                        context.metadata["trace_id"] = root.trace_id
+                responses.extend(await self._dispatch_batch(batch))
+        return responses
+
+    async def _dispatch_batch(self, contexts: List[PipelineContext]) -> List[Dict[str, Any]]:
+        start = time.time()
+        deadline = time.monotonic() + self.config.timeout_seconds
+        for context in contexts:
+            if context.deadline is None:
+                context.deadline = deadline
+        live: List[PipelineContext] = []
+        prepared: List[PipelineContext] = []
+        for context in contexts:
+            try:
+                if self._hooks["pre_dispatch"]:
+                    await self._emit("pre_dispatch", context=context)
+                for hook in self._chain["pre_dispatch"]:
+                    context = await hook(context)
+                live.append(context)
+            except Exception as exc:
+                context.add_error("dispatcher", exc)
+            prepared.append(context)
+
+        for agent_name in self.config.agent_order:
+            await self._execute_agent_batch(agent_name, live)
+
+        elapsed = time.time() - start
+        responses: List[Dict[str, Any]] = []
+        for context in prepared:
+            response = self._synthesise(context)
+            response["execution_time_ms"] = elapsed * 1000
+            response["cached"] = False
+            response["batch_size"] = len(contexts)
+            if any(context is ok for ok in live):
+                for hook in self._chain["post_dispatch"]:
+                    response = await hook(context, response)
+                if self._hooks["post_dispatch"]:
+                    await self._emit("post_dispatch", context=context, response=response)
+            await self.metrics.record_dispatch(response["success"], elapsed / len(contexts), len(self.config.agent_order))
+            responses.append(response)
+        return responses
+
+    async def _execute_agent_batch(self, agent_name: str, contexts: List[PipelineContext]) -> None:
+        with tracing.span("agent_batch", agent=agent_name, batch=len(contexts)):
+            await self._run_agent_batch(agent_name, contexts)
+
+    async def _run_agent_batch(self, agent_name: str, contexts: List[PipelineContext]) -> None:
+        agent = self.agents.get(agent_name)
+        process_batch = getattr(agent, "process_batch", None)
+        if agent is None or process_batch is None or len(contexts) < 2:
+            for context in contexts:
+                await self._execute_agent(agent_name, context)
+            return
+
+        pending: List[PipelineContext] = []
+        for context in contexts:
+            if self._remaining(context) <= 0:
+                context.skip(agent_name, "deadline")
+            else:
+                pending.append(context)
+        contexts = pending
+        if not contexts:
+            return
+
+        breaker = self.breakers.get(agent_name)
+        if breaker and not breaker.allow_request():
+            for context in contexts:
+                context.add_error(agent_name, RuntimeError("circuit_open"))
+            return
+
+        batch: List[PipelineContext] = []
+        for context in contexts:
+            try:
+                if self._hooks["pre_agent"]:
+                    await self._emit("pre_agent", agent_name=agent_name, context=context)
+                for hook in self._chain["pre_agent"]:
+                    context = await hook(agent_name, context)
+                context.add_trace("agent_start", {"agent": agent_name, "attempt": 0, "batch": len(contexts)})
+                batch.append(context)
+            except Exception as exc:
+                context.add_error(agent_name, exc)
+        if not batch:
+            if breaker:
+                breaker.release()
+            return
+
+        start = time.time()
+        try:
+            timeout = min(self._remaining(context) for context in batch)
+            results = await self._call_agent(agent_name, lambda: process_batch(batch), timeout)
+            if len(results) != len(batch):
+                raise RuntimeError(f"{agent_name}.process_batch returned {len(results)} results for {len(batch)} inputs")
+        except BulkheadFullError as exc:
+            if breaker:
+                breaker.release()
+            tracing.record_error(tracing.current_span(), exc)
+            for context in batch:
+                context.add_trace("agent_shed", {"agent": agent_name, "reason": exc.reason})
+                context.add_error(agent_name, exc)
+            return
+        except Exception as exc:
+            # Fall back to per-context execution, which retries and isolates errors.
+            logger.warning("Batch execution failed for %s (%s); retrying per context", agent_name, exc)
+            tracing.record_error(tracing.current_span(), exc)
+            if breaker:
+                breaker.record_failure(time.time() - start)
+            await self.metrics.record_agent_execution(agent_name, False, time.time() - start)
+            for context in batch:
+                await self._execute_agent(agent_name, context)
+            return
+
+        elapsed = time.time() - start
+        for context, result in zip(batch, results):
+            context.add_trace("agent_complete", {"agent": agent_name, "elapsed_ms": elapsed * 1000, "batch": len(batch)})
+            context.add_result(agent_name, result)
+            for hook in self._chain["post_agent"]:
+                result = await hook(agent_name, context, result)
+            if self._hooks["post_agent"]:
+                await self._emit("post_agent", agent_name=agent_name, context=context, result=result)
+        if breaker:
+            breaker.record_success(elapsed)
+        await self.metrics.record_agent_execution(agent_name, True, elapsed)
+
     async def _dispatch_sequential(self, context: PipelineContext) -> None:
         for agent_name in self.config.agent_order:
             await self._execute_agent(agent_name, context)
 
     async def _dispatch_parallel(self, context: PipelineContext) -> None:
-        tasks = [self._execute_agent(name, context) for name in self.config.agent_order]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        """Start every agent at once; each waits only on its own producers."""
+        tasks: Dict[str, asyncio.Task[None]] = {}
+
+        async def run(name: str) -> None:
+            producers = [tasks[dep] for dep in self.dependencies[name]]
+            if producers:
+                await asyncio.gather(*producers, return_exceptions=True)
+            await self._execute_agent(name, context)
+
+        for name in self.config.agent_order:
+            tasks[name] = asyncio.create_task(run(name))
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
 
     async def _execute_agent(self, agent_name: str, context: PipelineContext) -> None:
+        with tracing.span("agent", agent=agent_name) as span:
+            await self._run_agent(agent_name, context)
+            if span is not None and agent_name not in context.agent_results:
+                if agent_name in context.skipped:
+                    span.set(skipped=True)
+                else:
+                    errors = [entry["error"] for entry in context.errors if entry["agent"] == agent_name]
+                    span.error = errors[-1] if errors else "no result"
+
+    async def _run_agent(self, agent_name: str, context: PipelineContext) -> None:
         agent = self.agents.get(agent_name)
         if not agent:
             logger.warning("Agent not found: %s", agent_name)
             return
 
         breaker = self.breakers.get(agent_name)
-        if breaker and breaker.is_open():
-            context.add_error(agent_name, RuntimeError("circuit_open"))
-            return
-
         attempt = 0
-        last_error: Optional[Exception] = None
-
-        while attempt < (self.config.retry_attempts if self.config.retry_enabled else 1):
-            try:
-                await self._emit("pre_agent", agent_name=agent_name, context=context)
-                for middleware in self.middleware:
-                    context = await middleware.pre_agent(agent_name, context)
-                context.add_trace("agent_start", {"agent": agent_name, "attempt": attempt})
-                start = time.time()
-                result = await asyncio.wait_for(
-                    agent.process(context),
-                    timeout=self.config.timeout_seconds,
-                )
-                context.add_trace("agent_complete", {"agent": agent_name, "elapsed_ms": (time.time() - start) * 1000})
-                context.add_result(agent_name, result)
-
-                for middleware in reversed(self.middleware):
-                    result = await middleware.post_agent(agent_name, context, result)
-                await self._emit("post_agent", agent_name=agent_name, context=context, result=result)
-
-                if breaker:
-                    breaker.record_success()
-                await self.metrics.record_agent_execution(agent_name, True, time.time() - start)
+        while True:
+            remaining = self._remaining(context)
+            if remaining <= 0:
+                if attempt == 0:
+                    context.skip(agent_name, "deadline")
+                else:
+                    context.add_error(agent_name, last_error)
                 return
-
-            except Exception as exc:  # pragma: no cover - defensive
-                last_error = exc
-                context.add_trace("agent_failure", {"agent": agent_name, "error": str(exc)})
-                for middleware in self.middleware:
-                    await middleware.on_error(agent_name, context, exc)
-                await self.metrics.record_agent_execution(agent_name, False, 0)
-                await self._emit("error", agent_name=agent_name, context=context, error=exc)
-                if breaker:
-                    breaker.record_failure()
+            if breaker and not breaker.allow_request():
+                context.add_error(agent_name, RuntimeError("circuit_open"))
+                return
+            with tracing.span("attempt", agent=agent_name, attempt=attempt) as attempt_span:
+                start = time.time()
+                try:
+                    if self._hooks["pre_agent"]:
+                        await self._emit("pre_agent", agent_name=agent_name, context=context)
+                    for hook in self._chain["pre_agent"]:
+                        context = await hook(agent_name, context)
+                    context.add_trace("agent_start", {"agent": agent_name, "attempt": attempt})
+                    result = await self._call_agent(agent_name, lambda: agent.process(context), remaining)
+                    context.add_trace("agent_complete", {"agent": agent_name, "elapsed_ms": (time.time() - start) * 1000})
+                    context.add_result(agent_name, result)
+
+                    for hook in self._chain["post_agent"]:
+                        result = await hook(agent_name, context, result)
+                    if self._hooks["post_agent"]:
+                        await self._emit("post_agent", agent_name=agent_name, context=context, result=result)
+
+                    if breaker:
+                        breaker.record_success(time.time() - start)
+                    await self.metrics.record_agent_execution(agent_name, True, time.time() - start)
+                    return
+
+                except BulkheadFullError as exc:
+                    # Shed load: not the agent's fault, so no retry and no breaker failure.
+                    if breaker:
+                        breaker.release()
+                    tracing.record_error(attempt_span, exc)
+                    context.add_trace("agent_shed", {"agent": agent_name, "reason": exc.reason})
+                    context.add_error(agent_name, exc)
+                    return
+                except Exception as exc:  # pragma: no cover - defensive
+                    tracing.record_error(attempt_span, exc)
+                    context.add_trace("agent_failure", {"agent": agent_name, "error": str(exc)})
+                    for hook in self._chain["on_error"]:
+                        await hook(agent_name, context, exc)
+                    await self.metrics.record_agent_execution(agent_name, False, 0)
+                    await self._emit("error", agent_name=agent_name, context=context, error=exc)
+                    if breaker:
+                        breaker.record_failure(time.time() - start)
+                    last_error = exc
 
             attempt += 1
-            if attempt < self.config.retry_attempts and self.config.retry_enabled:
-                delay = self.config.retry_delay * (2 ** (attempt - 1))
-                context.add_trace("agent_retry", {"agent": agent_name, "delay": delay})
-                await self._emit("retry", agent_name=agent_name, attempt=attempt)
+            delay, outcome = self.retry_policy.next_delay(agent_name, attempt, last_error, context.deadline)
+            await self.metrics.record_retry(agent_name, outcome)
+            if delay is None:
+                if outcome != "not_retryable":
+                    context.add_trace("agent_retry_stopped", {"agent": agent_name, "reason": outcome})
+                context.add_error(agent_name, last_error)
+                return
+            context.add_trace("agent_retry", {"agent": agent_name, "delay": delay})
+            await self._emit("retry", agent_name=agent_name, attempt=attempt)
+            with tracing.span("retry_backoff", agent=agent_name, delay=delay):
                 await asyncio.sleep(delay)
 
-        if last_error is not None:
-            context.add_error(agent_name, last_error)
+    async def _call_agent(self, agent_name: str, call: Callable[[], Awaitable[Any]], timeout: float) -> Any:
+        """Run `call` inside the agent's bulkhead, bounded by `timeout` overall."""
+        bulkhead = self.bulkheads.get(agent_name)
+        if bulkhead is None:
+            return await asyncio.wait_for(call(), timeout=timeout)
+        depth = bulkhead.waiting
+        try:
+            async with bulkhead.slot(timeout) as waited:
+                await self.metrics.record_bulkhead(agent_name, waited, depth)
+                span = tracing.current_span()
+                if span is not None:
+                    span.set(bulkhead_wait_ms=waited * 1000)
+                return await asyncio.wait_for(call(), timeout=max(timeout - waited, 0.0))
+        except BulkheadFullError:
+            await self.metrics.record_bulkhead(agent_name, 0.0, depth, rejected=True)
+            raise
+
+    def _remaining(self, context: PipelineContext) -> float:
+        """Seconds left for this dispatch, capped at the per-agent timeout."""
+        if context.deadline is None:
+            return float(self.config.timeout_seconds)
+        return min(float(self.config.timeout_seconds), context.deadline - time.monotonic())
 
     def _synthesise(self, context: PipelineContext) -> Dict[str, Any]:
         response = {
-            "success": not context.errors,
+            "success": not context.errors and not context.skipped,
             "timestamp": context.timestamp,
             "input": context.input_text,
             "intent": context.intent.intent_type,
             "agents": {name: context.agent_results.get(name) for name in self.config.agent_order},
             "errors": context.errors,
+            "skipped": context.skipped,
             "metadata": context.metadata,
             "trace": context.trace if self.config.verbose_logging else [],
             "metrics": context.metrics,
         }
-        response["ritual"] = context.agent_results.get("garden", {})
-        response["echo"] = context.agent_results.get("echo", {})
-        response["memory"] = context.agent_results.get("limnus", {})
-        response["validation"] = context.agent_results.get("kira", {})
-        response["index"] = context.agent_results.get("vessel_index", {})
+        if self.config.response_aliases:
+            for alias, agent in RESPONSE_ALIASES:
+                response[alias] = context.agent_results.get(agent, {})
         return response
 
     async def get_metrics(self) -> Dict[str, Any]:
         summary = await self.metrics.get_summary()
+        for name, bulkhead in self.bulkheads.items():
+            summary.bulkhead_stats.setdefault(name, {}).update(
+                limit=bulkhead.max_concurrent, active=bulkhead.active, waiting=bulkhead.waiting
+            )
+        summary.circuit_stats = {name: breaker.snapshot() for name, breaker in self.breakers.items()}
         return summary.__dict__
 
     async def reset_circuit_breakers(self) -> None:
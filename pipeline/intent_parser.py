@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+from common.keyword_matcher import KeywordMatcher
+
 
 @dataclass(slots=True)
 class ParsedIntent:
@@ -36,7 +38,10 @@ class IntentParser:
         if text.startswith(self.COMMAND_PREFIX):
             return self._parse_command(text)
 
-        mantra = next((m for m in self.MANTRAS if m in normalised), None)
+        # One pass finds every mantra and stage keyword; MANTRAS and
+        # STAGE_KEYWORDS order still decide which one wins.
+        found = _MATCHER.labels(normalised)
+        mantra = next((m for m in self.MANTRAS if m in found), None)
         if mantra:
             return ParsedIntent(
                 intent_type="ritual",
@@ -45,7 +50,7 @@ class IntentParser:
                 raw_text=text,
             )
 
-        stage = self._detect_stage(normalised)
+        stage = next((name for name in self.STAGE_KEYWORDS if name in found), None)
         if stage:
             return ParsedIntent(
                 intent_type="ritual",
@@ -63,8 +68,9 @@ class IntentParser:
         return ParsedIntent(intent_type="command", command=command, args={"args": args}, raw_text=text)
 
     def _detect_stage(self, text: str) -> Optional[str]:
-        for stage, keywords in self.STAGE_KEYWORDS.items():
-            if any(keyword in text for keyword in keywords):
-                return stage
-        return None
+        return _MATCHER.first(text, self.STAGE_KEYWORDS)
+
+
+# Mantras match themselves; stages match any of their keywords. Built once.
+_MATCHER = KeywordMatcher({**{mantra: (mantra,) for mantra in IntentParser.MANTRAS}, **IntentParser.STAGE_KEYWORDS})
 
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import statistics
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, MutableMapping
+from typing import Any, Dict, MutableMapping
 
 import logging
 
+from pipeline.histogram import LatencyHistogram, RollingHistogram
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,9 +20,14 @@ class MetricsSummary:
     successful_dispatches: int = 0
     failed_dispatches: int = 0
     average_execution_ms: float = 0.0
+    # Dispatch latency percentiles (lifetime) and 1m/5m/15m rolling windows.
+    latency: Dict[str, Any] = field(default_factory=dict)
     agent_metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     error_counts: Dict[str, int] = field(default_factory=dict)
     cache_stats: Dict[str, Any] = field(default_factory=dict)
+    retry_stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    bulkhead_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    circuit_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     uptime_seconds: float = 0.0
 
 
@@ -34,20 +40,30 @@ class MetricsCollector:
 
         self.dispatch_total = 0
         self.dispatch_success = 0
-        self.execution_times: List[float] = []
+        self.execution_times = RollingHistogram()
 
-        self.agent_times: MutableMapping[str, List[float]] = defaultdict(list)
+        self.agent_times: MutableMapping[str, RollingHistogram] = defaultdict(RollingHistogram)
         self.agent_errors: MutableMapping[str, int] = defaultdict(int)
         self.error_counts: MutableMapping[str, int] = defaultdict(int)
+        # agent -> retry decision ("retry", "exhausted", "budget", ...) -> count
+        self.retry_counts: MutableMapping[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.bulkhead_waits: MutableMapping[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.bulkhead_max_depth: MutableMapping[str, int] = defaultdict(int)
+        self.bulkhead_rejected: MutableMapping[str, int] = defaultdict(int)
 
         self.cache_hits = 0
         self.cache_misses = 0
+        self.cache_entries = 0
+        self.cache_bytes = 0
+        self.cache_evictions: Dict[str, int] = {}
+        self.cache_rejected = 0
+        self.coalesced = 0
 
     async def record_dispatch(self, success: bool, execution_time: float, agent_count: int) -> None:
         self.dispatch_total += 1
         if success:
             self.dispatch_success += 1
-        self.execution_times.append(execution_time)
+        self.execution_times.record(execution_time)
         logger.debug(
             "Recorded dispatch success=%s time=%.2fms agents=%s",
             success,
@@ -56,10 +72,20 @@ class MetricsCollector:
         )
 
     async def record_agent_execution(self, agent_name: str, success: bool, execution_time: float) -> None:
-        self.agent_times[agent_name].append(execution_time)
+        self.agent_times[agent_name].record(execution_time)
         if not success:
             self.agent_errors[agent_name] += 1
 
+    async def record_retry(self, agent_name: str, outcome: str) -> None:
+        self.retry_counts[agent_name][outcome] += 1
+
+    async def record_bulkhead(self, agent_name: str, wait: float, queue_depth: int, rejected: bool = False) -> None:
+        self.bulkhead_max_depth[agent_name] = max(self.bulkhead_max_depth[agent_name], queue_depth)
+        if rejected:
+            self.bulkhead_rejected[agent_name] += 1
+        else:
+            self.bulkhead_waits[agent_name].record(wait)
+
     async def record_error(self, source: str, message: str) -> None:
         logger.debug("Recorded error source=%s message=%s", source, message)
         self.error_counts[source] += 1
@@ -70,42 +96,75 @@ class MetricsCollector:
     async def record_cache_miss(self) -> None:
         self.cache_misses += 1
 
+    async def record_coalesced(self) -> None:
+        self.coalesced += 1
+
+    async def record_cache_state(
+        self,
+        entries: int,
+        size_bytes: int,
+        evictions: Dict[str, int],
+        rejected: int = 0,
+    ) -> None:
+        self.cache_entries = entries
+        self.cache_bytes = size_bytes
+        self.cache_evictions = dict(evictions)
+        self.cache_rejected = rejected
+
     async def get_summary(self) -> MetricsSummary:
         uptime = time.time() - self.start_time
 
-        if self.execution_times:
-            avg_ms = statistics.mean(self.execution_times) * 1000
-            max_ms = max(self.execution_times) * 1000
-            min_ms = min(self.execution_times) * 1000
-        else:
-            avg_ms = max_ms = min_ms = 0.0
+        dispatch = self.execution_times.lifetime
+        latency: Dict[str, Any] = dispatch.summary_ms()
+        latency["windows"] = self.execution_times.windows()
 
         agent_metrics: Dict[str, Dict[str, Any]] = {}
         for agent, times in self.agent_times.items():
-            if times:
+            if times.lifetime.count:
                 agent_metrics[agent] = {
-                    "executions": len(times),
-                    "avg_ms": statistics.mean(times) * 1000,
-                    "max_ms": max(times) * 1000,
-                    "min_ms": min(times) * 1000,
+                    "executions": times.lifetime.count,
+                    **times.lifetime.summary_ms(),
                     "errors": self.agent_errors.get(agent, 0),
+                    "retries": self.retry_counts.get(agent, {}).get("retry", 0),
+                    "windows": times.windows(),
                 }
 
+        bulkhead_stats: Dict[str, Dict[str, Any]] = {}
+        for agent in set(self.bulkhead_waits) | set(self.bulkhead_rejected):
+            waits = self.bulkhead_waits.get(agent) or LatencyHistogram()
+            bulkhead_stats[agent] = {
+                "admitted": waits.count,
+                "rejected": self.bulkhead_rejected.get(agent, 0),
+                "max_queue_depth": self.bulkhead_max_depth.get(agent, 0),
+                "avg_wait_ms": waits.mean * 1000,
+                "max_wait_ms": waits.max * 1000,
+                "p99_wait_ms": waits.quantile(0.99) * 1000,
+            }
+
         cache_total = self.cache_hits + self.cache_misses
         cache_stats = {
+            "workspace_id": self.workspace_id,
             "hits": self.cache_hits,
             "misses": self.cache_misses,
             "hit_rate": self.cache_hits / cache_total if cache_total else 0.0,
+            "entries": self.cache_entries,
+            "bytes": self.cache_bytes,
+            "evictions": dict(self.cache_evictions),
+            "rejected": self.cache_rejected,
+            "coalesced": self.coalesced,
         }
 
         return MetricsSummary(
             total_dispatches=self.dispatch_total,
             successful_dispatches=self.dispatch_success,
             failed_dispatches=self.dispatch_total - self.dispatch_success,
-            average_execution_ms=avg_ms,
+            average_execution_ms=dispatch.mean * 1000,
+            latency=latency,
             agent_metrics=agent_metrics,
             error_counts=dict(self.error_counts),
             cache_stats=cache_stats,
+            bulkhead_stats=bulkhead_stats,
+            retry_stats={agent: dict(counts) for agent, counts in self.retry_counts.items()},
             uptime_seconds=uptime,
         )
 
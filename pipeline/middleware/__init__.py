@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Tuple
 
 from typing import TYPE_CHECKING
 
+from pipeline.rate_limit import MemoryRateLimiter, RateLimit, RateLimiter, RateLimitExceeded
+
 if TYPE_CHECKING:  # pragma: no cover
     from pipeline.dispatcher_enhanced import PipelineContext
 
@@ -77,28 +79,56 @@ class LoggingMiddleware(Middleware):
 
 
 class RateLimitMiddleware(Middleware):
-    def __init__(self, max_requests_per_minute: int = 60) -> None:
+    """Per-user and per-workspace GCRA limits (see `pipeline.rate_limit`).
+
+    `max_requests_per_minute` limits each user; `workspace_requests_per_minute`
+    optionally limits each workspace as a whole. Bursts default to the
+    per-minute rate. Pass a shared `limiter` (e.g. `RedisRateLimiter`) to
+    enforce limits across API workers. A rejected dispatch raises
+    `RateLimitExceeded`, which carries `retry_after` in seconds.
+    """
+
+    def __init__(
+        self,
+        max_requests_per_minute: int = 60,
+        *,
+        burst: Optional[int] = None,
+        workspace_requests_per_minute: Optional[int] = None,
+        workspace_burst: Optional[int] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
         self.max_requests = max_requests_per_minute
-        self._requests: Dict[str, List[float]] = {}
+        self.user_limit = RateLimit(max_requests_per_minute, 60.0, burst)
+        self.workspace_limit = (
+            RateLimit(workspace_requests_per_minute, 60.0, workspace_burst)
+            if workspace_requests_per_minute
+            else None
+        )
+        self.limiter = limiter if limiter is not None else MemoryRateLimiter()
 
     async def pre_dispatch(self, context: "PipelineContext") -> "PipelineContext":
-        now = time.time()
-        user = context.user_id
-        history = self._requests.setdefault(user, [])
-        history[:] = [ts for ts in history if now - ts < 60]
-        if len(history) >= self.max_requests:
-            raise RuntimeError(f"Rate limit exceeded for {user}")
-        history.append(now)
-        context.metadata["rate_limit_remaining"] = self.max_requests - len(history)
+        # The user is checked first: a rejected user does not spend workspace quota.
+        user = await self.limiter.acquire(f"user:{context.user_id}", self.user_limit)
+        if not user.allowed:
+            raise RateLimitExceeded("user", context.user_id, self.user_limit, user.retry_after)
+        remaining = user.remaining
+        if self.workspace_limit is not None:
+            workspace = await self.limiter.acquire(f"workspace:{context.workspace_id}", self.workspace_limit)
+            if not workspace.allowed:
+                raise RateLimitExceeded("workspace", context.workspace_id, self.workspace_limit, workspace.retry_after)
+            remaining = min(remaining, workspace.remaining)
+        context.metadata["rate_limit_remaining"] = remaining
         return context
 
 
 class MetricsMiddleware(Middleware):
     def __init__(self) -> None:
-        self._timers: Dict[str, float] = {}
+        # Keyed by (context, agent) so concurrent dispatches don't share timers;
+        # entries are removed on completion or error.
+        self._timers: Dict[Tuple[int, str], float] = {}
 
     async def pre_agent(self, agent_name: str, context: "PipelineContext") -> "PipelineContext":
-        self._timers[agent_name] = time.time()
+        self._timers[(id(context), agent_name)] = time.monotonic()
         return context
 
     async def post_agent(
@@ -107,12 +137,15 @@ class MetricsMiddleware(Middleware):
         context: "PipelineContext",
         result: Any,
     ) -> Any:
-        start = self._timers.get(agent_name)
+        start = self._timers.pop((id(context), agent_name), None)
         if start is not None:
-            elapsed_ms = (time.time() - start) * 1000
+            elapsed_ms = (time.monotonic() - start) * 1000
             context.metrics.setdefault("agent_timings", {})[agent_name] = elapsed_ms
         return result
 
+    async def on_error(self, agent_name: str, context: "PipelineContext", error: Exception) -> None:
+        self._timers.pop((id(context), agent_name), None)
+
 
 class ValidationMiddleware(Middleware):
     def __init__(self, max_length: int = 10_000) -> None:
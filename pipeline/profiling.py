@@ -0,0 +1,140 @@
+"""Opt-in cProfile capture of dispatches, and helpers to read the profiles back."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import pstats
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import logging
+
+from pipeline.middleware import Middleware
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pipeline.dispatcher_enhanced import PipelineContext
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ("cumulative", "tottime", "calls")
+
+
+class ProfilingMiddleware(Middleware):
+    """Profile whole dispatches with cProfile and save them as ``.prof`` files.
+
+    A dispatch is profiled when its metadata sets ``profile`` (true forces it,
+    false suppresses it) or otherwise with probability `sample_rate`. The
+    file path is returned in the response metadata as ``profile_path``.
+
+    cProfile measures the event-loop thread, so at most one dispatch is
+    profiled at a time and its profile includes anything else the loop ran
+    meanwhile; work inside `asyncio.to_thread` workers is not captured. A
+    profile whose dispatch never reached `post_dispatch` is discarded after
+    `max_seconds`. Only the newest `keep` files are kept in `directory`.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        *,
+        sample_rate: float = 0.0,
+        max_seconds: float = 60.0,
+        keep: int = 200,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.max_seconds = max_seconds
+        self.keep = keep
+        self._rng = rng
+        self._active: Optional[Tuple["PipelineContext", cProfile.Profile, float]] = None
+        self.captured = 0
+        self.skipped = 0
+
+    def _wanted(self, context: "PipelineContext") -> bool:
+        flag = context.metadata.get("profile")
+        if flag is not None:
+            return bool(flag)
+        return self.sample_rate > 0.0 and self._rng() < self.sample_rate
+
+    async def pre_dispatch(self, context: "PipelineContext") -> "PipelineContext":
+        if not self._wanted(context):
+            return context
+        if self._active is not None:
+            if time.monotonic() - self._active[2] < self.max_seconds:
+                self.skipped += 1
+                context.metadata["profile_skipped"] = "busy"
+                return context
+            self._active[1].disable()
+            self._active = None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler owns the thread
+            self.skipped += 1
+            context.metadata["profile_skipped"] = "profiler_active"
+            return context
+        self._active = (context, profiler, time.monotonic())
+        return context
+
+    async def post_dispatch(
+        self,
+        context: "PipelineContext",
+        response: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        active = self._active
+        if active is None or active[0] is not context:
+            return response
+        self._active = None
+        active[1].disable()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = context.metadata.get("trace_id") or uuid.uuid4().hex[:12]
+        path = self.directory / f"{stamp}-{name}.prof"
+        try:
+            await asyncio.to_thread(self._save, active[1], path)
+        except OSError as exc:
+            logger.warning("Could not save profile %s: %s", path, exc)
+            return response
+        self.captured += 1
+        context.metadata["profile_path"] = str(path)
+        return response
+
+    def _save(self, profiler: cProfile.Profile, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        for stale in list_profiles(self.directory)[: -self.keep or None]:
+            stale.unlink(missing_ok=True)
+
+
+def list_profiles(directory: Path | str) -> List[Path]:
+    """Saved profiles, oldest first (file names start with a UTC timestamp)."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*.prof"))
+
+
+def top_functions(paths: Sequence[Path | str], limit: int = 20, sort: str = "cumulative") -> List[Dict[str, Any]]:
+    """Merge `paths` and return the top `limit` functions by `sort`."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    stats = pstats.Stats(*(str(path) for path in paths))
+    rows = []
+    for (filename, line, func), (primitive, calls, tottime, cumtime, _callers) in stats.stats.items():  # type: ignore[attr-defined]
+        rows.append(
+            {
+                "function": f"{filename}:{line}({func})",
+                "calls": calls,
+                "primitive_calls": primitive,
+                "tottime_ms": tottime * 1000,
+                "cumtime_ms": cumtime * 1000,
+            }
+        )
+    key = {"cumulative": "cumtime_ms", "tottime": "tottime_ms", "calls": "calls"}[sort]
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:limit]
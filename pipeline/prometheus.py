@@ -0,0 +1,130 @@
+"""Prometheus text exposition (format 0.0.4) for enhanced dispatchers.
+
+Everything is read from counters the dispatcher already maintains, so a
+request pays nothing extra for being scrapeable; the text is built only when
+`/metrics/prometheus` is scraped. Histogram buckets are derived from the
+log-bucketed `pipeline.histogram` data at fixed bounds.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Mapping, Tuple
+
+from pipeline.histogram import LatencyHistogram
+
+try:  # optional: embedding timings live with the vector store
+    from memory.vector_store import EMBEDDING_STATS  # type: ignore
+except Exception:  # pragma: no cover
+    EMBEDDING_STATS = {}  # type: ignore
+
+if TYPE_CHECKING:
+    from pipeline.dispatcher_enhanced import EnhancedMRPDispatcher
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BOUNDS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CIRCUIT_STATES = ("closed", "open", "half_open")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    def __init__(self) -> None:
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def sample(self, name: str, kind: str, help_text: str, labels: Labels, value: float, suffix: str = "") -> None:
+        family = self._families.setdefault(name, (kind, help_text, []))
+        family[2].append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, help_text: str, labels: Labels, hist: LatencyHistogram) -> None:
+        for bound, count in hist.cumulative(LATENCY_BOUNDS + (float("inf"),)):
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            self.sample(name, "histogram", help_text, labels + (("le", le),), count, "_bucket")
+        self.sample(name, "histogram", help_text, labels, hist.total, "_sum")
+        self.sample(name, "histogram", help_text, labels, hist.count, "_count")
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, (kind, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def render_metrics(dispatchers: Mapping[str, "EnhancedMRPDispatcher"]) -> str:
+    """Expose every workspace's dispatcher metrics as Prometheus text."""
+    out = _Exposition()
+    for workspace_id, dispatcher in sorted(dispatchers.items()):
+        ws: Labels = (("workspace", workspace_id),)
+        metrics = dispatcher.metrics
+
+        failed = metrics.dispatch_total - metrics.dispatch_success
+        help_dispatches = "Dispatches handled, by outcome."
+        out.sample("vesselos_dispatches_total", "counter", help_dispatches, ws + (("outcome", "success"),), metrics.dispatch_success)
+        out.sample("vesselos_dispatches_total", "counter", help_dispatches, ws + (("outcome", "failure"),), failed)
+        out.histogram("vesselos_dispatch_duration_seconds", "End-to-end dispatch latency.", ws, metrics.execution_times.lifetime)
+
+        for agent, times in sorted(metrics.agent_times.items()):
+            labels = ws + (("agent", agent),)
+            out.histogram("vesselos_agent_duration_seconds", "Agent execution latency.", labels, times.lifetime)
+            out.sample("vesselos_agent_errors_total", "counter", "Failed agent attempts.", labels, metrics.agent_errors.get(agent, 0))
+        for agent, outcomes in sorted(metrics.retry_counts.items()):
+            for outcome, count in sorted(outcomes.items()):
+                labels = ws + (("agent", agent), ("outcome", outcome))
+                out.sample("vesselos_agent_retry_decisions_total", "counter", "Retry decisions after a failed attempt.", labels, count)
+        for agent, rejected in sorted(metrics.bulkhead_rejected.items()):
+            out.sample("vesselos_bulkhead_rejected_total", "counter", "Calls shed by a full bulkhead.", ws + (("agent", agent),), rejected)
+        for agent, bulkhead in sorted(dispatcher.bulkheads.items()):
+            labels = ws + (("agent", agent),)
+            out.sample("vesselos_bulkhead_active", "gauge", "Calls running inside the bulkhead.", labels, bulkhead.active)
+            out.sample("vesselos_bulkhead_waiting", "gauge", "Calls queued for the bulkhead.", labels, bulkhead.waiting)
+
+        out.sample("vesselos_cache_hits_total", "counter", "Response cache hits.", ws, metrics.cache_hits)
+        out.sample("vesselos_cache_misses_total", "counter", "Response cache misses.", ws, metrics.cache_misses)
+        out.sample("vesselos_cache_coalesced_total", "counter", "Dispatches served by an identical in-flight dispatch.", ws, metrics.coalesced)
+        out.sample("vesselos_cache_entries", "gauge", "Entries held by the response cache.", ws, metrics.cache_entries)
+        out.sample("vesselos_cache_bytes", "gauge", "Encoded bytes held by the response cache.", ws, metrics.cache_bytes)
+
+        for agent, breaker in sorted(dispatcher.breakers.items()):
+            labels = ws + (("agent", agent),)
+            state = breaker.state.value
+            for candidate in CIRCUIT_STATES:
+                out.sample(
+                    "vesselos_circuit_state", "gauge", "1 for the breaker's current state.",
+                    labels + (("state", candidate),), 1 if candidate == state else 0,
+                )
+            for transition, count in sorted(breaker.transitions.items()):
+                out.sample(
+                    "vesselos_circuit_transitions_total", "counter", "Circuit breaker state changes.",
+                    labels + (("transition", transition),), count,
+                )
+
+        ledger = getattr(dispatcher.agents.get("limnus"), "ledger", None)
+        stats = getattr(ledger, "stats", None)
+        if stats is not None:
+            out.sample("vesselos_ledger_commit_seconds", "summary", "Time spent writing ledger group commits.", ws, stats.commit_seconds, "_sum")
+            out.sample("vesselos_ledger_commit_seconds", "summary", "Time spent writing ledger group commits.", ws, stats.commits, "_count")
+            out.sample("vesselos_ledger_blocks_total", "counter", "Blocks appended to the ledger.", ws, stats.blocks)
+
+    for backend, stats in sorted(EMBEDDING_STATS.items()):
+        labels = (("backend", backend),)
+        out.sample("vesselos_embedding_seconds", "summary", "Time spent computing embeddings.", labels, stats.seconds, "_sum")
+        out.sample("vesselos_embedding_seconds", "summary", "Time spent computing embeddings.", labels, stats.calls, "_count")
+        out.sample("vesselos_embedding_texts_total", "counter", "Texts embedded.", labels, stats.texts)
+    return out.render()
@@ -0,0 +1,181 @@
+"""GCRA rate limiting for the enhanced dispatcher.
+
+The generic cell rate algorithm is a token bucket stored as one number per
+key: the theoretical arrival time (TAT) of the next request. A limit of
+`rate` requests per `period` with `burst` allows a request when it would
+not push the TAT more than ``burst * interval`` ahead of now. Checking and
+updating a key is O(1), and a key whose TAT has passed holds no information
+(its bucket is full), so idle keys can be dropped at any time.
+
+`MemoryRateLimiter` keeps state per process. `RedisRateLimiter` keeps it in
+Redis, updated atomically by a Lua script on the server's clock, so limits
+hold across API workers and hosts.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+import logging
+
+try:  # optional dependency
+    import redis.asyncio as aioredis  # type: ignore
+except Exception:  # pragma: no cover
+    aioredis = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """`rate` requests per `period` seconds, with bursts of up to `burst`."""
+
+    rate: int
+    period: float = 60.0
+    burst: Optional[int] = None  # defaults to `rate`
+
+    @property
+    def interval(self) -> float:
+        return self.period / max(1, self.rate)
+
+    @property
+    def capacity(self) -> int:
+        return max(1, self.burst if self.burst is not None else self.rate)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds until a request would be allowed (0 if allowed)
+    reset_after: float  # seconds until the bucket is full again
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a request exceeds a limit; carries when to retry."""
+
+    def __init__(self, scope: str, key: str, limit: RateLimit, retry_after: float) -> None:
+        super().__init__(f"Rate limit exceeded for {scope} {key}; retry in {retry_after:.2f}s")
+        self.scope = scope
+        self.key = key
+        self.limit = limit
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Value for an HTTP ``Retry-After`` header (whole seconds)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def gcra(tat: float, now: float, limit: RateLimit) -> Tuple[RateLimitDecision, float]:
+    """Decide one request; returns the decision and the key's new TAT."""
+    interval = limit.interval
+    window = limit.capacity * interval
+    new_tat = max(tat, now) + interval
+    ahead = new_tat - now
+    if ahead > window + 1e-9:
+        # Denied requests leave the TAT unchanged.
+        return RateLimitDecision(False, 0, ahead - window, max(tat - now, 0.0)), tat
+    remaining = int((window - ahead) / interval + 1e-9)
+    return RateLimitDecision(True, remaining, 0.0, ahead), new_tat
+
+
+class RateLimiter:
+    """Async interface shared by the rate limit backends."""
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateLimitDecision:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Per-process GCRA state, bounded to `max_keys` keys.
+
+    Keys are kept in least-recently-used order. Each call drops the idle keys
+    at the old end (amortised O(1)); beyond `max_keys` the least recently used
+    key is dropped even if it is not idle, which can only loosen its limit.
+    """
+
+    def __init__(self, *, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_keys = max(1, max_keys)
+        self._clock = clock
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def check(self, key: str, limit: RateLimit) -> RateLimitDecision:
+        now = self._clock()
+        with self._lock:
+            tats = self._tats
+            decision, tat = gcra(tats.get(key, now), now, limit)
+            if decision.allowed:
+                tats[key] = tat
+                tats.move_to_end(key)
+            while tats:
+                oldest, oldest_tat = next(iter(tats.items()))
+                if oldest_tat > now and len(tats) <= self.max_keys:
+                    break
+                del tats[oldest]
+                self.evicted += 1
+            return decision
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateLimitDecision:
+        return self.check(key, limit)
+
+
+# KEYS[1] = key; ARGV = interval_ms, capacity. Uses the server clock so all
+# workers agree; the key expires when its bucket would be full again.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local window = interval * tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local ahead = new_tat - now
+if ahead > window then
+  return {0, 0, ahead - window, tat - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.max(1, ahead))
+return {1, math.floor((window - ahead) / interval), 0, ahead}
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """GCRA state in Redis, shared by every worker pointing at `url`."""
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        *,
+        prefix: str = "vesselos:ratelimit:",
+        client: Any = None,
+    ) -> None:
+        if client is None:
+            if aioredis is None:
+                raise RuntimeError("redis is not installed; pip install redis or use the memory rate limiter")
+            client = aioredis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_GCRA_SCRIPT)
+
+    async def acquire(self, key: str, limit: RateLimit) -> RateLimitDecision:
+        interval_ms = max(1, int(limit.interval * 1000))
+        allowed, remaining, retry_ms, reset_ms = await self._script(
+            keys=[self.prefix + key], args=[interval_ms, limit.capacity]
+        )
+        return RateLimitDecision(bool(allowed), int(remaining), int(retry_ms) / 1000, int(reset_ms) / 1000)
+
+    async def close(self) -> None:
+        await self.client.close()
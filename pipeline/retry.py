@@ -0,0 +1,116 @@
+"""Retry policy used by the enhanced dispatcher."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Optional, Tuple, Type
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RetryableError(Exception):
+    """Raise from an agent to request a retry regardless of the error class."""
+
+
+# Transient failures: timeouts, dropped connections, contended files.
+DEFAULT_RETRY_ON: Tuple[Type[BaseException], ...] = (
+    RetryableError,
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+    BlockingIOError,
+    InterruptedError,
+)
+
+# Deterministic failures that would fail again on every attempt.
+DEFAULT_NEVER_RETRY: Tuple[Type[BaseException], ...] = (
+    ValueError,
+    TypeError,
+    KeyError,
+    AttributeError,
+    NotImplementedError,
+    PermissionError,
+    FileNotFoundError,
+)
+
+
+class RetryPolicy:
+    """Decides whether, and after how long, a failed agent call is retried.
+
+    Only exceptions in `retry_on` are retried (`never_retry` wins when a class
+    matches both). Delays use full jitter, ``uniform(0, min(max_delay,
+    base_delay * 2**n))``, so clients that failed together do not retry
+    together. Each agent may spend at most `budget` retries per `window`
+    seconds, which stops retries from multiplying load during an outage.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 10.0,
+        budget: int = 20,
+        window: float = 60.0,
+        retry_on: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_ON,
+        never_retry: Tuple[Type[BaseException], ...] = DEFAULT_NEVER_RETRY,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.window = window
+        self.retry_on = retry_on
+        self.never_retry = never_retry
+        self._rng = rng
+        self._clock = clock
+        self._spent: Dict[str, Deque[float]] = defaultdict(deque)
+
+    def is_retryable(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_on) and not isinstance(error, self.never_retry)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng() * cap
+
+    def budget_remaining(self, agent_name: str) -> int:
+        spent = self._spent[agent_name]
+        horizon = self._clock() - self.window
+        while spent and spent[0] <= horizon:
+            spent.popleft()
+        return max(0, self.budget - len(spent))
+
+    def next_delay(
+        self,
+        agent_name: str,
+        attempt: int,
+        error: BaseException,
+        deadline: Optional[float] = None,
+    ) -> Tuple[Optional[float], str]:
+        """Delay before retrying after `attempt` failed attempts, or ``None``.
+
+        The second element names the outcome: ``retry``, ``not_retryable``,
+        ``exhausted``, ``budget`` or ``deadline``. `deadline` is a
+        `time.monotonic` timestamp; a retry that could not start before it is
+        refused. Granted retries are charged to the agent's budget.
+        """
+        if not self.is_retryable(error):
+            return None, "not_retryable"
+        if attempt >= self.max_attempts:
+            return None, "exhausted"
+        if self.budget_remaining(agent_name) <= 0:
+            logger.warning("Retry budget exhausted for %s", agent_name)
+            return None, "budget"
+        delay = self.backoff(attempt)
+        if deadline is not None and self._clock() + delay >= deadline:
+            return None, "deadline"
+        self._spent[agent_name].append(self._clock())
+        return delay, "retry"
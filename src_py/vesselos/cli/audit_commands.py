@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Iterable, Sequence
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Tuple
 
 import click
 
@@ -12,8 +13,11 @@ try:  # Optional dependency for prettier output
 except ImportError:  # pragma: no cover - optional helper
     tabulate = None  # type: ignore
 
+from ledger.verify import verify_chain
 from library_core.workspace import Workspace
 from pipeline.dispatcher_enhanced import EnhancedMRPDispatcher
+from pipeline.profiling import SORT_KEYS, list_profiles, top_functions
+from workspace.manager import WorkspaceManager
 
 
 def _render_table(rows: Sequence[Sequence[str]], headers: Iterable[str]) -> None:
@@ -84,10 +88,9 @@ def health(workspace: str) -> None:
         try:
             limnus_state = ws.load_state("limnus", default={})
             blocks = limnus_state.get("ledger", {}).get("blocks", [])
-            issues = []
-            for index in range(1, len(blocks)):
-                if blocks[index].get("prev") != blocks[index - 1].get("hash"):
-                    issues.append(f"Block {index} chain broken")
+            report = verify_chain(blocks)
+            issues = [f"Block {index} chain broken" for index in report.broken_links]
+            issues += [f"Block {index} hash mismatch" for index in report.hash_mismatches]
             if issues:
                 checks.append(("Limnus Ledger", "❌ FAIL", ", ".join(issues)))
             else:
@@ -108,7 +111,14 @@ def health(workspace: str) -> None:
 @audit.command()
 @click.option("--workspace", default="default", help="Workspace ID")
 @click.option("--verbose", is_flag=True, help="Show detailed ledger entries")
-def ledger(workspace: str, verbose: bool) -> None:
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    show_default=True,
+    help="Processes used for block hashing (>1 enables the parallel pool)",
+)
+def ledger(workspace: str, verbose: bool, workers: int) -> None:
     """Audit Garden and Limnus ledgers."""
 
     async def _ledger() -> None:
@@ -143,14 +153,17 @@ def ledger(workspace: str, verbose: bool) -> None:
             click.echo(f"Latest: {blocks[-1].get('ts')}")
             click.echo(f"Latest hash: {blocks[-1].get('hash', '')[:16]}...")
 
-        issues = []
-        for index in range(1, len(blocks)):
-            if blocks[index].get("prev") != blocks[index - 1].get("hash"):
-                issues.append(str(index))
-        if issues:
-            click.echo(f"\n❌ Chain integrity issues at blocks: {', '.join(issues)}")
-        else:
+        report = verify_chain(blocks, workers=workers)
+        if report.broken_links:
+            click.echo(f"\n❌ Chain integrity issues at blocks: {', '.join(map(str, report.broken_links))}")
+        if report.hash_mismatches:
+            click.echo(f"\n❌ Hash mismatches at blocks: {', '.join(map(str, report.hash_mismatches))}")
+        if report.ok:
             click.echo("\n✅ Chain integrity: VERIFIED")
+        click.echo(
+            f"⏱️  Verified {report.total} blocks in {report.elapsed_s * 1000:.1f}ms "
+            f"({report.blocks_per_second:,.0f} blocks/s, {report.workers} worker(s))"
+        )
 
         if verbose and blocks:
             click.echo("\nRecent blocks:")
@@ -332,6 +345,46 @@ def performance(workspace: str) -> None:
     asyncio.run(_performance())
 
 
+@audit.command()
+@click.option("--workspace", default="default", help="Workspace ID")
+@click.option("--top", "limit", type=int, default=20, show_default=True, help="Functions to show")
+@click.option("--sort", type=click.Choice(SORT_KEYS), default="cumulative", show_default=True)
+@click.option("--last", type=int, default=1, show_default=True, help="Merge the N most recent profiles")
+@click.option(
+    "--file",
+    "files",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Profile file(s) to read instead of the workspace's logs/profiles",
+)
+def profile(workspace: str, limit: int, sort: str, last: int, files: Tuple[Path, ...]) -> None:
+    """Top functions from captured dispatch profiles."""
+    click.echo("\n🔬 Dispatch Profile")
+    click.echo("=" * 60 + "\n")
+
+    paths: Sequence[Path] = files
+    directory: Optional[Path] = None
+    if not paths:
+        directory = WorkspaceManager().get(workspace).path / "logs" / "profiles"
+        paths = list_profiles(directory)[-max(1, last) :]
+    if not paths:
+        click.echo(f"⚠️  No profiles found in {directory}")
+        click.echo("   Enable DispatcherConfig.profiling_enabled and send metadata {\"profile\": true}")
+        return
+
+    click.echo(f"Profiles merged: {len(paths)} (latest {paths[-1].name})\n")
+    rows = [
+        (
+            f"{row['cumtime_ms']:.1f}",
+            f"{row['tottime_ms']:.1f}",
+            row["calls"],
+            row["function"],
+        )
+        for row in top_functions(paths, limit=limit, sort=sort)
+    ]
+    _render_table(rows, headers=["cum ms", "self ms", "calls", "function"])
+
+
 @audit.command()
 @click.option("--workspace", default="default", help="Workspace ID")
 @click.pass_context
@@ -343,7 +396,7 @@ def full(ctx: click.Context, workspace: str) -> None:
 
     ctx.invoke(health, workspace=workspace)
     click.echo()
-    ctx.invoke(ledger, workspace=workspace, verbose=False)
+    ctx.invoke(ledger, workspace=workspace, verbose=False, workers=1)
     click.echo()
     ctx.invoke(memory, workspace=workspace)
     click.echo()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from library_core.deadline import DeadlineExceeded, check_deadline, earliest_deadline, time_remaining
+
+
+def test_deadline_helpers() -> None:
+    now = time.monotonic()
+    check_deadline(None)
+    check_deadline(now + 5)
+    with pytest.raises(DeadlineExceeded, match="before limnus"):
+        check_deadline(now - 1, "limnus")
+    assert isinstance(DeadlineExceeded(), TimeoutError)
+    contexts = [SimpleNamespace(deadline=now + 3), SimpleNamespace(deadline=None), SimpleNamespace(deadline=now + 1)]
+    assert earliest_deadline(contexts) == now + 1
+    assert earliest_deadline([object()]) is None
+    assert time_remaining(None) == float("inf")
+
+
+def test_limnus_writes_nothing_after_deadline(tmp_path: Path) -> None:
+    limnus_mod = pytest.importorskip("library_core.agents.limnus_agent")
+    manager = SimpleNamespace(get=lambda _wid: SimpleNamespace(path=tmp_path))
+    agent = limnus_mod.LimnusAgent("test", None, manager)
+    memory_before = agent.mem_path.read_text(encoding="utf-8")
+    ledger_before = agent.ledger_path.read_text(encoding="utf-8")
+    context = SimpleNamespace(
+        input_text="late", user_id="u1", agent_results={}, metadata={}, deadline=time.monotonic() - 0.01
+    )
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(agent.process(context))
+    with pytest.raises(DeadlineExceeded):
+        agent._append_memories([{"id": "m", "layer": "L1"}], time.monotonic() - 0.01)
+
+    assert agent.mem_path.read_text(encoding="utf-8") == memory_before
+    assert agent.ledger_path.read_text(encoding="utf-8") == ledger_before
+    assert json.loads(memory_before) == []
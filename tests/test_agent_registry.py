@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from agents.echo.echo_agent import EchoAgent
+from agents.garden.garden_agent import GardenAgent
+from interface import dispatcher
+from interface.dispatcher import get_agent, invalidate_agents
+
+
+def test_agents_are_built_once_per_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    built = []
+    real_load = dispatcher._load_agent
+
+    def counting_load(module: str, root: Path = dispatcher.ROOT):
+        built.append((module, root))
+        return real_load(module, root)
+
+    monkeypatch.setattr(dispatcher, "_load_agent", counting_load)
+    first, second = tmp_path / "one", tmp_path / "two"
+    try:
+        garden = get_agent("garden", first)
+        assert isinstance(garden, GardenAgent)
+        assert get_agent("garden", first) is garden
+        assert get_agent("garden", first / ".." / "one") is garden
+        assert get_agent("garden", second) is not garden
+        assert isinstance(get_agent("echo", first), EchoAgent)
+        assert len(built) == 3
+
+        invalidate_agents("garden", first)
+        assert get_agent("echo", first) is not None
+        assert get_agent("garden", first) is not garden
+        assert len(built) == 4
+    finally:
+        invalidate_agents(root=first)
+        invalidate_agents(root=second)
+
+
+def test_unknown_agent_is_not_cached(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        get_agent("nope", tmp_path)
+    with pytest.raises(ValueError):
+        get_agent("nope", tmp_path)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+cb = pytest.importorskip("pipeline.circuit_breaker")
+CircuitState = cb.CircuitState
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make(clock: Clock, events: list, **kwargs):
+    kwargs.setdefault("failure_threshold", 100)
+    kwargs.setdefault("minimum_calls", 4)
+    return cb.CircuitBreaker(timeout=10, name="limnus", clock=clock, on_transition=lambda *e: events.append(e), **kwargs)
+
+
+def test_failure_rate_over_count_window_trips() -> None:
+    events: list = []
+    breaker = make(Clock(), events, window_size=4, failure_rate_threshold=0.5)
+    for ok in (True, False, True):
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert events == [("limnus", CircuitState.CLOSED, CircuitState.OPEN, "failure rate 50%")]
+
+
+def test_slow_calls_trip_and_time_window_expires() -> None:
+    clock = Clock()
+    events: list = []
+    breaker = make(clock, events, window_type="time", window_size=30, slow_call_duration=1.0, slow_call_rate_threshold=0.75)
+    for _ in range(3):
+        breaker.record_success(2.0)
+    clock.now += 31
+    breaker.record_success(2.0)
+    assert breaker.rates() == (1, 0.0, 1.0)
+    for _ in range(3):
+        breaker.record_success(2.0)
+    assert breaker.state == CircuitState.OPEN
+    assert events[-1][3] == "slow call rate 100%"
+
+
+def test_half_open_limits_concurrent_probes() -> None:
+    clock = Clock()
+    events: list = []
+    breaker = make(clock, events, failure_threshold=1, max_half_open_calls=2, half_open_attempts=2)
+    breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.allow_request() and breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+    breaker.record_success()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert [e[2] for e in events] == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED]
+    assert breaker.snapshot()["transitions"] == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+
+
+def test_concurrent_threads_see_consistent_counts() -> None:
+    events: list = []
+    breaker = make(Clock(), events, failure_threshold=10**6, window_size=10**6, minimum_calls=10**6)
+
+    def hammer() -> None:
+        for _ in range(2000):
+            breaker.record_failure()
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert breaker.failure_count == 16000
+    assert breaker.rates()[0] == 16000
@@ -0,0 +1,511 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+dispatcher_mod = pytest.importorskip("pipeline.dispatcher_enhanced")
+from pipeline.intent_parser import IntentParser  # noqa: E402
+from pipeline.middleware import Middleware  # noqa: E402
+from pipeline.prometheus import render_metrics  # noqa: E402
+
+AGENT_CLASSES = {
+    "GardenAgent": "garden",
+    "EchoAgent": "echo",
+    "LimnusAgent": "limnus",
+    "KiraAgent": "kira",
+    "VesselIndexAgent": "vessel_index",
+}
+
+
+class FakeAgent:
+    def __init__(
+        self,
+        name: str,
+        *,
+        delay: float = 0.0,
+        inputs: Tuple[str, ...] = (),
+        fail: Optional[Exception] = None,
+        log: Optional[List[Tuple[str, str, float]]] = None,
+    ) -> None:
+        self.name = name
+        self.delay = delay
+        self.inputs = inputs
+        self.fail = fail
+        self.log = log if log is not None else []
+        self.calls = 0
+
+    async def process(self, context) -> Dict[str, Any]:  # noqa: ANN001
+        self.calls += 1
+        self.log.append(("start", self.name, time.perf_counter()))
+        await asyncio.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        self.log.append(("end", self.name, time.perf_counter()))
+        return {"agent": self.name, "seen": sorted(context.agent_results)}
+
+
+def build_dispatcher(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, agents: Dict[str, FakeAgent], **config: Any):
+    record = SimpleNamespace(path=tmp_path)
+    monkeypatch.setattr(dispatcher_mod, "WorkspaceManager", lambda: SimpleNamespace(get=lambda _wid: record))
+    monkeypatch.setattr(dispatcher_mod, "StorageManager", lambda _path: None)
+    monkeypatch.setattr(dispatcher_mod, "PipelineLogger", lambda *_args: None)
+    for attr, name in AGENT_CLASSES.items():
+        monkeypatch.setattr(dispatcher_mod, attr, lambda *_args, _name=name: agents.get(_name) or FakeAgent(_name))
+    config.setdefault("agent_order", list(agents))
+    config.setdefault("retry_enabled", False)
+    return dispatcher_mod.EnhancedMRPDispatcher("test", dispatcher_mod.DispatcherConfig(**config))
+
+
+def make_context(text: str = "hello there", user: str = "u1"):
+    return dispatcher_mod.PipelineContext(
+        input_text=text,
+        user_id=user,
+        workspace_id="test",
+        intent=IntentParser().parse(text),
+        timestamp=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def test_dag_runs_independent_agents_concurrently(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    log: List[Tuple[str, str, float]] = []
+    agents = {
+        "garden": FakeAgent("garden", delay=0.05, log=log),
+        "echo": FakeAgent("echo", delay=0.05, log=log),
+        "limnus": FakeAgent("limnus", delay=0.05, inputs=("echo",), log=log),
+        "kira": FakeAgent("kira", delay=0.05, inputs=("garden", "echo", "limnus"), log=log),
+        "vessel_index": FakeAgent("vessel_index", delay=0.05, log=log),
+    }
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, agents, parallel_execution=True, cache_enabled=False)
+
+    start = time.perf_counter()
+    response = asyncio.run(dispatcher.dispatch(make_context()))
+    elapsed = time.perf_counter() - start
+
+    assert response["success"]
+    # Critical path is echo -> limnus -> kira (3 x 50ms), not all five agents.
+    assert elapsed < 0.22
+    assert response["agents"]["limnus"]["seen"] == ["echo", "garden", "vessel_index"]
+    assert set(response["agents"]["kira"]["seen"]) >= {"garden", "echo", "limnus"}
+    ends = {name: ts for kind, name, ts in log if kind == "end"}
+    starts = {name: ts for kind, name, ts in log if kind == "start"}
+    assert starts["limnus"] >= ends["echo"]
+    assert starts["kira"] >= ends["limnus"]
+
+
+def test_dependency_cycle_is_rejected(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    agents = {"echo": FakeAgent("echo", inputs=("limnus",)), "limnus": FakeAgent("limnus", inputs=("echo",))}
+    with pytest.raises(ValueError, match="cycle"):
+        build_dispatcher(monkeypatch, tmp_path, agents, parallel_execution=True)
+
+
+def test_config_inputs_override_agent_declarations(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    agents = {"garden": FakeAgent("garden"), "echo": FakeAgent("echo", inputs=("garden", "missing"))}
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, agents, agent_inputs={"garden": ["echo"], "echo": []})
+    assert dispatcher.dependencies == {"garden": ("echo",), "echo": ()}
+
+
+def test_cache_hits_do_not_share_state(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    echo = FakeAgent("echo")
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"echo": echo}, cache_max_entries=4)
+
+    async def _run():
+        first = await dispatcher.dispatch(make_context())
+        second = await dispatcher.dispatch(make_context())
+        second["agents"]["echo"]["agent"] = "mutated"
+        third = await dispatcher.dispatch(make_context())
+        return first, second, third
+
+    first, second, third = asyncio.run(_run())
+    assert echo.calls == 1
+    assert first["cached"] is False and second["cached"] is True
+    assert third["agents"]["echo"]["agent"] == "echo"
+    summary = asyncio.run(dispatcher.get_metrics())
+    assert summary["cache_stats"]["hits"] == 2
+    assert summary["cache_stats"]["entries"] == 1
+    assert summary["cache_stats"]["workspace_id"] == "test"
+
+
+def test_sqlite_cache_backend_shared_between_dispatchers(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    echo = FakeAgent("echo")
+    config = {"cache_backend": "sqlite", "cache_path": str(tmp_path / "shared.sqlite3")}
+    first = build_dispatcher(monkeypatch, tmp_path, {"echo": echo}, **config)
+    second = build_dispatcher(monkeypatch, tmp_path, {"echo": echo}, **config)
+
+    async def _run():
+        await first.dispatch(make_context())
+        return await second.dispatch(make_context())
+
+    assert asyncio.run(_run())["cached"] is True
+    assert echo.calls == 1
+
+
+def test_identical_concurrent_dispatches_are_coalesced(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    limnus = FakeAgent("limnus", delay=0.05)
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"limnus": limnus}, cache_enabled=False)
+
+    async def _run():
+        return await asyncio.gather(*(dispatcher.dispatch(make_context()) for _ in range(5)))
+
+    responses = asyncio.run(_run())
+    assert limnus.calls == 1
+    assert sum(1 for r in responses if r.get("coalesced")) == 4
+    responses[1]["agents"]["limnus"]["agent"] = "mutated"
+    assert responses[2]["agents"]["limnus"]["agent"] == "limnus"
+    assert asyncio.run(dispatcher.get_metrics())["cache_stats"]["coalesced"] == 4
+
+
+def test_excluded_intents_are_not_coalesced(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    limnus = FakeAgent("limnus", delay=0.01)
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"limnus": limnus}, cache_enabled=False)
+
+    async def _run():
+        await asyncio.gather(*(dispatcher.dispatch(make_context("/commit now")) for _ in range(3)))
+
+    asyncio.run(_run())
+    assert limnus.calls == 3
+
+
+def test_coalesced_followers_see_leader_failure(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    class Boom(Middleware):
+        async def pre_dispatch(self, context):  # noqa: ANN001
+            await asyncio.sleep(0.01)
+            raise ValueError("rejected")
+
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"echo": FakeAgent("echo")}, cache_enabled=False)
+    dispatcher.add_middleware(Boom())
+
+    async def _run():
+        return await asyncio.gather(*(dispatcher.dispatch(make_context()) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(_run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert dispatcher._inflight == {}
+
+
+class BatchAgent(FakeAgent):
+    def __init__(self, name: str, **kwargs: Any) -> None:
+        super().__init__(name, **kwargs)
+        self.batches: List[int] = []
+
+    async def process_batch(self, contexts) -> List[Any]:  # noqa: ANN001
+        self.batches.append(len(contexts))
+        return [{"agent": self.name, "text": context.input_text} for context in contexts]
+
+
+def test_dispatch_many_batches_agents_and_keeps_item_errors(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    class RejectEmpty(Middleware):
+        async def pre_dispatch(self, context):  # noqa: ANN001
+            if not context.input_text:
+                raise ValueError("empty input")
+            return context
+
+    echo = FakeAgent("echo")
+    limnus = BatchAgent("limnus")
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"echo": echo, "limnus": limnus}, batch_max_size=4)
+    dispatcher.add_middleware(RejectEmpty())
+    texts = [f"note {n}" for n in range(6)]
+    texts.insert(2, "")
+
+    responses = asyncio.run(dispatcher.dispatch_many([make_context(text) for text in texts]))
+
+    assert limnus.batches == [3, 3]
+    assert echo.calls == 6
+    assert [r["success"] for r in responses] == [bool(text) for text in texts]
+    assert responses[2]["errors"][0]["error"] == "empty input"
+    assert [r["agents"]["limnus"]["text"] for r in responses if r["success"]] == [t for t in texts if t]
+
+
+def test_only_transient_errors_are_retried(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    class Flaky(FakeAgent):
+        async def process(self, context):  # noqa: ANN001
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("reset by peer")
+            return {"agent": self.name}
+
+    echo = FakeAgent("echo", fail=ValueError("malformed"))
+    limnus = Flaky("limnus")
+    dispatcher = build_dispatcher(
+        monkeypatch, tmp_path, {"echo": echo, "limnus": limnus}, retry_enabled=True, retry_delay=0.001, cache_enabled=False
+    )
+
+    response = asyncio.run(dispatcher.dispatch(make_context()))
+
+    assert echo.calls == 1
+    assert limnus.calls == 2
+    assert [e["agent"] for e in response["errors"]] == ["echo"]
+    stats = asyncio.run(dispatcher.get_metrics())["retry_stats"]
+    assert stats == {"echo": {"not_retryable": 1}, "limnus": {"retry": 1}}
+
+
+def test_retries_stop_at_the_dispatch_deadline(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    limnus = FakeAgent("limnus", delay=0.02, fail=TimeoutError("slow backend"))
+    dispatcher = build_dispatcher(
+        monkeypatch, tmp_path, {"limnus": limnus}, retry_enabled=True, retry_attempts=50, retry_delay=0.05, cache_enabled=False
+    )
+    context = make_context()
+    context.deadline = time.monotonic() + 0.2
+
+    start = time.perf_counter()
+    response = asyncio.run(dispatcher.dispatch(context))
+
+    assert time.perf_counter() - start < 0.3
+    assert 1 < limnus.calls < 50
+    assert not response["success"]
+    assert any(entry["event"] == "agent_retry_stopped" for entry in response["trace"])
+
+
+def test_bulkhead_sheds_slow_agent_without_slowing_others(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    echo = FakeAgent("echo")
+    limnus = FakeAgent("limnus", delay=0.1)
+    dispatcher = build_dispatcher(
+        monkeypatch,
+        tmp_path,
+        {"limnus": limnus, "echo": echo},
+        cache_enabled=False,
+        agent_concurrency={"limnus": 1},
+        bulkhead_max_queue=1,
+        bulkhead_max_wait=0.15,
+    )
+
+    async def _run():
+        return await asyncio.gather(*(dispatcher.dispatch(make_context(f"note {n}")) for n in range(4)))
+
+    responses = asyncio.run(_run())
+    shed = [r for r in responses if any("bulkhead_full" in e["error"] for e in r["errors"])]
+    # One call runs, one waits in the single queue slot, two are shed at once.
+    assert limnus.calls == 2 and len(shed) == 2
+    assert echo.calls == 4 and all("echo" in r["agents"] for r in responses)
+    stats = asyncio.run(dispatcher.get_metrics())["bulkhead_stats"]["limnus"]
+    assert stats["limit"] == 1 and stats["admitted"] == 2 and stats["rejected"] == 2
+    assert stats["max_queue_depth"] == 1 and stats["max_wait_ms"] >= 50
+
+
+def test_circuit_transitions_are_reported(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    limnus = FakeAgent("limnus", fail=ValueError("broken"))
+    dispatcher = build_dispatcher(
+        monkeypatch, tmp_path, {"limnus": limnus}, cache_enabled=False, circuit_breaker_threshold=2
+    )
+    seen: List[Tuple[str, str, str]] = []
+    dispatcher.on("circuit_transition", lambda agent_name, old, new, reason: seen.append((agent_name, old, new)))
+
+    async def _run():
+        for n in range(3):
+            await dispatcher.dispatch(make_context(f"note {n}"))
+        await asyncio.sleep(0)
+        return await dispatcher.get_metrics()
+
+    metrics = asyncio.run(_run())
+    assert limnus.calls == 2
+    assert seen == [("limnus", "closed", "open")]
+    assert metrics["circuit_stats"]["limnus"]["state"] == "open"
+
+
+def test_dispatch_stream_yields_agents_as_they_finish(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    agents = {
+        "garden": FakeAgent("garden", delay=0.01),
+        "echo": FakeAgent("echo", delay=0.02),
+        "limnus": FakeAgent("limnus", delay=0.15, inputs=("echo",)),
+    }
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, agents, parallel_execution=True)
+
+    async def _collect():
+        events = []
+        start = time.perf_counter()
+        async for event in dispatcher.dispatch_stream(make_context()):
+            events.append((event, time.perf_counter() - start))
+        cached = [event async for event in dispatcher.dispatch_stream(make_context())]
+        return events, cached
+
+    events, cached = asyncio.run(_collect())
+    assert [e.get("agent", e["event"]) for e, _ in events] == ["garden", "echo", "limnus", "complete"]
+    assert events[0][1] < 0.1
+    assert events[-1][0]["response"]["success"]
+    assert [e.get("agent", e["event"]) for e in cached] == ["garden", "echo", "limnus", "complete"]
+    assert cached[-1]["response"]["cached"] is True
+    assert all(agent.calls == 1 for agent in agents.values())
+    assert dispatcher.event_hooks["post_agent"] == []
+
+
+def test_deadline_skips_downstream_agents(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    echo = FakeAgent("echo", delay=0.2)
+    limnus = FakeAgent("limnus")
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"echo": echo, "limnus": limnus}, cache_enabled=False)
+    context = make_context()
+    context.deadline = time.monotonic() + 0.05
+
+    response = asyncio.run(dispatcher.dispatch(context))
+
+    assert limnus.calls == 0
+    assert response["skipped"] == ["limnus"]
+    assert [e["agent"] for e in response["errors"]] == ["echo"]
+    assert not response["success"]
+    assert {"event": "agent_skipped", "agent": "limnus", "reason": "deadline"}.items() <= response["trace"][-1].items()
+
+
+def test_exposition_covers_dispatcher_metrics(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    dispatcher = build_dispatcher(
+        monkeypatch, tmp_path, {"echo": FakeAgent("echo"), "limnus": FakeAgent("limnus", fail=ValueError("x"))}
+    )
+
+    async def _run():
+        await dispatcher.dispatch(make_context())
+        await dispatcher.dispatch(make_context("again"))
+
+    asyncio.run(_run())
+    text = render_metrics({'ws"1': dispatcher})
+    lines = text.splitlines()
+
+    assert 'vesselos_dispatches_total{workspace="ws\\"1",outcome="failure"} 2' in lines
+    assert 'vesselos_agent_errors_total{workspace="ws\\"1",agent="limnus"} 2' in lines
+    assert 'vesselos_cache_misses_total{workspace="ws\\"1"} 2' in lines
+    assert 'vesselos_circuit_state{workspace="ws\\"1",agent="echo",state="closed"} 1' in lines
+    assert 'vesselos_agent_duration_seconds_bucket{workspace="ws\\"1",agent="echo",le="+Inf"} 2' in lines
+    assert 'vesselos_agent_duration_seconds_count{workspace="ws\\"1",agent="echo"} 2' in lines
+    assert lines.count("# TYPE vesselos_agent_duration_seconds histogram") == 1
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in lines if line.startswith("vesselos_dispatch_duration_seconds_bucket")]
+    assert buckets == sorted(buckets) and buckets[-1] == 2
+
+
+def test_concurrent_dispatches_get_separate_span_trees(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from library_core.tracing import MemorySpanExporter, Tracer, span
+    from pipeline.middleware import MetricsMiddleware
+
+    class StorageAgent(FakeAgent):
+        async def process(self, context) -> Dict[str, Any]:  # noqa: ANN001
+            with span("storage.write"):
+                await asyncio.to_thread(time.sleep, self.delay)
+            return {"agent": self.name}
+
+    agents = {"echo": FakeAgent("echo", delay=0.02), "limnus": StorageAgent("limnus", delay=0.02)}
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, agents, parallel_execution=True, cache_enabled=False)
+    exporter = MemorySpanExporter()
+    dispatcher.tracer = Tracer(exporter)
+    dispatcher.add_middleware(MetricsMiddleware())
+
+    async def run() -> List[Dict[str, Any]]:
+        return await asyncio.gather(dispatcher.dispatch(make_context("first")), dispatcher.dispatch(make_context("second")))
+
+    responses = asyncio.run(run())
+    dispatcher.tracer.flush()
+
+    assert len(exporter.traces) == 2
+    trace_ids = {response["metadata"]["trace_id"] for response in responses}
+    assert trace_ids == {spans[0].trace_id for spans in exporter.traces}
+    for spans in exporter.traces:
+        by_id = {item.span_id: item for item in spans}
+        root = next(item for item in spans if item.parent_id is None)
+        assert root.name == "dispatch" and root.attributes["success"]
+        write = next(item for item in spans if item.name == "storage.write")
+        attempt = by_id[write.parent_id]
+        agent = by_id[attempt.parent_id]
+        assert (attempt.name, agent.name, agent.parent_id) == ("attempt", "agent", root.span_id)
+        assert agent.attributes["agent"] == "limnus"
+        assert all(item.trace_id == root.trace_id and item.end is not None for item in spans)
+        assert root.duration >= agent.duration >= write.duration >= 0.02
+    for response in responses:
+        assert set(response["metrics"]["agent_timings"]) == {"echo", "limnus"}
+    assert not dispatcher.middleware[0]._timers
+
+
+def test_unsampled_dispatches_record_no_spans(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from library_core.tracing import MemorySpanExporter, Tracer
+
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"echo": FakeAgent("echo")}, cache_enabled=False)
+    exporter = MemorySpanExporter()
+    dispatcher.tracer = Tracer(exporter, sample_rate=0.0)
+
+    response = asyncio.run(dispatcher.dispatch(make_context()))
+    forced = make_context("forced")
+    forced.metadata["trace"] = True
+    asyncio.run(dispatcher.dispatch(forced))
+    dispatcher.tracer.flush()
+
+    assert "trace_id" not in response["metadata"]
+    assert len(exporter.traces) == 1 and exporter.traces[0][-1].name == "dispatch"
+
+
+def test_profiling_captures_flagged_dispatches(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from pipeline.profiling import list_profiles, top_functions
+
+    class BusyAgent(FakeAgent):
+        async def process(self, context) -> Dict[str, Any]:  # noqa: ANN001
+            return {"total": busy_loop(20_000)}
+
+    def busy_loop(n: int) -> int:
+        return sum(i * i for i in range(n))
+
+    dispatcher = build_dispatcher(
+        monkeypatch, tmp_path, {"echo": BusyAgent("echo")}, cache_enabled=False, profiling_enabled=True
+    )
+    flagged = make_context("profile me")
+    flagged.metadata["profile"] = True
+    profiled = asyncio.run(dispatcher.dispatch(flagged))
+    plain = asyncio.run(dispatcher.dispatch(make_context("not me")))
+
+    profiles = list_profiles(tmp_path / "logs" / "profiles")
+    assert [str(path) for path in profiles] == [profiled["metadata"]["profile_path"]]
+    assert "profile_path" not in plain["metadata"]
+    rows = top_functions(profiles, limit=50)
+    assert any("busy_loop" in row["function"] for row in rows)
+    assert rows == sorted(rows, key=lambda row: row["cumtime_ms"], reverse=True)
+
+
+def test_response_shaping_shares_results_and_trims_fields(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    agents = {"garden": FakeAgent("garden"), "echo": FakeAgent("echo")}
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, agents, response_aliases=False, verbose_logging=False)
+    context = make_context()
+
+    response = asyncio.run(dispatcher.dispatch(context, fields=("success", "agents")))
+    assert set(response) == {"success", "agents"}
+    assert response["agents"]["echo"] is context.agent_results["echo"]
+    cached = asyncio.run(dispatcher.dispatch(make_context(), fields=("agents", "cached")))
+    assert cached == {"agents": response["agents"], "cached": True}
+
+    full = asyncio.run(dispatcher.dispatch(make_context("other")))
+    assert "ritual" not in full and full["trace"] == []
+    assert [entry["event"] for entry in context.trace][:2] == ["agent_start", "agent_complete"]
+    view = context.to_dict(trace=False)
+    assert view["agent_results"] is context.agent_results and "trace" not in view
+
+
+def test_middleware_chains_skip_noop_hooks_and_keep_order(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls: List[str] = []
+
+    class Tag(Middleware):
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        async def pre_agent(self, agent_name: str, context):  # noqa: ANN001
+            calls.append(f"pre:{self.name}")
+            return context
+
+        async def post_agent(self, agent_name: str, context, result: Any) -> Any:  # noqa: ANN001
+            calls.append(f"post:{self.name}")
+            return result
+
+    dispatcher = build_dispatcher(monkeypatch, tmp_path, {"echo": FakeAgent("echo")}, cache_enabled=False)
+    first, second, idle = Tag("a"), Tag("b"), Middleware()
+    for middleware in (first, second, idle):
+        dispatcher.add_middleware(middleware)
+    assert dispatcher._chain["pre_dispatch"] == ()
+    assert len(dispatcher._chain["pre_agent"]) == 2
+
+    async def on_agent(**_kwargs: Any) -> None:
+        calls.append("hook")
+
+    dispatcher.on("post_agent", on_agent)
+    asyncio.run(dispatcher.dispatch(make_context()))
+    assert calls == ["pre:a", "pre:b", "post:b", "post:a", "hook"]
+
+    calls.clear()
+    dispatcher.remove_middleware(first)
+    dispatcher.off("post_agent", on_agent)
+    asyncio.run(dispatcher.dispatch(make_context("again")))
+    assert calls == ["pre:b", "post:b"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from common import keyword_matcher
+from common.keyword_matcher import KeywordMatcher
+
+BACKENDS = [False] + ([True] if keyword_matcher.ahocorasick is not None else [])
+
+
+@pytest.mark.parametrize("use_automaton", BACKENDS)
+def test_labels_match_substring_semantics(use_automaton: bool) -> None:
+    rng = random.Random(3)
+    alphabet = "ab?c"
+    for _ in range(200):
+        groups = {
+            f"g{index}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 3))]
+            for index in range(rng.randint(1, 5))
+        }
+        matcher = KeywordMatcher(groups, use_automaton=use_automaton)
+        for _ in range(20):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+            expected = {label for label, keywords in groups.items() if any(k in text for k in keywords)}
+            assert matcher.labels(text) == expected
+
+
+def test_first_respects_group_order() -> None:
+    matcher = KeywordMatcher({"witness": ("see",), "plant": ("seed",), "empty": ()}, use_automaton=False)
+    assert matcher.first("a seed") == "witness"
+    assert matcher.first("a seed", ["plant", "witness"]) == "plant"
+    assert matcher.first("nothing") is None
+
+
+def test_intent_parser_priorities_unchanged() -> None:
+    intent_parser = pytest.importorskip("pipeline.intent_parser")
+    parser = intent_parser.IntentParser()
+    assert parser.parse("I return as breath, let us build").args == {"mantra": "i return as breath"}
+    assert parser.parse("Time to finish and build").args == {"stage": "plant"}
+    assert parser.parse("we will seed ideas").args == {"stage": "witness"}
+    assert parser.parse("/status now").intent_type == "command"
+    assert parser.parse("just talking").intent_type == "dictation"
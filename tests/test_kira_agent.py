@@ -75,6 +75,7 @@ def test_publish_with_release_uses_gh(monkeypatch: pytest.MonkeyPatch, kira_repo
 
     artifacts = list((kira_repo / "dist").glob("codex_release_*"))
     assert artifacts, "Expected packaged artifact in dist/"
+    assert (kira_repo / "dist" / "ledger_export.lsnap").exists()
 
 
 def test_validate_returns_issue_report(kira_repo: Path) -> None:
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from pathlib import Path
+
+from ledger.canonical import block_hash, block_json, canonical_json
+from ledger.verify import verify_chain
+
+ROOT = Path(__file__).resolve().parents[1]
+_ALPHABET = "abcXYZ 019_-\"\\/\n\t:,{}[]éß“”∿🐿️🦊"
+
+
+def _rand_str(rng: random.Random) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 12)))
+
+
+def _rand_value(rng: random.Random, depth: int = 0):
+    kind = rng.randint(0, 7 if depth < 3 else 4)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.choice([True, False])
+    if kind == 2:
+        return rng.randint(-(2**40), 2**40)
+    if kind == 3:
+        return rng.choice([0.1, -2.5, 1e16, 3.14159, 1e-7, float(rng.random())])
+    if kind == 4:
+        return _rand_str(rng)
+    if kind == 5:
+        return [_rand_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {_rand_str(rng): _rand_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+def _legacy_hash(block: dict) -> str:
+    material = {k: v for k, v in block.items() if k != "hash"}
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def test_block_hash_matches_legacy_encoding() -> None:
+    rng = random.Random(20251016)
+    for _ in range(2000):
+        block = {
+            "ts": _rand_str(rng),
+            "kind": rng.choice(["genesis", "input", "consent", _rand_str(rng)]),
+            "data": _rand_value(rng),
+            "prev": rng.choice(["", hashlib.sha256(_rand_str(rng).encode()).hexdigest()]),
+        }
+        assert block_json(block) == canonical_json(block) == json.dumps(block, sort_keys=True)
+        assert block_hash(block) == _legacy_hash(block)
+        block["hash"] = "ignored"
+        assert block_hash(block) == _legacy_hash(block)
+
+
+def test_committed_repo_ledger_still_verifies() -> None:
+    blocks = json.loads((ROOT / "state" / "ledger.json").read_text(encoding="utf-8"))
+    assert verify_chain(blocks).ok
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from agents.limnus.limnus_agent import LimnusAgent
+from ledger.index import LedgerIndex, index_path, load_or_build
+from ledger.writer import LedgerWriter
+
+
+def _blocks() -> list[dict]:
+    stamps = [
+        ("2025-10-14T23:59:59Z", "genesis"),
+        ("2025-10-15T09:10:00Z", "input"),
+        ("2025-10-15T09:45:00Z", "consent"),
+        ("2025-10-15T17:00:00Z", "input"),
+        ("2025-10-16T00:00:01Z", "input"),
+    ]
+    return [{"ts": ts, "kind": kind, "data": {}, "prev": "", "hash": f"h{idx}"} for idx, (ts, kind) in enumerate(stamps)]
+
+
+def test_kind_and_window_queries() -> None:
+    blocks = _blocks()
+    index = LedgerIndex.build(blocks)
+
+    assert index.offsets(kind="input") == [1, 3, 4]
+    assert [off for off, _ in index.select(blocks, until="2025-10-15")] == [0, 1, 2, 3]
+    assert [off for off, _ in index.select(blocks, kind="input", since="2025-10-15T09:30")] == [3, 4]
+    assert [off for off, _ in index.select(blocks, since="2025-10-15T09:20", until="2025-10-15T17:00")] == [2, 3]
+    assert index.select(blocks, kind="missing") == []
+
+
+def test_stale_sidecar_is_rebuilt(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "ledger.json"
+    blocks = _blocks()
+    LedgerIndex.build(blocks[:3]).save(index_path(ledger_path))
+
+    index = load_or_build(ledger_path, blocks)
+    assert index.covers(blocks)
+    assert LedgerIndex.load(index_path(ledger_path)).count == len(blocks)
+
+
+def test_writers_keep_index_current(tmp_path: Path) -> None:
+    limnus = LimnusAgent(tmp_path)
+    limnus.commit_block("consent", {"text": "I consent to be remembered."})
+    writer = LedgerWriter(limnus.ledger_path)
+    asyncio.run(writer.commit_many([("input", {"n": 1}), ("input", {"n": 2})]))
+
+    blocks = json.loads(limnus.ledger_path.read_text(encoding="utf-8"))
+    stored = LedgerIndex.load(index_path(limnus.ledger_path))
+    assert stored is not None and stored.covers(blocks)
+    assert stored.by_kind == {"genesis": [0], "consent": [1], "input": [2, 3]}
+
+    result = limnus.query_ledger(kind="input", since=blocks[0]["ts"][:10])
+    assert result["matches"] == 2
+    assert [block["offset"] for block in result["blocks"]] == [2, 3]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from agents.limnus.limnus_agent import LimnusAgent
+from ledger.canonical import block_hash
+from ledger.snapshot import SnapshotReader, merkle_root, read_snapshot, write_snapshot
+
+
+def _chain(count: int) -> list[dict]:
+    blocks: list[dict] = []
+    prev = ""
+    for idx in range(count):
+        block = {"ts": f"2025-10-16T00:{idx // 60:02d}:{idx % 60:02d}Z", "kind": "input", "data": {"n": idx, "text": "∿ breath"}, "prev": prev}
+        block["hash"] = block_hash(block)
+        blocks.append(block)
+        prev = block["hash"]
+    return blocks
+
+
+def test_round_trip_and_random_access(tmp_path: Path) -> None:
+    blocks = _chain(70)
+    path = tmp_path / "ledger.lsnap"
+    info = write_snapshot(blocks, path, frame_size=16)
+
+    assert info.tail == blocks[-1]["hash"]
+    assert info.merkle == merkle_root([b["hash"] for b in blocks])
+    assert len(info.frames) == 5
+
+    reader = SnapshotReader(path)
+    assert len(reader) == 70
+    assert reader.block(0) == blocks[0]
+    assert reader.block(33) == blocks[33]
+    assert reader.block(69) == blocks[69]
+    with pytest.raises(IndexError):
+        reader.block(70)
+    assert read_snapshot(path) == blocks
+    assert reader.verify()
+    assert path.stat().st_size < len(json.dumps(blocks).encode("utf-8"))
+
+
+def test_verify_detects_footer_mismatch(tmp_path: Path) -> None:
+    blocks = _chain(10)
+    path = tmp_path / "ledger.lsnap"
+    info = write_snapshot(blocks, path, frame_size=4)
+    other = merkle_root([block_hash({"n": idx}) for idx in range(3)])
+    path.write_bytes(path.read_bytes().replace(info.merkle.encode(), other.encode()))
+
+    assert read_snapshot(path) == blocks
+    assert not SnapshotReader(path).verify()
+
+
+def test_empty_ledger_and_unknown_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.lsnap"
+    write_snapshot([], path)
+    assert read_snapshot(path) == []
+    assert SnapshotReader(path).verify()
+
+    bogus = tmp_path / "bogus.lsnap"
+    bogus.write_bytes(b"{}" * 8)
+    with pytest.raises(ValueError):
+        SnapshotReader(bogus)
+
+
+@pytest.mark.parametrize("codec,compression,module", [("msgpack", "zlib", "msgpack"), ("json", "zstd", "zstandard")])
+def test_optional_codecs(tmp_path: Path, codec: str, compression: str, module: str) -> None:
+    pytest.importorskip(module)
+    blocks = _chain(20)
+    path = tmp_path / "ledger.lsnap"
+    write_snapshot(blocks, path, codec=codec, compression=compression, frame_size=8)
+    assert read_snapshot(path) == blocks
+
+
+def test_encode_ledger_writes_snapshot(tmp_path: Path) -> None:
+    limnus = LimnusAgent(tmp_path)
+    limnus.commit_block("input", {"text": "hello"})
+    limnus.encode_ledger()
+
+    snapshot = tmp_path / "frontend" / "assets" / "ledger.lsnap"
+    assert read_snapshot(snapshot) == json.loads(limnus.ledger_path.read_text(encoding="utf-8"))
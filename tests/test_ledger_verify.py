@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+
+import ledger.verify as verify_mod
+from ledger.verify import verify_chain
+
+
+def _build_chain(count: int) -> list[dict]:
+    blocks: list[dict] = []
+    prev = ""
+    for idx in range(count):
+        block = {"ts": f"2025-10-16T00:00:{idx:02d}Z", "kind": "input", "data": {"n": idx}, "prev": prev}
+        block["hash"] = hashlib.sha256(json.dumps(block, sort_keys=True).encode("utf-8")).hexdigest()
+        blocks.append(block)
+        prev = block["hash"]
+    return blocks
+
+
+def test_serial_verification_accepts_intact_chain() -> None:
+    report = verify_chain(_build_chain(20), workers=1)
+    assert report.ok
+    assert report.total == 20
+    assert report.blocks_per_second > 0
+
+
+def test_detects_tampered_block_and_broken_link() -> None:
+    blocks = _build_chain(10)
+    blocks[4]["data"] = {"n": "tampered"}
+    blocks[7]["prev"] = "deadbeef"
+    report = verify_chain(blocks, workers=1)
+    assert report.hash_mismatches == [4, 7]
+    assert report.broken_links == [7]
+
+
+def test_parallel_matches_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(verify_mod, "PARALLEL_MIN_BLOCKS", 1)
+    blocks = _build_chain(50)
+    blocks[33]["kind"] = "consent"
+    serial = verify_chain(blocks, workers=1)
+    parallel = verify_chain(blocks, workers=2, chunk_size=8)
+    assert parallel.workers == 2
+    assert parallel.hash_mismatches == serial.hash_mismatches == [33]
+    assert parallel.broken_links == serial.broken_links == []
+
+
+def test_missing_hash_counts_as_mismatch() -> None:
+    blocks = _build_chain(5)
+    del blocks[-1]["hash"]
+    blocks[-1]["data"] = {"n": "rewritten"}
+    report = verify_chain(blocks)
+    assert not report.ok
+    assert report.hash_mismatches == [4]
+
+
+def test_unhashed_ledger_is_only_link_checked() -> None:
+    entries = [{"ts": "2025-10-16T00:00:00Z", "kind": "note", "data": {}}]
+    assert verify_chain(entries).ok
+
+
+def test_legacy_field_names_share_material() -> None:
+    blocks = _build_chain(3)
+    legacy = dict(blocks[1])
+    legacy["payload"] = legacy.pop("data")
+    legacy["prev_hash"] = legacy.pop("prev")
+    blocks[1] = legacy
+    assert verify_chain(blocks).ok
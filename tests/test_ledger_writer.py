@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from ledger.verify import verify_chain
+from ledger.writer import LedgerWriter
+
+
+def _blocks(path: Path) -> list[dict]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_concurrent_commits_keep_chain_intact(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "state" / "ledger.json"
+    writer = LedgerWriter.for_path(ledger_path)
+
+    async def _run():
+        return await asyncio.gather(*(writer.commit("input", {"n": idx}) for idx in range(40)))
+
+    committed = asyncio.run(_run())
+
+    blocks = _blocks(ledger_path)
+    assert [block["hash"] for block in blocks] == [c.hash for c in committed]
+    assert [c.height for c in committed] == list(range(1, 41))
+    assert verify_chain(blocks).ok
+    # gather queues every commit before the drain task runs, so they share one write.
+    assert writer.stats.commits == 1
+    assert writer.stats.largest_batch == 40
+
+
+def test_batches_interleave_with_new_commits(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "ledger.json"
+    writer = LedgerWriter(ledger_path, max_batch=8)
+
+    async def _wave(start: int):
+        return await asyncio.gather(*(writer.commit("input", {"n": start + idx}) for idx in range(10)))
+
+    async def _run():
+        first = asyncio.ensure_future(_wave(0))
+        await asyncio.sleep(0)  # let the drain task pick up the first wave
+        second = await _wave(100)
+        return await first, second
+
+    first, second = asyncio.run(_run())
+
+    blocks = _blocks(ledger_path)
+    assert len(blocks) == 20
+    assert verify_chain(blocks).ok
+    assert writer.stats.largest_batch <= 8
+    assert writer.stats.commits >= 3
+    # Each caller's height points at its own block.
+    for committed in (*first, *second):
+        assert blocks[committed.height - 1]["hash"] == committed.hash
+
+
+def test_writer_is_shared_per_path_and_survives_new_loops(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "ledger.json"
+    writer = LedgerWriter.for_path(ledger_path)
+    assert LedgerWriter.for_path(tmp_path / "." / "ledger.json") is writer
+
+    first = asyncio.run(writer.commit("genesis", {}))
+    second = asyncio.run(writer.commit("input", {"text": "again"}))
+
+    blocks = _blocks(ledger_path)
+    assert [block["hash"] for block in blocks] == [first.hash, second.hash]
+    assert blocks[1]["prev"] == first.hash
+    assert second.height == 2
+
+
+def test_loops_on_separate_threads_each_drain(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "ledger.json"
+    writer = LedgerWriter.for_path(ledger_path)
+
+    def _worker(tag: int) -> None:
+        async def _run():
+            await asyncio.gather(*(writer.commit("input", {"t": tag, "n": idx}) for idx in range(5)))
+
+        asyncio.run(_run())
+
+    threads = [threading.Thread(target=_worker, args=(tag,)) for tag in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+
+    blocks = _blocks(ledger_path)
+    assert len(blocks) == 20
+    assert verify_chain(blocks).ok
+
+
+def test_refuses_to_overwrite_non_list_ledger(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "ledger.json"
+    original = json.dumps({"blocks": [{"ts": "t", "kind": "genesis", "data": {}, "prev": ""}]})
+    ledger_path.write_text(original, encoding="utf-8")
+    writer = LedgerWriter(ledger_path)
+
+    with pytest.raises(RuntimeError, match="not a block list"):
+        asyncio.run(writer.commit("input", {}))
+    assert ledger_path.read_text(encoding="utf-8") == original
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import pytest
+
+cache_mod = pytest.importorskip("pipeline.cache")
+ResponseCache = cache_mod.ResponseCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_order_and_entry_limit() -> None:
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}  # refreshes "a"
+    cache.set("c", {"v": 3})
+    assert "b" not in cache
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats.evictions["lru"] == 1
+
+
+def test_byte_budget_evicts_oldest_and_rejects_oversized() -> None:
+    cache = ResponseCache(max_entries=100, max_bytes=64, ttl=60)
+    cache.set("a", {"text": "x" * 30})
+    cache.set("b", {"text": "y" * 30})
+    assert "a" not in cache and "b" in cache
+    assert cache.stats.evictions["bytes"] == 1
+    assert cache.stats.bytes <= 64
+
+    cache.set("huge", {"text": "z" * 500})
+    assert "huge" not in cache
+    assert cache.stats.rejected == 1
+
+
+def test_ttl_and_periodic_sweep() -> None:
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10, sweep_interval=5, clock=clock)
+    cache.set("a", {"v": 1})
+    clock.now = 11
+    cache.set("b", {"v": 2})  # sweep due: "a" is dropped without being read
+    assert "a" not in cache
+    assert cache.stats.evictions["expired"] == 1
+    clock.now = 25
+    assert cache.get("b") is None
+    assert len(cache) == 0 and cache.stats.bytes == 0
+
+
+def test_hits_are_private_copies() -> None:
+    cache = ResponseCache()
+    cache.set("k", {"agents": {"echo": {"glyph": "∿"}}})
+    first = cache.get("k")
+    first["cached"] = True
+    first["agents"]["echo"]["glyph"] = "mutated"
+    assert cache.get("k") == {"agents": {"echo": {"glyph": "∿"}}}
+
+
+def test_sqlite_backend_is_shared_and_persistent(tmp_path) -> None:
+    import asyncio
+
+    path = tmp_path / "cache.sqlite3"
+    worker_a = cache_mod.SQLiteCacheBackend(path, ttl=60)
+    worker_b = cache_mod.SQLiteCacheBackend(path, ttl=60)
+
+    async def _run():
+        await worker_a.set("k", {"agents": {"echo": "∿"}})
+        hit = await worker_b.get("k")
+        await worker_a.close()
+        await worker_b.close()
+        restarted = cache_mod.SQLiteCacheBackend(path, ttl=60)
+        try:
+            return hit, await restarted.get("k")
+        finally:
+            await restarted.close()
+
+    hit, after_restart = asyncio.run(_run())
+    assert hit == after_restart == {"agents": {"echo": "∿"}}
+
+
+def test_sqlite_backend_bounds_and_expiry(tmp_path) -> None:
+    import asyncio
+
+    clock = FakeClock()
+    backend = cache_mod.SQLiteCacheBackend(tmp_path / "c.sqlite3", max_entries=2, ttl=10, clock=clock)
+
+    async def _run():
+        await backend.set("a", {"v": 1})
+        clock.now = 1
+        await backend.set("b", {"v": 2})
+        clock.now = 2
+        assert await backend.get("a") == {"v": 1}  # "b" is now least recently read
+        await backend.set("c", {"v": 3})
+        evicted = await backend.get("b")
+        clock.now = 20
+        expired = await backend.get("a")
+        await backend.close()
+        return evicted, expired
+
+    evicted, expired = asyncio.run(_run())
+    assert evicted is None and expired is None
+    assert backend.stats.evictions["lru"] == 1
+    assert backend.stats.evictions["expired"] == 1
+
+
+def test_redis_backend_uses_prefixed_ttl_keys() -> None:
+    import asyncio
+
+    class FakeRedis:
+        def __init__(self) -> None:
+            self.data = {}
+
+        async def get(self, name):
+            return self.data.get(name, (None,))[0]
+
+        async def set(self, name, value, px=None):
+            self.data[name] = (value, px)
+
+    client = FakeRedis()
+    backend = cache_mod.RedisCacheBackend(client=client, ttl=5, prefix="t:")
+
+    async def _run():
+        await backend.set("k", {"v": 1})
+        return await backend.get("k"), await backend.get("missing")
+
+    assert asyncio.run(_run()) == ({"v": 1}, None)
+    assert client.data["t:k"][1] == 5000
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+histogram = pytest.importorskip("pipeline.histogram")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_quantiles_within_bucket_error() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-4, 1.0) for _ in range(20000)]
+    hist = histogram.LatencyHistogram()
+    for value in values:
+        hist.record(value)
+    ordered = sorted(values)
+    for _name, q in histogram.QUANTILES:
+        exact = ordered[max(0, int(q * len(ordered)) - 1)]
+        assert hist.quantile(q) == pytest.approx(exact, rel=0.05)
+    assert hist.count == len(values)
+    assert hist.max == max(values) and hist.min == min(values)
+    assert len(hist.counts) <= histogram.MAX_BUCKET + 1
+
+
+def test_rolling_windows_expire_old_slices() -> None:
+    clock = Clock()
+    rolling = histogram.RollingHistogram(clock=clock)
+    for _ in range(10):
+        rolling.record(0.5)
+    clock.now = 120.0
+    rolling.record(0.01)
+
+    windows = rolling.windows()
+    assert windows["1m"]["count"] == 1
+    assert windows["5m"]["count"] == 11
+    assert rolling.lifetime.count == 11
+    clock.now = 2000.0
+    rolling.record(0.01)
+    assert rolling.windows()["15m"]["count"] == 1
+    assert len(rolling._slices) == 1
+
+
+def test_cumulative_counts_for_fixed_bounds() -> None:
+    hist = histogram.LatencyHistogram()
+    for value in (0.001, 0.004, 0.02, 0.3, 2.0):
+        hist.record(value)
+    assert list(hist.cumulative([0.005, 0.05, 1.0, float("inf")])) == [(0.005, 2), (0.05, 3), (1.0, 4), (float("inf"), 5)]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+rate_limit = pytest.importorskip("pipeline.rate_limit")
+from pipeline.middleware import RateLimitMiddleware  # noqa: E402
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_gcra_allows_burst_then_paces() -> None:
+    clock = Clock()
+    limiter = rate_limit.MemoryRateLimiter(clock=clock)
+    limit = rate_limit.RateLimit(60, 60.0, burst=3)  # one per second, bursts of 3
+
+    decisions = [limiter.check("u", limit) for _ in range(4)]
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+    assert decisions[3].retry_after == pytest.approx(1.0)
+
+    clock.now += 0.5
+    assert not limiter.check("u", limit).allowed
+    clock.now += 0.5
+    assert limiter.check("u", limit).allowed
+    assert limiter.check("other", limit).allowed
+
+
+def test_idle_and_excess_keys_are_evicted() -> None:
+    clock = Clock()
+    limiter = rate_limit.MemoryRateLimiter(max_keys=3, clock=clock)
+    limit = rate_limit.RateLimit(60)
+    for key in ("a", "b", "c", "d"):
+        limiter.check(key, limit)
+    assert len(limiter) == 3 and limiter.evicted == 1
+
+    clock.now += 2.0  # every bucket has refilled
+    limiter.check("e", limit)
+    assert len(limiter) == 1
+
+
+def test_middleware_applies_user_and_workspace_limits() -> None:
+    clock = Clock()
+    middleware = RateLimitMiddleware(
+        2, workspace_requests_per_minute=3, limiter=rate_limit.MemoryRateLimiter(clock=clock)
+    )
+
+    def context(user: str):
+        return SimpleNamespace(user_id=user, workspace_id="ws", metadata={})
+
+    async def run() -> None:
+        first = await middleware.pre_dispatch(context("alice"))
+        assert first.metadata["rate_limit_remaining"] == 1
+        await middleware.pre_dispatch(context("alice"))
+        with pytest.raises(rate_limit.RateLimitExceeded) as user_exc:
+            await middleware.pre_dispatch(context("alice"))
+        assert user_exc.value.scope == "user"
+        assert user_exc.value.retry_after == pytest.approx(30.0)
+        assert user_exc.value.retry_after_header == "30"
+
+        await middleware.pre_dispatch(context("bob"))
+        with pytest.raises(rate_limit.RateLimitExceeded) as ws_exc:
+            await middleware.pre_dispatch(context("carol"))
+        assert ws_exc.value.scope == "workspace"
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+retry = pytest.importorskip("pipeline.retry")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_classification_and_full_jitter() -> None:
+    policy = retry.RetryPolicy(base_delay=1.0, max_delay=5.0, rng=lambda: 0.5)
+    assert policy.is_retryable(TimeoutError())
+    assert policy.is_retryable(retry.RetryableError())
+    assert not policy.is_retryable(ValueError("bad input"))
+    assert not policy.is_retryable(RuntimeError("unknown"))
+    assert [policy.backoff(n) for n in (1, 2, 3, 4, 5)] == [0.5, 1.0, 2.0, 2.5, 2.5]
+    assert retry.RetryPolicy(rng=lambda: 0.0).backoff(3) == 0.0
+
+
+def test_budget_window_and_deadline() -> None:
+    clock = Clock()
+    policy = retry.RetryPolicy(max_attempts=10, budget=2, window=10.0, rng=lambda: 1.0, clock=clock)
+
+    assert policy.next_delay("limnus", 1, TimeoutError()) == (1.0, "retry")
+    assert policy.next_delay("limnus", 1, TimeoutError()) == (1.0, "retry")
+    assert policy.next_delay("limnus", 1, TimeoutError()) == (None, "budget")
+    assert policy.next_delay("kira", 1, TimeoutError()) == (1.0, "retry")
+    clock.now += 10.0
+    assert policy.budget_remaining("limnus") == 2
+
+    assert policy.next_delay("limnus", 3, TimeoutError(), deadline=clock.now + 3.0) == (None, "deadline")
+    assert policy.next_delay("limnus", 10, TimeoutError()) == (None, "exhausted")
+    assert policy.next_delay("limnus", 1, KeyError("x")) == (None, "not_retryable")
+    assert policy.budget_remaining("limnus") == 2
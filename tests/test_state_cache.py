@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from agents.echo.echo_agent import EchoAgent
+from agents.garden.garden_agent import GardenAgent
+from agents.kira.kira_agent import KiraAgent
+from interface.state_cache import StateCache, state_cache
+
+
+def test_read_is_cached_until_the_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"n": 1}), encoding="utf-8")
+    cache = StateCache(tmp_path)
+
+    assert cache.read(path) == {"n": 1}
+    assert cache.read(path) is cache.read(path)
+    assert cache.parses == 1
+
+    # Another writer replaces the file: new inode, so it is re-parsed.
+    other = tmp_path / "other.json"
+    other.write_text(json.dumps({"n": 2}), encoding="utf-8")
+    os.replace(other, path)
+    assert cache.read(path) == {"n": 2}
+    assert cache.parses == 2
+
+    assert cache.read(tmp_path / "missing.json", None) is None
+
+
+def test_batch_defers_writes_until_the_outermost_exit(tmp_path: Path) -> None:
+    path = tmp_path / "state" / "doc.json"
+    cache = StateCache(tmp_path)
+
+    with cache.batch():
+        cache.write(path, {"v": 1})
+        with cache.batch():
+            cache.write(path, {"v": 2})
+        assert not path.exists()
+        assert cache.exists(path)
+        assert cache.read(path) == {"v": 2}
+    assert json.loads(path.read_text(encoding="utf-8")) == {"v": 2}
+    assert cache.writes == 1
+    assert cache.parses == 0
+
+
+def test_agents_share_one_parse_per_file_per_dispatch(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    cache = state_cache(root)
+    GardenAgent(root)
+    EchoAgent(root)
+    cache.invalidate()
+    parses, writes = cache.parses, cache.writes
+
+    with cache.batch():
+        garden, echo, kira = GardenAgent(root), EchoAgent(root), KiraAgent(root)
+        garden.log("first note")
+        echo.learn("bloom always")
+        echo.say("hello")
+        kira.validate()
+        kira.mentor()
+        kira.mantra()
+
+    assert cache.parses - parses == 2  # garden_ledger.json, echo_state.json
+    assert cache.writes - writes == 2
+    ledger = json.loads((root / "state" / "garden_ledger.json").read_text(encoding="utf-8"))
+    assert ledger["entries"][-1]["data"] == {"text": "first note"}
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from library_core.tracing import FileSpanExporter, MemorySpanExporter, Tracer, current_span, span, to_otlp
+
+
+def test_spans_follow_tasks_and_threads() -> None:
+    exporter = MemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    def in_thread() -> str:
+        with span("thread") as item:
+            return item.parent_id
+
+    async def run() -> str:
+        with tracer.trace("root") as root:
+            with span("outer") as outer:
+                parent = await asyncio.to_thread(in_thread)
+                assert parent == outer.span_id
+            assert current_span() is root
+            return root.span_id
+
+    root_id = asyncio.run(run())
+    tracer.flush()
+    (spans,) = exporter.traces
+    assert [item.name for item in spans] == ["thread", "outer", "root"]
+    assert spans[1].parent_id == root_id
+    assert current_span() is None
+
+
+def test_errors_are_recorded_and_sampling_is_per_trace() -> None:
+    exporter = MemorySpanExporter()
+    draws = iter([0.9, 0.1])
+    tracer = Tracer(exporter, sample_rate=0.5, rng=lambda: next(draws))
+
+    with tracer.trace("skipped") as root:
+        assert root is None
+        with span("child") as child:
+            assert child is None
+    try:
+        with tracer.trace("sampled"):
+            with span("boom"):
+                raise KeyError("x")
+    except KeyError:
+        pass
+    tracer.flush()
+
+    (spans,) = exporter.traces
+    assert [(item.name, item.error) for item in spans] == [("boom", "KeyError: 'x'"), ("sampled", "KeyError: 'x'")]
+    assert tracer.started == 1 and tracer.exported == 1
+
+
+def test_file_exporter_writes_otlp_json(tmp_path: Path) -> None:
+    path = tmp_path / "logs" / "traces.jsonl"
+    tracer = Tracer(FileSpanExporter(path))
+    with tracer.trace("dispatch", workspace="ws"):
+        with span("attempt", attempt=1, ok=True):
+            pass
+    tracer.shutdown()
+
+    request = json.loads(path.read_text(encoding="utf-8"))
+    spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    child, root = spans
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16 and "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["attributes"] == [
+        {"key": "attempt", "value": {"intValue": "1"}},
+        {"key": "ok", "value": {"boolValue": True}},
+    ]
+    assert int(root["startTimeUnixNano"]) <= int(child["startTimeUnixNano"]) <= int(root["endTimeUnixNano"])
+    assert to_otlp([])["resourceSpans"][0]["scopeSpans"][0]["spans"] == []
@@ -3,15 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import os
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 from pipeline.dispatcher_enhanced import DispatcherConfig, EnhancedMRPDispatcher, PipelineContext
 from pipeline.intent_parser import IntentParser
+from pipeline.middleware import RateLimitMiddleware
+from pipeline.rate_limit import RateLimitExceeded, RedisRateLimiter
+from pipeline.prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE, render_metrics
 from library_core.workspace import Workspace
 
 app = FastAPI(
@@ -46,21 +52,62 @@ class InteractionResponse(BaseModel):
     execution_time_ms: float
 
 
+class CompactJSONResponse(JSONResponse):
+    """JSON without whitespace; values FastAPI would stringify are stringified."""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(content, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Top-level response keys each endpoint needs from `dispatch`.
+INTERACT_FIELDS = ("success", "timestamp", "agents", "execution_time_ms")
+
+
 dispatchers: Dict[str, EnhancedMRPDispatcher] = {}
+intent_parser = IntentParser()
 dispatch_lock = asyncio.Lock()
 
 
+def build_rate_limit() -> Optional[RateLimitMiddleware]:
+    """Rate limits from the environment; one instance shared by all workspaces."""
+    per_user = os.getenv("VESSELOS_RATE_LIMIT_PER_MINUTE")
+    if not per_user:
+        return None
+    per_workspace = os.getenv("VESSELOS_WORKSPACE_RATE_LIMIT_PER_MINUTE")
+    # Set a Redis URL to enforce the limits across uvicorn workers.
+    url = os.getenv("VESSELOS_RATE_LIMIT_URL")
+    return RateLimitMiddleware(
+        int(per_user),
+        workspace_requests_per_minute=int(per_workspace) if per_workspace else None,
+        limiter=RedisRateLimiter(url) if url else None,
+    )
+
+
+rate_limit = build_rate_limit()
+
+
 async def get_dispatcher(workspace_id: str) -> EnhancedMRPDispatcher:
     async with dispatch_lock:
         if workspace_id not in dispatchers:
             config = DispatcherConfig(
                 agent_order=["garden", "echo", "limnus", "kira"],
+                # Garden and Echo start together, so streamed results arrive early.
+                parallel_execution=True,
                 retry_enabled=True,
                 circuit_breaker_enabled=True,
                 cache_enabled=True,
+                # "sqlite" or "redis" share cached responses across uvicorn workers.
+                cache_backend=os.getenv("VESSELOS_CACHE_BACKEND", "memory"),
+                cache_path=os.getenv("VESSELOS_CACHE_PATH"),
+                cache_url=os.getenv("VESSELOS_CACHE_URL"),
                 verbose_logging=False,
+                # Endpoints read agent results from "agents".
+                response_aliases=False,
             )
-            dispatchers[workspace_id] = EnhancedMRPDispatcher(workspace_id, config)
+            dispatcher = EnhancedMRPDispatcher(workspace_id, config)
+            if rate_limit is not None:
+                dispatcher.add_middleware(rate_limit)
+            dispatchers[workspace_id] = dispatcher
         return dispatchers[workspace_id]
 
 
@@ -87,33 +134,70 @@ async def health_check() -> Dict[str, Any]:
     }
 
 
+def build_context(request: InteractionRequest) -> PipelineContext:
+    return PipelineContext(
+        input_text=request.text,
+        user_id=request.user_id,
+        workspace_id=request.workspace_id,
+        intent=intent_parser.parse(request.text),
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        metadata=request.metadata or {},
+    )
+
+
 @app.post("/interact", response_model=InteractionResponse)
-async def interact(request: InteractionRequest) -> InteractionResponse:
+async def interact(request: InteractionRequest) -> Response:
     try:
         dispatcher = await get_dispatcher(request.workspace_id)
-        intent = IntentParser().parse(request.text)
-        context = PipelineContext(
-            input_text=request.text,
-            user_id=request.user_id,
-            workspace_id=request.workspace_id,
-            intent=intent,
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            metadata=request.metadata or {},
-        )
-        result = await dispatcher.dispatch(context)
-        return InteractionResponse(
-            success=result["success"],
-            timestamp=result["timestamp"],
-            ritual=result["agents"]["garden"],
-            echo=result["agents"]["echo"],
-            memory=result["agents"]["limnus"],
-            validation=result["agents"]["kira"],
-            execution_time_ms=result["execution_time_ms"],
+        result = await dispatcher.dispatch(build_context(request), fields=INTERACT_FIELDS)
+        agents = result["agents"]
+        # Shaped like InteractionResponse, but by reference: no model copy.
+        return CompactJSONResponse(
+            {
+                "success": result["success"],
+                "timestamp": result["timestamp"],
+                "ritual": agents["garden"] or {},
+                "echo": agents["echo"] or {},
+                "memory": agents["limnus"] or {},
+                "validation": agents["kira"] or {},
+                "execution_time_ms": result["execution_time_ms"],
+            }
         )
+    except RateLimitExceeded as exc:
+        raise HTTPException(
+            status_code=429, detail=str(exc), headers={"Retry-After": exc.retry_after_header}
+        ) from exc
     except Exception as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+@app.post("/interact/stream")
+async def interact_stream(request: InteractionRequest) -> StreamingResponse:
+    """Server-sent events: one `agent` event per agent as it finishes, then `complete`."""
+    dispatcher = await get_dispatcher(request.workspace_id)
+    context = build_context(request)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in dispatcher.dispatch_stream(context):
+                name = event.pop("event")
+                yield sse_event(name, event["response"] if name == "complete" else event)
+        except RateLimitExceeded as exc:
+            yield sse_event("error", {"detail": str(exc), "status": 429, "retry_after": exc.retry_after})
+        except Exception as exc:  # pragma: no cover - defensive
+            yield sse_event("error", {"detail": str(exc)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/workspace/{workspace_id}/state")
 async def get_workspace_state(workspace_id: str) -> Dict[str, Any]:
     try:
@@ -220,7 +304,7 @@ async def get_quantum_state(workspace_id: str) -> Dict[str, Any]:
 async def validate_workspace(workspace_id: str) -> Dict[str, Any]:
     try:
         dispatcher = await get_dispatcher(workspace_id)
-        intent = IntentParser().parse("validate system")
+        intent = intent_parser.parse("validate system")
         context = PipelineContext(
             input_text="validate system",
             user_id="system",
@@ -228,7 +312,7 @@ async def validate_workspace(workspace_id: str) -> Dict[str, Any]:
             intent=intent,
             timestamp=datetime.now(timezone.utc).isoformat(),
         )
-        result = await dispatcher.dispatch(context)
+        result = await dispatcher.dispatch(context, fields=("agents",))
         return result["agents"]["kira"]
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -245,6 +329,12 @@ async def get_metrics() -> Dict[str, Any]:
     }
 
 
+@app.get("/metrics/prometheus")
+async def get_prometheus_metrics() -> Response:
+    """The same metrics in Prometheus text format, for scraping."""
+    return Response(render_metrics(dispatchers), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
     print("🚀 VesselOS Kira Prime API starting...")